@@ -0,0 +1,62 @@
+"""
+Model build-time benchmark for the assignment-style CP-SAT handlers.
+
+Times only model construction (no solve) at growing task counts with a
+fixed number of resources, so linear builders show a roughly constant
+time per task. Run from the solver-service directory:
+
+    python -m benchmarks.model_build --sizes 500 1000 2000 4000
+"""
+import argparse
+import time
+
+from src.core.solver import SolverService
+
+def crew_allocation_data(num_tasks: int, num_crews: int):
+    skills = ["assembly", "welding", "electrical", "concrete"]
+    return {
+        "crews": [{"id": c, "skills": skills[c % 4:] + skills[:c % 2], "availability": [[0, 10 * num_tasks]]}
+                  for c in range(num_crews)],
+        "tasks": [{"id": t, "site_id": t % 7, "required_skills": [skills[t % 4]], "duration": 1 + t % 3}
+                  for t in range(num_tasks)],
+        "union_rules": [],
+        "priorities": {s: 1 + s for s in range(7)}
+    }
+
+def material_delivery_data(num_tasks: int, num_vehicles: int):
+    return {
+        "vehicles": [{"id": v, "capacity": 5 * num_tasks} for v in range(num_vehicles)],
+        "deliveries": [{"id": d, "quantity": 1 + d % 5} for d in range(num_tasks)]
+    }
+
+BUILDERS = {
+    "crew_allocation": (crew_allocation_data, lambda s, d: s._build_crew_allocation(d)),
+    "material_delivery_optimization": (material_delivery_data,
+                                       lambda s, d: s._build_material_delivery_optimization(d)),
+}
+
+def time_build(build, data, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        build(data)
+        best = min(best, time.perf_counter() - began)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000])
+    parser.add_argument("--resources", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    service = SolverService()
+    print(f"{'flow':<32}{'tasks':>8}{'build s':>10}{'us/var':>10}")
+    for flow, (make_data, build) in BUILDERS.items():
+        for n in args.sizes:
+            data = make_data(n, args.resources)
+            seconds = time_build(lambda d: build(service, d), data, args.repeat)
+            variables = len(build(service, data)[0].Proto().variables)
+            print(f"{flow:<32}{n:>8}{seconds:>10.3f}{1e6 * seconds / variables:>10.1f}")
+
+if __name__ == "__main__":
+    main()
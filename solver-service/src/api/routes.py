@@ -1,8 +1,9 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
 from typing import List, Dict, Any
 from src.core.solver import SolverService
 from src.core.model_store import model_store, ModelStore
+from src.core.matrix import decode_npy
 from src.api.models import ModelBuildRequest, ModelRunRequest
 from src.core.templates import (
     VehicleAssignmentRequest, FleetMixRequest, MaintenanceScheduleRequest,
@@ -73,33 +74,45 @@ FLOW_DESCRIPTIONS = {
     'shift_coverage': 'Allocate workforce to cover shifts',
     'labor_scheduling': 'Generate labor schedules across shifts'
 }
+# Optional warm-start fields shared by the CP-SAT flows. A previous_job_id only resolves on
+# the server process that returned it; behind several workers send previous_solution
+REPLAN_SCHEMA = {
+    'previous_solution?': 'object',
+    'previous_job_id?': 'string (same server process only)',
+    'stability?': '{mode?:"hint"|"penalize"|"fix", weight?:number, free?:any[]}'
+}
 FLOW_SCHEMAS = {
     'crew_allocation': {
         'crews': 'Array<{id:number, skills:string[], availability:[number,number][]}>',
         'tasks': 'Array<{id:number, site_id:number, required_skills:string[], duration:number}>',
         'shifts': 'Array<{id:number, start:number, end:number}>',
         'union_rules': 'Array<{max_work_hours_per_day:number}>',
-        'priorities': '{[site_id:number]:number}'
+        'priorities': '{[site_id:number]:number}',
+        **REPLAN_SCHEMA
     },
     'equipment_resource_planning': {
         'equipment': 'Array<{id:number, capacity:number}>',
-        'tasks': 'Array<{id:number, time_window?:[number,number]}>',
-        'projects': 'Array<any>',
+        'tasks': 'Array<{id:number, time_window?:[number,number], duration?:number, site_id?:any}>',
+        'projects': 'Array<{id:any}>',
         'time_horizon': 'number',
-        'move_times': 'number[][]',
-        'constraints': 'object'
+        'move_times': 'number[][] | {encoding:"base64", dtype:string, shape:number[], data:string}',
+        'constraints': 'object',
+        **REPLAN_SCHEMA
     },
     'subcontractor_scheduling': {
-        'tasks': 'Array<{id:number, duration:number, predecessors:number[]}>',
-        'contracts': 'Array<any>',
-        'time_horizon': 'number'
+        'tasks': 'Array<{id:number, duration:number, predecessors:number[], subcontractor_id?:any, crew_size?:number, earliest_start?:number, latest_end?:number}>',
+        'subcontractors?': 'Array<{id:any, capacity?:number}>',
+        'contracts?': 'Array<{subcontractor_id:any, task_ids?:number[], capacity?:number, start?:number, end?:number}>',
+        'time_horizon': 'number',
+        **REPLAN_SCHEMA
     },
     'material_delivery_optimization': {
         'vehicles': 'Array<{id:number, capacity:number}>',
         'deliveries': 'Array<{id:number, quantity:number}>',
         'storage': 'Array<any>',
-        'distance_matrix': 'number[][]',
-        'constraints': 'object'
+        'distance_matrix': 'number[][] | {encoding:"base64", dtype:string, shape:number[], data:string}',
+        'constraints': 'object',
+        **REPLAN_SCHEMA
     },
     'portfolio_balancing': {
         'sites': 'Array<{id:number}>',
@@ -113,12 +126,23 @@ FLOW_SCHEMAS = {
         'num_simulations?': 'number'
     },
     'compliance_planning': {
-        'tasks': 'Array<{id:number, duration:number}>',
+        'tasks': 'Array<{id:number, duration:number, crew_size?:number}>',
         'blackout_windows': 'Array<[number,number]>',
-        'constraints': 'object'
+        'constraints': 'object{time_horizon?:number, crews?:number}',
+        **REPLAN_SCHEMA
     }
 }
 
+# Flows whose matrix fields may also be uploaded as `.npy` parts of a
+# multipart request: endpoint slug -> (solver type, request model)
+MATRIX_FLOWS = {
+    'vehicle-assignment': ('vap', VehicleAssignmentRequest),
+    'equipment-allocation': ('equipment_allocation', EquipmentAllocationRequest),
+    'material-delivery-planning': ('material_delivery_planning', MaterialDeliveryPlanningRequest),
+    'equipment-resource-planning': ('equipment_resource_planning', EquipmentResourcePlanningRequest),
+    'material-delivery-optimization': ('material_delivery_optimization', MaterialDeliveryOptimizationRequest),
+}
+
 @app.post("/build")
 def build_model(request: Dict[str, Any]):
     try:
@@ -173,9 +197,9 @@ def solve_fleet_mix(request: FleetMixRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/solve/maintenance")
-async def solve_maintenance(request: MaintenanceScheduleRequest):
+def solve_maintenance(request: MaintenanceScheduleRequest):
     try:
-        result = await solver_service.solve({
+        result = solver_service.solve({
             "type": "maintenance",
             **request.dict()
         })
@@ -184,9 +208,9 @@ async def solve_maintenance(request: MaintenanceScheduleRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/solve/fuel")
-async def solve_fuel(request: FuelOptimizationRequest):
+def solve_fuel(request: FuelOptimizationRequest):
     try:
-        result = await solver_service.solve({
+        result = solver_service.solve({
             "type": "fuel",
             **request.dict()
         })
@@ -195,9 +219,9 @@ async def solve_fuel(request: FuelOptimizationRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/solve/employee-schedule")
-async def solve_employee_schedule(request: EmployeeScheduleRequest):
+def solve_employee_schedule(request: EmployeeScheduleRequest):
     try:
-        result = await solver_service.solve({
+        result = solver_service.solve({
             "type": "employee_schedule",
             **request.dict()
         })
@@ -206,9 +230,9 @@ async def solve_employee_schedule(request: EmployeeScheduleRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/solve/task-assignment")
-async def solve_task_assignment(request: TaskAssignmentRequest):
+def solve_task_assignment(request: TaskAssignmentRequest):
     try:
-        result = await solver_service.solve({
+        result = solver_service.solve({
             "type": "task_assignment",
             **request.dict()
         })
@@ -217,9 +241,9 @@ async def solve_task_assignment(request: TaskAssignmentRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/solve/break-schedule")
-async def solve_break_schedule(request: BreakScheduleRequest):
+def solve_break_schedule(request: BreakScheduleRequest):
     try:
-        result = await solver_service.solve({
+        result = solver_service.solve({
             "type": "break_schedule",
             **request.dict()
         })
@@ -228,9 +252,9 @@ async def solve_break_schedule(request: BreakScheduleRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/solve/labor-cost")
-async def solve_labor_cost(request: LaborCostRequest):
+def solve_labor_cost(request: LaborCostRequest):
     try:
-        result = await solver_service.solve({
+        result = solver_service.solve({
             "type": "labor_cost",
             **request.dict()
         })
@@ -239,9 +263,9 @@ async def solve_labor_cost(request: LaborCostRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/solve/workforce-capacity")
-async def solve_workforce_capacity(request: WorkforceCapacityRequest):
+def solve_workforce_capacity(request: WorkforceCapacityRequest):
     try:
-        result = await solver_service.solve({
+        result = solver_service.solve({
             "type": "workforce_capacity",
             **request.dict()
         })
@@ -250,9 +274,9 @@ async def solve_workforce_capacity(request: WorkforceCapacityRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/solve/shift-coverage")
-async def solve_shift_coverage(request: ShiftCoverageRequest):
+def solve_shift_coverage(request: ShiftCoverageRequest):
     try:
-        result = await solver_service.solve({
+        result = solver_service.solve({
             "type": "shift_coverage",
             **request.dict()
         })
@@ -354,6 +378,26 @@ def solve_compliance_planning(request: CompliancePlanningRequest):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.post("/solve/{flow}/multipart")
+async def solve_multipart(flow: str, request: Request):
+    """
+    Solve a matrix flow from a multipart request: a `payload` part with the
+    JSON body plus one `.npy` file part per matrix field (e.g. `distance_matrix`).
+    """
+    if flow not in MATRIX_FLOWS:
+        raise HTTPException(status_code=404, detail=f"Flow {flow} does not accept matrix uploads")
+    problem_type, request_model = MATRIX_FLOWS[flow]
+    try:
+        form = await request.form()
+        payload = json.loads(form.get("payload") or "{}")
+        for name, part in form.multi_items():
+            if name != "payload" and hasattr(part, "read"):
+                payload[name] = decode_npy(await part.read())
+        parsed = request_model(**payload)
+        return solver_service.solve({"type": problem_type, **parsed.dict()})
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # --- Explainability Endpoint ---
 @app.post("/explain", response_model=ExplainResponse)
 async def explain(request: ExplainRequest):
@@ -403,6 +447,12 @@ async def health_check():
 @app.get("/healthz")
 async def healthz():
     return {"status": "healthy"}
+
+@app.get("/races")
+def race_summary():
+    """Backend races won per flow (solver_config engine "race"), from SOLVER_RACE_LOG when set, shared by all workers."""
+    return solver_service.race_summary()
+
 @app.get("/flows", response_model=FlowsResponse)
 def list_flows():
     """List all available solver flows and their endpoints."""
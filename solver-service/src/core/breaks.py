@@ -0,0 +1,75 @@
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+def preference_deviation(employee_ids: Sequence[Any], preferred: Sequence[Dict[str, Any]],
+                         horizon: int) -> np.ndarray:
+    """
+    ``(employees, horizon)`` array of the distance from each slot to the
+    employee's nearest preferred break time. Preferences are grouped by
+    employee once; employees without any preference deviate by zero.
+    """
+    row = {e: i for i, e in enumerate(employee_ids)}
+    pairs = sorted((row[p["employee_id"]], float(p["time"])) for p in preferred if p["employee_id"] in row)
+    deviation = np.zeros((len(employee_ids), horizon))
+    if not pairs or horizon == 0:
+        return deviation
+    owners = np.array([i for i, _ in pairs], dtype=np.int64)
+    times = np.array([t for _, t in pairs])
+    firsts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+    distance = np.abs(np.arange(horizon)[None, :] - times[:, None])
+    deviation[owners[firsts]] = np.minimum.reduceat(distance, firsts, axis=0)
+    return deviation
+
+def _sliding_min(a: np.ndarray, width: int) -> np.ndarray:
+    """Minimum of every ``width`` consecutive entries along the last axis, by doubling."""
+    n = a.shape[-1] - width + 1
+    span = 1
+    while span * 2 <= width:
+        a = np.minimum(a[..., :-span], a[..., span:])
+        span *= 2
+    return np.minimum(a[..., :n], a[..., width - span:width - span + n])
+
+def place_breaks(cost: np.ndarray, count: int, min_work: int, max_work: int) -> Optional[np.ndarray]:
+    """
+    Cheapest ``count`` break slots per employee (row of ``cost``), none
+    before ``min_work`` and at least one in every ``max_work`` consecutive
+    slots starting at 1 (the windows of the break-schedule MIP).
+
+    Employees are independent, so each row is solved exactly by a DP over
+    (breaks placed, slot of the latest break): a break must follow the
+    previous one within ``max_work`` slots until the last window start
+    ``horizon - max_work - 1`` is passed, after which it may go anywhere
+    later. All rows advance together and the window minimum is a sliding
+    minimum. Returns the sorted break slots as a ``(employees, count)``
+    array, or None when some employee has no feasible placement.
+    """
+    employees, horizon = cost.shape
+    last_start = horizon - max_work - 1  # windows start at 1..last_start
+    if count == 0 or horizon == 0:
+        feasible = count == 0 and last_start < 1
+        return np.zeros((employees, 0), dtype=np.int64) if feasible else None
+    if last_start >= 1 and max_work <= 0:
+        return None
+    slots = np.arange(horizon)
+    cost = np.where(slots < min_work, np.inf, cost)
+    layers = [np.where((slots <= max_work) | (last_start < 1), cost, np.inf)]
+    for _ in range(1, count):
+        g = layers[-1]
+        # Previous break within max_work slots before t ...
+        padded = np.concatenate([np.full((employees, max(max_work, 1)), np.inf), g], axis=1)
+        near = _sliding_min(padded, max(max_work, 1))[:, :horizon]
+        # ... or anywhere before t once the windows are covered
+        past = np.minimum.accumulate(np.where(slots >= last_start, g, np.inf), axis=1)
+        past = np.concatenate([np.full((employees, 1), np.inf), past[:, :-1]], axis=1)
+        layers.append(cost + np.minimum(near, past))
+    final = np.where(slots >= last_start, layers[-1], np.inf)
+    chosen = np.empty((employees, count), dtype=np.int64)
+    chosen[:, -1] = np.argmin(final, axis=1)
+    if not np.isfinite(final[np.arange(employees), chosen[:, -1]]).all():
+        return None
+    for k in range(count - 1, 0, -1):
+        later = chosen[:, k][:, None]
+        allowed = (slots < later) & ((slots >= later - max_work) | (slots >= last_start))
+        chosen[:, k - 1] = np.argmin(np.where(allowed, layers[k - 1], np.inf), axis=1)
+    return chosen
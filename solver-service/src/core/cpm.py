@@ -0,0 +1,200 @@
+import heapq
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+class ProjectNetwork:
+    """
+    Precedence network compiled once into index form.
+
+    Tasks are stored in topological order; ``predecessors[i]`` and
+    ``successors[i]`` hold positions in that order. Predecessor ids that are
+    not part of the network are ignored.
+    """
+
+    def __init__(self, tasks: List[Dict[str, Any]]):
+        ids = [t["id"] for t in tasks]
+        position = {tid: i for i, tid in enumerate(ids)}
+        if len(position) != len(ids):
+            raise ValueError("Project network contains duplicate task ids")
+        preds = [sorted({position[p] for p in t.get("predecessors", []) or [] if p in position}) for t in tasks]
+        order = _topological_order(preds)
+        rank = {old: new for new, old in enumerate(order)}
+        self.tasks = [tasks[i] for i in order]
+        self.ids = [ids[i] for i in order]
+        self.index = {tid: i for i, tid in enumerate(self.ids)}
+        self.predecessors = [np.array(sorted(rank[p] for p in preds[i]), dtype=np.intp) for i in order]
+        self.successors: List[List[int]] = [[] for _ in order]
+        for i, ps in enumerate(self.predecessors):
+            for p in ps:
+                self.successors[p].append(i)
+        self.sinks = np.array([i for i, s in enumerate(self.successors) if not s], dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+def _topological_order(preds: List[List[int]]) -> List[int]:
+    """Kahn's algorithm; raises ValueError when the network has a cycle."""
+    succs: List[List[int]] = [[] for _ in preds]
+    indegree = [len(p) for p in preds]
+    for i, ps in enumerate(preds):
+        for p in ps:
+            succs[p].append(i)
+    queue = deque(i for i, d in enumerate(indegree) if d == 0)
+    order = []
+    while queue:
+        i = queue.popleft()
+        order.append(i)
+        for s in succs[i]:
+            indegree[s] -= 1
+            if indegree[s] == 0:
+                queue.append(s)
+    if len(order) != len(preds):
+        raise ValueError("Project network contains a precedence cycle")
+    return order
+
+def forward_pass(network: ProjectNetwork, durations: np.ndarray) -> np.ndarray:
+    """
+    Earliest finish times for a (tasks, samples) duration array, computed for
+    all samples at once as a max over predecessor rows.
+    """
+    finish = np.empty_like(durations)
+    for i, preds in enumerate(network.predecessors):
+        if len(preds) == 0:
+            finish[i] = durations[i]
+        elif len(preds) == 1:
+            np.add(finish[preds[0]], durations[i], out=finish[i])
+        else:
+            np.add(finish[preds].max(axis=0), durations[i], out=finish[i])
+    return finish
+
+def backward_pass(network: ProjectNetwork, durations: np.ndarray, project_finish: np.ndarray) -> np.ndarray:
+    """Latest finish times given per-sample project finish times."""
+    latest = np.empty_like(durations)
+    for i in range(len(network) - 1, -1, -1):
+        succs = network.successors[i]
+        if not succs:
+            latest[i] = project_finish
+        else:
+            latest[i] = (latest[succs] - durations[succs]).min(axis=0)
+    return latest
+
+def time_windows(network: ProjectNetwork, durations: np.ndarray, release: np.ndarray,
+                 deadline: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Earliest and latest start of every task (in network order) given
+    release times and finish deadlines, propagated through the precedence
+    network. A task whose earliest start exceeds its latest start cannot be
+    scheduled at all.
+    """
+    finish = np.array(durations, dtype=np.int64)
+    earliest = np.empty(len(network), dtype=np.int64)
+    for i, preds in enumerate(network.predecessors):
+        earliest[i] = max(release[i], finish[preds].max()) if len(preds) else release[i]
+        finish[i] = earliest[i] + durations[i]
+    latest = np.empty(len(network), dtype=np.int64)
+    for i in range(len(network) - 1, -1, -1):
+        succs = network.successors[i]
+        latest_finish = min(deadline[i], latest[succs].min()) if succs else deadline[i]
+        latest[i] = latest_finish - durations[i]
+    return earliest, latest
+
+class CPMBaseline:
+    """
+    Deterministic CPM pass over a baseline plan, kept so that change orders
+    can be evaluated incrementally.
+
+    Stores earliest start/finish and each task's tail (longest path from its
+    start to project end). A what-if re-propagates starts through the
+    downstream cone and tails through the upstream cone of the changed
+    tasks only, stopping wherever a value is unchanged.
+    """
+
+    def __init__(self, tasks: List[Dict[str, Any]]):
+        self.network = ProjectNetwork(tasks)
+        n = len(self.network)
+        self.durations = [int(t.get("duration", 0)) for t in self.network.tasks]
+        self.start = [0] * n
+        self.finish = [0] * n
+        for i, preds in enumerate(self.network.predecessors):
+            self.start[i] = max((self.finish[p] for p in preds), default=0)
+            self.finish[i] = self.start[i] + self.durations[i]
+        self.tail = [0] * n
+        for i in range(n - 1, -1, -1):
+            self.tail[i] = self.durations[i] + max((self.tail[s] for s in self.network.successors[i]), default=0)
+        self.makespan = max(self.finish, default=0)
+        # Sinks by baseline finish, latest first, to find the unaffected maximum cheaply
+        self._sinks_by_finish = sorted(self.network.sinks.tolist(), key=lambda i: -self.finish[i])
+
+    def what_if(self, deltas: Dict[Any, int]) -> Dict[str, Any]:
+        """Evaluate duration deltas keyed by task id; unknown ids are ignored."""
+        net = self.network
+        duration = {net.index[tid]: self.durations[net.index[tid]] + d for tid, d in deltas.items() if tid in net.index}
+        changed = sorted(duration)
+        # Forward pass over the downstream cone, in topological order
+        start, finish = {}, {}
+        heap, queued = list(changed), set(changed)
+        heapq.heapify(heap)
+        while heap:
+            i = heapq.heappop(heap)
+            es = max((finish.get(p, self.finish[p]) for p in net.predecessors[i]), default=0)
+            ef = es + duration.get(i, self.durations[i])
+            if es == self.start[i] and ef == self.finish[i]:
+                continue
+            start[i], finish[i] = es, ef
+            if ef != self.finish[i]:
+                for s in net.successors[i]:
+                    if s not in queued:
+                        queued.add(s)
+                        heapq.heappush(heap, s)
+        # Backward pass of tails over the upstream cone, in reverse topological order
+        tail = {}
+        heap, queued = [-i for i in changed], set(changed)
+        heapq.heapify(heap)
+        while heap:
+            i = -heapq.heappop(heap)
+            tl = duration.get(i, self.durations[i]) + max((tail.get(s, self.tail[s]) for s in net.successors[i]), default=0)
+            if tl == self.tail[i]:
+                continue
+            tail[i] = tl
+            for p in net.predecessors[i]:
+                if p not in queued:
+                    queued.add(p)
+                    heapq.heappush(heap, -p)
+        ends = [i for i in finish if not net.successors[i]]
+        ends += [next((i for i in self._sinks_by_finish if i not in finish), None)]
+        ends = [i for i in ends if i is not None]
+        makespan = max((finish.get(i, self.finish[i]) for i in ends), default=0)
+        makespan_delta = makespan - self.makespan
+        task_deltas = []
+        for i in sorted(set(start) | set(tail)):
+            es, tl = start.get(i, self.start[i]), tail.get(i, self.tail[i])
+            task_deltas.append({
+                "task_id": net.ids[i],
+                "start_delta": es - self.start[i],
+                "finish_delta": finish.get(i, self.finish[i]) - self.finish[i],
+                "float_delta": (makespan - es - tl) - (self.makespan - self.start[i] - self.tail[i])
+            })
+        return {
+            "new_makespan": makespan,
+            "baseline_makespan": self.makespan,
+            "makespan_delta": makespan_delta,
+            "critical_path": self._critical_path(start, finish, ends, makespan),
+            "task_deltas": task_deltas,
+            # Every task not listed shifts its float by the makespan delta
+            "unlisted_float_delta": makespan_delta,
+            "affected_tasks": len(task_deltas)
+        }
+
+    def _critical_path(self, start, finish, ends, makespan) -> List[Any]:
+        """Walk back from a sink finishing at the makespan along driving predecessors."""
+        net = self.network
+        ef = lambda i: finish.get(i, self.finish[i])
+        i = next((i for i in ends if ef(i) == makespan), None)
+        path = []
+        while i is not None:
+            path.append(net.ids[i])
+            es = start.get(i, self.start[i])
+            i = next((p for p in net.predecessors[i] if ef(p) == es), None)
+        return path[::-1]
@@ -0,0 +1,94 @@
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# Rows of the worker x task comparison handled per NumPy operation.
+ELIGIBILITY_BLOCK = 512
+
+class SkillIndex:
+    """
+    Interns skill names to bit positions and encodes skill sets as
+    ``uint64`` bitsets, one row per worker or task.
+    """
+
+    def __init__(self, *skill_lists: Iterable[Iterable[str]]):
+        self.bits: Dict[str, int] = {}
+        for lists in skill_lists:
+            for skills in lists:
+                for skill in skills or ():
+                    self.bits.setdefault(skill, len(self.bits))
+
+    @property
+    def words(self) -> int:
+        return max(1, (len(self.bits) + 63) // 64)
+
+    def encode(self, skill_lists: Sequence[Iterable[str]]) -> np.ndarray:
+        """(len(skill_lists), words) bitset array; unknown skills get fresh bits."""
+        rows, cols = [], []
+        for r, skills in enumerate(skill_lists):
+            for skill in skills or ():
+                rows.append(r)
+                cols.append(self.bits.setdefault(skill, len(self.bits)))
+        sets = np.zeros((len(skill_lists), self.words), dtype=np.uint64)
+        if rows:
+            cols = np.asarray(cols)
+            np.bitwise_or.at(sets, (np.asarray(rows), cols // 64),
+                             np.left_shift(np.uint64(1), (cols % 64).astype(np.uint64)))
+        return sets
+
+    def has_skill(self, sets: np.ndarray, skill: str) -> np.ndarray:
+        """Boolean mask of the rows of ``sets`` holding ``skill``."""
+        bit = self.bits.get(skill)
+        if bit is None or bit // 64 >= sets.shape[1]:
+            return np.zeros(len(sets), dtype=bool)
+        return (sets[:, bit // 64] >> np.uint64(bit % 64)) & np.uint64(1) == 1
+
+def eligibility_matrix(worker_skills: Sequence[Iterable[str]], required_skills: Sequence[Iterable[str]]) -> np.ndarray:
+    """
+    Boolean (workers, tasks) matrix, True where a worker holds every skill
+    a task requires. Computed as ``required & ~held == 0`` over bitsets in
+    blocks of workers.
+    """
+    index = SkillIndex(required_skills, worker_skills)
+    required = index.encode(required_skills)
+    missing = ~index.encode(worker_skills)
+    eligible = np.empty((len(worker_skills), len(required_skills)), dtype=bool)
+    for lo in range(0, len(worker_skills), ELIGIBILITY_BLOCK):
+        block = missing[lo:lo + ELIGIBILITY_BLOCK]
+        eligible[lo:lo + ELIGIBILITY_BLOCK] = ~((block[:, None, :] & required[None, :, :]).any(axis=2))
+    return eligible
+
+def eligible_pairs(eligible: np.ndarray) -> List[tuple]:
+    """``(worker, task)`` index pairs of an eligibility matrix, in row-major order."""
+    return list(zip(*(idx.tolist() for idx in np.nonzero(eligible))))
+
+def eligibility_components(eligible: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Connected components of the bipartite worker/task graph of an
+    eligibility matrix, as ``(worker_labels, task_labels)``. Labels are
+    consecutive from 0 in order of first appearance, workers first; a task
+    no worker can do forms a component of its own.
+
+    Labels start as node indices and every edge pulls both ends down to the
+    smaller label, with pointer jumping in between, until nothing changes.
+    """
+    workers, tasks = eligible.shape
+    w, t = np.nonzero(eligible)
+    t = t + workers
+    label = np.arange(workers + tasks)
+    while True:
+        low = np.minimum(label[w], label[t])
+        before = label.copy()
+        np.minimum.at(label, label[w], low)
+        np.minimum.at(label, label[t], low)
+        while True:
+            jumped = label[label]
+            if np.array_equal(jumped, label):
+                break
+            label = jumped
+        if np.array_equal(label, before):
+            break
+    _, first, dense = np.unique(label, return_index=True, return_inverse=True)
+    order = np.argsort(np.argsort(first))
+    dense = order[dense]
+    return dense[:workers], dense[workers:]
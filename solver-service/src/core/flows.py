@@ -0,0 +1,73 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from ortools.graph.python import linear_sum_assignment, min_cost_flow
+
+def integer_costs(costs: np.ndarray, max_decimals: int = 6) -> Optional[Tuple[np.ndarray, int]]:
+    """
+    Exact int64 version of ``costs`` and its scale factor, or None when the
+    costs are not finite or need more than ``max_decimals`` decimals.
+    Network-flow solvers only accept integer costs.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    if not np.all(np.isfinite(costs)):
+        return None
+    for decimals in range(max_decimals + 1):
+        scale = 10 ** decimals
+        scaled = np.round(costs * scale)
+        if np.allclose(scaled, costs * scale, rtol=0, atol=1e-6) and np.abs(scaled).max(initial=0) < 2 ** 52:
+            return scaled.astype(np.int64), scale
+    return None
+
+def solve_transportation(costs: np.ndarray, allowed: np.ndarray, upper: Sequence[int],
+                         lower: Optional[Sequence[int]] = None) -> Tuple[str, Optional[np.ndarray]]:
+    """
+    Assign every task (column) to one resource (row) at minimum total cost.
+
+    ``costs`` and ``allowed`` are (resources, tasks); resource ``r`` takes
+    between ``lower[r]`` and ``upper[r]`` tasks. This is a transportation
+    problem, so it is solved exactly as a min-cost flow; square instances
+    with unit capacities go to the linear sum assignment solver instead.
+    Returns ``(engine, resource index per task)``, with None when infeasible.
+    """
+    num_resources, num_tasks = allowed.shape
+    upper = np.minimum(np.asarray(upper, dtype=np.int64), num_tasks)
+    lower = np.zeros(num_resources, dtype=np.int64) if lower is None else np.asarray(lower, dtype=np.int64)
+    rows, cols = np.nonzero(allowed)
+    arc_costs = np.asarray(costs, dtype=np.int64)[rows, cols]
+    if num_tasks == 0:
+        return "min_cost_flow", (np.zeros(0, dtype=np.int64) if (lower == 0).all() else None)
+    if lower.sum() > num_tasks or (lower > upper).any():
+        return "min_cost_flow", None
+
+    if num_resources == num_tasks and (upper == 1).all():
+        solver = linear_sum_assignment.SimpleLinearSumAssignment()
+        solver.add_arcs_with_cost(cols, rows, arc_costs)
+        if solver.solve() != solver.OPTIMAL:
+            return "linear_sum_assignment", None
+        return "linear_sum_assignment", np.array([solver.right_mate(t) for t in range(num_tasks)], dtype=np.int64)
+
+    # Nodes: source, resources, tasks, sink. A lower bound on a resource is
+    # moved into node supplies so the remaining arc capacity is upper - lower.
+    source, sink = 0, 1 + num_resources + num_tasks
+    res_nodes = 1 + np.arange(num_resources)
+    task_nodes = 1 + num_resources + np.arange(num_tasks)
+    tails = np.concatenate([np.full(num_resources, source), res_nodes[rows], task_nodes])
+    heads = np.concatenate([res_nodes, task_nodes[cols], np.full(num_tasks, sink)])
+    capacities = np.concatenate([upper - lower, np.ones(len(rows) + num_tasks, dtype=np.int64)])
+    unit_costs = np.concatenate([np.zeros(num_resources, dtype=np.int64), arc_costs,
+                                 np.zeros(num_tasks, dtype=np.int64)])
+    supplies = np.zeros(sink + 1, dtype=np.int64)
+    supplies[source] = num_tasks - lower.sum()
+    supplies[res_nodes] = lower
+    supplies[sink] = -num_tasks
+    solver = min_cost_flow.SimpleMinCostFlow()
+    solver.add_arcs_with_capacity_and_unit_cost(tails, heads, capacities, unit_costs)
+    solver.set_nodes_supplies(np.arange(sink + 1), supplies)
+    if solver.solve() != solver.OPTIMAL:
+        return "min_cost_flow", None
+    flows = solver.flows(np.arange(num_resources, num_resources + len(rows)))
+    assignment = np.full(num_tasks, -1, dtype=np.int64)
+    used = flows > 0
+    assignment[cols[used]] = rows[used]
+    return "min_cost_flow", assignment
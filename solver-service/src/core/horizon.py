@@ -0,0 +1,31 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+def rolling_options(config: Optional[Dict[str, Any]]) -> Optional[Tuple[int, int]]:
+    """
+    ``(window, overlap)`` from ``solver_config.rolling_horizon``, or None to
+    solve the whole horizon at once. ``overlap`` defaults to 0.
+    """
+    options = (config or {}).get("rolling_horizon")
+    if not options:
+        return None
+    window, overlap = int(options.get("window", 0)), int(options.get("overlap", 0))
+    if window <= 0 or not 0 <= overlap < window:
+        raise ValueError(f"rolling_horizon needs window > overlap >= 0, got window={window}, overlap={overlap}")
+    return window, overlap
+
+def rolling_windows(horizon: int, window: int, overlap: int) -> List[Tuple[int, int, int]]:
+    """
+    ``(start, end, commit)`` per window of a rolling horizon: each window
+    solves ``[start, end)`` and keeps the decisions before ``commit``; the
+    last ``overlap`` periods are solved again by the next window, which
+    starts at ``commit``. The final window commits everything up to
+    ``horizon``.
+    """
+    windows = []
+    start = 0
+    while start < horizon:
+        end = min(start + window, horizon)
+        commit = end if end == horizon else end - overlap
+        windows.append((start, end, commit))
+        start = commit
+    return windows
@@ -0,0 +1,114 @@
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ortools.sat.python import cp_model
+
+def merge_windows(windows: Iterable[Sequence[float]]) -> List[Tuple[int, int]]:
+    """
+    Sort ``[start, end]`` windows and merge overlapping or touching ones.
+
+    Bounds are truncated to integers; empty windows are dropped since they
+    cannot overlap any task.
+    """
+    merged: List[Tuple[int, int]] = []
+    for s, e in sorted((int(w[0]), int(w[1])) for w in windows):
+        if e <= s:
+            continue
+        if merged and s <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+        else:
+            merged.append((s, e))
+    return merged
+
+def allowed_start_domain(windows: List[Tuple[int, int]], duration: int, horizon: int) -> cp_model.Domain:
+    """
+    Start times in ``[0, horizon - duration]`` for which ``[start, start + duration)``
+    avoids every merged window. A start ``x`` overlaps ``(s, e)`` exactly
+    when ``s - duration < x < e``.
+    """
+    allowed, lo = [], 0
+    hi = horizon - duration
+    for s, e in windows:
+        if lo > hi:
+            break
+        if s - duration >= lo:
+            allowed.append([lo, min(s - duration, hi)])
+        lo = max(lo, e)
+    if lo <= hi:
+        allowed.append([lo, hi])
+    return cp_model.Domain.FromIntervals(allowed)
+
+def sweep_pairs(earliest: Sequence[int], latest: Sequence[int], reach: Sequence[int]) -> List[Tuple[int, int]]:
+    """
+    Pairs ``(a, b)`` whose windows come within ``reach[a]`` of each other,
+    i.e. ``earliest[b] < latest[a] + reach[a]`` with ``a`` opening first.
+
+    Items are swept in order of ``earliest`` while a heap retires those
+    that can no longer interact, so the cost is O(n log n) plus the number
+    of pairs reported.
+    """
+    order = sorted(range(len(earliest)), key=lambda i: (earliest[i], i))
+    active: List[Tuple[int, int]] = []
+    pairs = []
+    for b in order:
+        while active and active[0][0] <= earliest[b]:
+            heapq.heappop(active)
+        pairs.extend((a, b) for _, a in active)
+        heapq.heappush(active, (latest[b] + reach[b], b))
+    return pairs
+
+def optional_copies(model: cp_model.CpModel, start: cp_model.IntVar, size: int,
+                    literals: Sequence[cp_model.IntVar], name: str) -> List[cp_model.IntervalVar]:
+    """
+    One optional fixed-size interval per presence literal, all sharing
+    ``start``. The start/size/end expressions are parsed once and copied
+    into each interval, which keeps model building linear in the number
+    of literals for large (resource, task) grids.
+    """
+    start_expr = model.ParseLinearExpression(start)
+    size_expr = model.ParseLinearExpression(size)
+    end_expr = model.ParseLinearExpression(start + size)
+    return [
+        cp_model.IntervalVar(model.Proto(), start_expr, size_expr, end_expr, lit.Index(), f'{name}_{k}')
+        for k, lit in enumerate(literals)
+    ]
+
+def window_ranges(times: Sequence[int], starts: Iterable[int], width: int, cap: int) -> List[Tuple[int, int]]:
+    """
+    Index ranges ``[lo, hi)`` into the sorted ``times`` of the items falling
+    in ``[t, t + width)`` for each increasing start ``t``, found with two
+    pointers. Only windows holding more than ``cap`` items are kept (others
+    cannot violate a ``<= cap`` limit), and a window contained in another
+    is dropped since its limit is implied.
+    """
+    ranges: List[Tuple[int, int]] = []
+    lo = hi = 0
+    for t in starts:
+        while lo < len(times) and times[lo] < t:
+            lo += 1
+        hi = max(hi, lo)
+        while hi < len(times) and times[hi] < t + width:
+            hi += 1
+        if hi - lo <= cap:
+            continue
+        # Both ends only move forward, so containment can only involve the last window kept
+        if ranges and ranges[-1][0] >= lo and ranges[-1][1] <= hi:
+            ranges.pop()
+        if not ranges or hi > ranges[-1][1]:
+            ranges.append((lo, hi))
+    return ranges
+
+def task_window(task: Dict[str, Any], horizon: int) -> Optional[Tuple[int, int, int]]:
+    """
+    ``(lo, hi, size)`` of a usage task: its ``time_window`` (or the whole
+    horizon) capped at ``horizon`` when one is set, and its ``duration``
+    (or the window length). None for a task with neither.
+    """
+    window, dur = task.get('time_window'), task.get('duration')
+    if window is None and dur is None:
+        return None
+    lo, hi = (int(window[0]), int(window[1])) if window else (0, horizon)
+    size = int(dur) if dur is not None else hi - lo
+    if horizon:
+        hi = min(hi, horizon)
+    return lo, hi, size
@@ -0,0 +1,280 @@
+import abc
+import time
+from collections import Counter
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .eligibility import eligibility_matrix
+from .intervals import task_window
+
+Neighborhood = Tuple[str, List[Any]]  # (kind, ids of the freed entities)
+
+def search_options(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Budgets of :func:`large_neighborhood_search` from a request's ``solver_config``."""
+    config = config or {}
+    return {
+        "time_limit": float(config.get("time_limit", 30)),
+        "iterations": int(config.get("iterations", 100)),
+        "workers": max(1, int(config.get("workers", 1))),
+        "seed": config.get("seed"),
+    }
+
+def run_subproblem(method: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point: run a ``SolverService`` method on a subproblem in this process."""
+    from .solver import SolverService
+    return getattr(SolverService(), method)(data)
+
+def large_neighborhood_search(problem: "LNSProblem", incumbent: Any, time_limit: float = 30,
+                              iterations: int = 100, workers: int = 1, seed: Optional[int] = None,
+                              pool: Optional[Executor] = None):
+    """
+    Improve ``incumbent`` by repeatedly freeing a neighborhood, fixing the
+    rest and re-solving the subproblem.
+
+    Each round draws up to ``workers`` neighborhoods from the current
+    incumbent and solves them at once on ``pool``, the caller's (shared)
+    process pool, or in process without one; the best strict improvement is
+    accepted. Stops after
+    ``iterations`` subproblems, ``time_limit`` seconds or once the problem's
+    bound is reached. Returns the final incumbent and its search statistics:
+    the incumbent trace and acceptance rate per neighborhood kind.
+    """
+    rng = np.random.default_rng(seed)
+    began = time.perf_counter()
+    best, best_score = incumbent, problem.score(incumbent)
+    trace = [{"iteration": 0, "seconds": 0.0, "objective": best_score, "neighborhood": "greedy"}]
+    tried, accepted = Counter(), Counter()
+    done = 0
+    while done < iterations and best_score < problem.bound:
+        left = time_limit - (time.perf_counter() - began)
+        if left <= 0:
+            break
+        batch = problem.neighborhoods(best, rng, min(workers, iterations - done))
+        if not batch:
+            break
+        jobs = [problem.subproblem(best, free, left) for _, free in batch]
+        if pool is not None:
+            futures = [pool.submit(run_subproblem, problem.method, job) for job in jobs]
+            try:
+                results = [f.result() for f in futures]
+            finally:
+                # The pool outlives the search: drop whatever a failure left queued
+                for f in futures:
+                    f.cancel()
+        else:
+            results = [run_subproblem(problem.method, job) for job in jobs]
+        done += len(batch)
+        round_best = None
+        for (kind, free), result in zip(batch, results):
+            tried[kind] += 1
+            plan = problem.merge(best, free, result)
+            if plan is None:
+                continue
+            score = problem.score(plan)
+            if score > best_score and (round_best is None or score > round_best[0]):
+                round_best = (score, plan, kind)
+        if round_best is not None:
+            best_score, best, kind = round_best
+            accepted[kind] += 1
+            trace.append({"iteration": done, "seconds": time.perf_counter() - began,
+                          "objective": best_score, "neighborhood": kind})
+    stats = {
+        "iterations": done,
+        "seconds": time.perf_counter() - began,
+        "objective": best_score,
+        "trace": trace,
+        "acceptance": {kind: {"tried": n, "accepted": accepted[kind], "rate": accepted[kind] / n}
+                       for kind, n in tried.items()},
+    }
+    return best, stats
+
+class LNSProblem(abc.ABC):
+    """
+    Neighborhood structure of one template. ``method`` names the
+    ``SolverService`` method that solves a subproblem; scores are maximized.
+    """
+    method: str = ""
+    bound: float = float("inf")
+
+    @abc.abstractmethod
+    def score(self, plan: Any) -> float:
+        """Objective of ``plan``, higher is better."""
+
+    @abc.abstractmethod
+    def neighborhoods(self, plan: Any, rng: np.random.Generator, count: int) -> List[Neighborhood]:
+        """Up to ``count`` neighborhoods of ``plan`` to free."""
+
+    @abc.abstractmethod
+    def subproblem(self, plan: Any, free: List[Any], time_left: float) -> Dict[str, Any]:
+        """Request data for ``method`` with ``free`` released and the rest of ``plan`` fixed."""
+
+    @abc.abstractmethod
+    def merge(self, plan: Any, free: List[Any], result: Dict[str, Any]) -> Any:
+        """``plan`` with ``free`` replaced by the subproblem ``result``, or None if it failed."""
+
+    @staticmethod
+    def _draw(groups: Dict[str, Dict[Any, List[Any]]], rng: np.random.Generator, count: int) -> List[Neighborhood]:
+        """Up to ``count`` distinct neighborhoods from ``{kind: {key: ids}}``, each kind equally likely."""
+        left = {kind: [key for key, ids in by_key.items() if ids] for kind, by_key in groups.items()}
+        drawn = []
+        while len(drawn) < count:
+            kinds = [kind for kind, keys in left.items() if keys]
+            if not kinds:
+                break
+            kind = kinds[rng.integers(len(kinds))]
+            key = left[kind].pop(rng.integers(len(left[kind])))
+            drawn.append((kind, list(groups[kind][key])))
+        return drawn
+
+class CrewAllocationLNS(LNSProblem):
+    """
+    Crew allocation as a partial assignment: the plan maps task ids to crew
+    ids and scores the priority of the tasks it covers, so an incomplete
+    greedy start improves until every task is placed. Neighborhoods free one
+    site or one skill group together with every uncovered task; the other
+    tasks stay on their crews, whose remaining hours bound the subproblem.
+    """
+    method = "_crew_allocation_subproblem"
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.crews = data.get('crews', [])
+        self.tasks = {t.get('id'): t for t in data.get('tasks', [])}
+        priorities = data.get('priorities', {})
+        self.weight = {tid: int(priorities.get(t.get('site_id'), 1)) for tid, t in self.tasks.items()}
+        self.hours = {tid: int(t.get('duration', 0)) for tid, t in self.tasks.items()}
+        max_daily = None
+        for rule in data.get('union_rules', []):
+            if 'max_work_hours_per_day' in rule:
+                max_daily = rule['max_work_hours_per_day']
+        self.capacity = {}
+        for crew in self.crews:
+            total = sum((w[1] - w[0]) for w in crew.get('availability', []))
+            self.capacity[crew.get('id')] = int(min(total, max_daily) if max_daily is not None else total)
+        eligible = eligibility_matrix([c.get('skills', []) for c in self.crews],
+                                      [t.get('required_skills', []) for t in self.tasks.values()])
+        self.eligible = {tid: [self.crews[i].get('id') for i in np.flatnonzero(eligible[:, j])]
+                         for j, tid in enumerate(self.tasks)}
+        self.bound = float(sum(self.weight.values()))
+        self.groups: Dict[str, Dict[Any, List[Any]]] = {"site": {}, "skill": {}}
+        for tid, t in self.tasks.items():
+            self.groups["site"].setdefault(t.get('site_id'), []).append(tid)
+            self.groups["skill"].setdefault(tuple(sorted(t.get('required_skills', []))), []).append(tid)
+
+    def greedy(self) -> Dict[Any, Any]:
+        """Tasks with the fewest eligible crews first, each on the eligible crew with the most hours left."""
+        left = dict(self.capacity)
+        plan = {}
+        for tid in sorted(self.tasks, key=lambda t: (len(self.eligible[t]), -self.hours[t])):
+            fits = [c for c in self.eligible[tid] if left[c] >= self.hours[tid]]
+            if fits:
+                crew = max(fits, key=lambda c: left[c])
+                left[crew] -= self.hours[tid]
+                plan[tid] = crew
+        return plan
+
+    def score(self, plan: Dict[Any, Any]) -> float:
+        return float(sum(self.weight[tid] for tid in plan))
+
+    def neighborhoods(self, plan, rng, count):
+        uncovered = [tid for tid in self.tasks if tid not in plan]
+        return [(kind, sorted(set(free) | set(uncovered), key=str)) for kind, free in self._draw(self.groups, rng, count)]
+
+    def subproblem(self, plan, free, time_left):
+        freed = set(free)
+        load = Counter()
+        for tid, crew in plan.items():
+            if tid not in freed:
+                load[crew] += self.hours[tid]
+        crews = {c for tid in freed for c in self.eligible[tid]}
+        config = self.data.get('solver_config') or {}
+        return {
+            'crews': [{**crew, 'availability': [[0, self.capacity[crew.get('id')] - load[crew.get('id')]]]}
+                      for crew in self.crews if crew.get('id') in crews],
+            'tasks': [self.tasks[tid] for tid in free],
+            'priorities': self.data.get('priorities', {}),
+            'solver_config': {'time_limit': min(time_left, float(config.get('sub_time_limit', 10)))},
+        }
+
+    def merge(self, plan, free, result):
+        if result.get('status') != 'success':
+            return None
+        merged = {tid: crew for tid, crew in plan.items() if tid not in set(free)}
+        merged.update({a['task_id']: a['crew_id'] for a in result['solution']['assignments']})
+        return merged
+
+class EquipmentPlanningLNS(LNSProblem):
+    """
+    Equipment planning on handler solutions. A subproblem holds only the
+    freed tasks, with the previous plan as a hint; the pinned tasks near
+    their windows stay on their units as busy blocks, and every unit with
+    pinned work counts as used. Neighborhoods free one site, one time
+    window, or the tasks of the least-loaded unit in use together with
+    those of another unit.
+    """
+    method = "_equipment_resource_planning_subproblem"
+
+    def __init__(self, data: Dict[str, Any], bound: float = -1.0):
+        self.data = data
+        self.tasks = data.get('tasks', [])
+        self.horizon = int(data.get('time_horizon', 0) or 0)
+        self.bound = bound
+        self.order = {t.get('id'): j for j, t in enumerate(self.tasks)}
+        self.site = {t.get('id'): t.get('site_id', t.get('project_id')) for t in self.tasks}
+        self.units = [e.get('id') for e in data.get('equipment', [])]
+        move = np.asarray(data.get('move_times') if data.get('move_times') is not None else [])
+        self.reach = int(move.max()) if move.ndim == 2 and move.size else 0
+
+    def score(self, plan: Dict[str, Any]) -> float:
+        return -float(len(plan['equipment_used']))
+
+    def neighborhoods(self, plan, rng, count):
+        by_unit: Dict[Any, List[Any]] = {}
+        for a in plan['assignments']:
+            by_unit.setdefault(a['equipment_id'], []).append(a['task_id'])
+        groups: Dict[str, Dict[Any, List[Any]]] = {"site": {}, "window": {}, "unit": {}}
+        for t in self.tasks:
+            groups["site"].setdefault(t.get('site_id', t.get('project_id')), []).append(t.get('id'))
+        width = max(1, self.horizon // 4)
+        for a in plan['assignments']:
+            if a.get('start') is not None:
+                groups["window"].setdefault(a['start'] // width, []).append(a['task_id'])
+        units = sorted(by_unit, key=lambda u: len(by_unit[u]))
+        if len(units) > 1:
+            for other in units[1:]:
+                groups["unit"][other] = by_unit[units[0]] + by_unit[other]
+        return self._draw(groups, rng, count)
+
+    def subproblem(self, plan, free, time_left):
+        freed = set(free)
+        tasks = [t for t in self.tasks if t.get('id') in freed]
+        spans = [span for span in (task_window(t, self.horizon) for t in tasks) if span is not None]
+        lo = min((span[0] for span in spans), default=0) - self.reach
+        hi = max((span[1] for span in spans), default=0) + self.reach
+        # Pinned blocks that cannot meet a freed task, move included, only mark their unit used
+        busy: Dict[Any, List[tuple]] = {}
+        for a in plan['assignments']:
+            if a['task_id'] in freed:
+                continue
+            blocks = busy.setdefault(a['equipment_id'], [])
+            if a.get('start') is not None and a['start'] < hi and a['end'] > lo:
+                blocks.append((a['start'], a['end'], self.site[a['task_id']]))
+        config = self.data.get('solver_config') or {}
+        return {
+            **{k: v for k, v in self.data.items() if k not in ('tasks', 'previous_solution', 'stability')},
+            'tasks': tasks,
+            'previous_solution': {'assignments': [a for a in plan['assignments'] if a['task_id'] in freed]},
+            'solver_config': {'time_limit': min(time_left, float(config.get('sub_time_limit', 10)))},
+            'busy': busy,
+        }
+
+    def merge(self, plan, free, result):
+        if result.get('status') != 'success':
+            return None
+        freed = set(free)
+        assignments = [a for a in plan['assignments'] if a['task_id'] not in freed]
+        assignments = sorted(assignments + result['solution']['assignments'], key=lambda a: self.order[a['task_id']])
+        used = {a['equipment_id'] for a in assignments}
+        return {**plan, 'assignments': assignments, 'equipment_used': [u for u in self.units if u in used]}
@@ -0,0 +1,93 @@
+import base64
+import io
+from typing import Annotated, Any
+
+import numpy as np
+from pydantic import PlainSerializer, PlainValidator, WithJsonSchema
+
+# Dtypes accepted for binary matrix payloads. Raw buffers are always read
+# little-endian so clients on any platform produce the same bytes.
+MATRIX_DTYPES = {
+    "float32": np.dtype("<f4"),
+    "float64": np.dtype("<f8"),
+    "int32": np.dtype("<i4"),
+    "int64": np.dtype("<i8"),
+}
+
+def decode_npy(raw: bytes) -> np.ndarray:
+    """Decode the bytes of an ``.npy`` file into a 2-D matrix."""
+    try:
+        array = np.load(io.BytesIO(raw), allow_pickle=False)
+    except Exception as e:
+        raise ValueError(f"Invalid .npy payload: {e}")
+    return _check_matrix(array)
+
+def decode_matrix(value: Any) -> np.ndarray:
+    """
+    Decode a matrix field into a NumPy array.
+
+    Accepts a nested list, an ndarray, or an encoded payload:
+    ``{"encoding": "base64", "dtype": "float32", "shape": [n, m], "data": "..."}``
+    with raw little-endian values, or ``{"encoding": "npy", "data": "..."}``
+    with a base64 encoded ``.npy`` file.
+    """
+    if isinstance(value, np.ndarray):
+        return _check_matrix(value)
+    if isinstance(value, dict):
+        encoding = value.get("encoding", "base64")
+        try:
+            raw = base64.b64decode(value["data"], validate=True)
+        except KeyError:
+            raise ValueError("Encoded matrix is missing 'data'")
+        except Exception as e:
+            raise ValueError(f"Invalid base64 matrix data: {e}")
+        if encoding == "npy":
+            return decode_npy(raw)
+        if encoding != "base64":
+            raise ValueError(f"Unsupported matrix encoding: {encoding}")
+        dtype = MATRIX_DTYPES.get(value.get("dtype", "float32"))
+        if dtype is None:
+            raise ValueError(f"Unsupported matrix dtype: {value.get('dtype')}; expected one of {sorted(MATRIX_DTYPES)}")
+        shape = tuple(int(n) for n in value.get("shape", ()))
+        if len(shape) != 2:
+            raise ValueError("Encoded matrix 'shape' must have two dimensions")
+        if len(raw) != shape[0] * shape[1] * dtype.itemsize:
+            raise ValueError(f"Matrix data has {len(raw)} bytes, expected {shape[0] * shape[1] * dtype.itemsize} for shape {list(shape)}")
+        return np.frombuffer(raw, dtype=dtype).reshape(shape)
+    if isinstance(value, (list, tuple)):
+        try:
+            return _check_matrix(np.asarray(value, dtype=np.float64))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Matrix must be a rectangular list of numbers: {e}")
+    raise ValueError("Matrix must be a list of lists or an encoded matrix object")
+
+def _check_matrix(array: np.ndarray) -> np.ndarray:
+    if array.ndim != 2:
+        raise ValueError(f"Matrix must be two-dimensional, got shape {list(array.shape)}")
+    if array.dtype.kind not in "iuf":
+        raise ValueError(f"Matrix must be numeric, got dtype {array.dtype}")
+    return array
+
+# Request field type for distance/cost/time matrices. Values stay NumPy arrays
+# through ``.dict()`` so solvers index them directly; only JSON serialization
+# converts back to lists.
+Matrix = Annotated[
+    Any,
+    PlainValidator(decode_matrix),
+    PlainSerializer(lambda m: np.asarray(m).tolist(), when_used="json"),
+    WithJsonSchema({
+        "anyOf": [
+            {"type": "array", "items": {"type": "array", "items": {"type": "number"}}},
+            {
+                "type": "object",
+                "properties": {
+                    "encoding": {"type": "string", "enum": ["base64", "npy"]},
+                    "dtype": {"type": "string", "enum": sorted(MATRIX_DTYPES)},
+                    "shape": {"type": "array", "items": {"type": "integer"}},
+                    "data": {"type": "string"},
+                },
+                "required": ["data"],
+            },
+        ]
+    }),
+]
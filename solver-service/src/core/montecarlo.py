@@ -0,0 +1,178 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .cpm import ProjectNetwork, forward_pass, backward_pass
+from .sketches import FixedHistogram, KLLSketch, RunningMoments
+
+DISTRIBUTIONS = ("constant", "normal", "triangular", "pert", "lognormal")
+
+# Upper bound on the number of (task, sample) cells held per array in a chunk.
+CHUNK_CELLS = 1 << 21
+
+def parse_distribution(spec: Optional[Dict[str, Any]], default: float) -> Tuple[str, Tuple[float, ...]]:
+    """
+    Normalize a risk factor into ``(kind, params)``.
+
+    A factor without ``distribution`` is normal with ``mean``/``stddev``, as
+    the endpoint has always treated it. Tasks without a factor are constant.
+    """
+    if spec is None:
+        return "constant", (float(default),)
+    kind = spec.get("distribution", "normal").lower()
+    if kind == "constant":
+        return kind, (float(spec.get("value", spec.get("mean", default))),)
+    if kind == "normal":
+        return kind, (float(spec.get("mean", 1)), float(spec.get("stddev", 0.1)))
+    if kind in ("triangular", "pert"):
+        lo, mode, hi = float(spec["min"]), float(spec["mode"]), float(spec["max"])
+        if not lo <= mode <= hi:
+            raise ValueError(f"Task {spec.get('task_id')}: {kind} distribution requires min <= mode <= max")
+        if kind == "pert":
+            return kind, (lo, mode, hi, float(spec.get("lambda", 4)))
+        return kind, (lo, mode, hi)
+    if kind == "lognormal":
+        if "mu" in spec:
+            return kind, (float(spec["mu"]), float(spec.get("sigma", 0.1)))
+        # Parameterized by the mean/stddev of the duration itself
+        mean, sd = float(spec.get("mean", 1)), float(spec.get("stddev", 0.1))
+        if mean <= 0:
+            raise ValueError(f"Task {spec.get('task_id')}: lognormal mean must be positive")
+        sigma2 = np.log1p((sd / mean) ** 2)
+        return kind, (float(np.log(mean) - sigma2 / 2), float(np.sqrt(sigma2)))
+    raise ValueError(f"Unsupported distribution '{kind}'; expected one of {list(DISTRIBUTIONS)}")
+
+def draw_samples(rng: np.random.Generator, kind: str, p: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    """Draw ``shape`` samples where ``p`` holds one parameter column per row."""
+    if kind == "constant":
+        return np.broadcast_to(p[0][:, None], shape)
+    if kind == "normal":
+        return rng.normal(p[0][:, None], p[1][:, None], shape)
+    if kind == "lognormal":
+        return rng.lognormal(p[0][:, None], p[1][:, None], shape)
+    if kind == "triangular":
+        lo, mode, hi = (c[:, None] for c in p)
+        # Inverse CDF so degenerate (min == max) tasks are allowed
+        u = rng.random(shape)
+        width = np.where(hi > lo, hi - lo, 1.0)
+        cut = (mode - lo) / width
+        return np.where(
+            u < cut,
+            lo + np.sqrt(u * (hi - lo) * (mode - lo)),
+            hi - np.sqrt((1 - u) * (hi - lo) * (hi - mode)),
+        )
+    # pert
+    lo, mode, hi, lam = (c[:, None] for c in p)
+    width = np.where(hi > lo, hi - lo, 1.0)
+    alpha = 1 + lam * (mode - lo) / width
+    beta = 1 + lam * (hi - mode) / width
+    return lo + (hi - lo) * rng.beta(alpha, beta, shape)
+
+class MonteCarloEngine:
+    """
+    Vectorized Monte Carlo CPM over a project network.
+
+    The network is topologically sorted once; each chunk of samples is drawn
+    as a (tasks, samples) array per distribution family and pushed through
+    the forward (and optionally backward) pass with NumPy operations.
+    """
+
+    def __init__(self, project_network: List[Dict[str, Any]], risk_factors: List[Dict[str, Any]],
+                 network: Optional[ProjectNetwork] = None, default_duration: float = 1):
+        self.network = network or ProjectNetwork(project_network)
+        factors: Dict[Any, Dict[str, Any]] = {}
+        for rf in risk_factors:
+            factors.setdefault(rf.get("task_id"), rf)
+        groups: Dict[str, Tuple[List[int], List[Tuple[float, ...]]]] = {}
+        for i, task in enumerate(self.network.tasks):
+            kind, params = parse_distribution(factors.get(task["id"]), task.get("duration", default_duration))
+            rows, plist = groups.setdefault(kind, ([], []))
+            rows.append(i)
+            plist.append(params)
+        # kind -> (row indices, parameter columns)
+        self.groups = {
+            kind: (np.array(rows, dtype=np.intp), np.array(plist, dtype=np.float64).T)
+            for kind, (rows, plist) in groups.items()
+        }
+
+    @property
+    def default_chunk_size(self) -> int:
+        return max(1, CHUNK_CELLS // max(1, len(self.network)))
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """Draw a (tasks, n) array of non-negative task durations."""
+        durations = np.empty((len(self.network), n))
+        for kind, (rows, p) in self.groups.items():
+            durations[rows] = draw_samples(rng, kind, p, (len(rows), n))
+        np.maximum(durations, 0, out=durations)
+        return durations
+
+    def run_chunk(self, rng: np.random.Generator, n: int, criticality: bool = True) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Simulate ``n`` samples; returns project durations and, when requested,
+        the number of samples in which each task had zero total float.
+        """
+        if len(self.network) == 0:
+            return np.zeros(n), (np.zeros(0, dtype=np.int64) if criticality else None)
+        durations = self.sample(rng, n)
+        finish = forward_pass(self.network, durations)
+        project = finish[self.network.sinks].max(axis=0)
+        if not criticality:
+            return project, None
+        latest = backward_pass(self.network, durations, project)
+        tol = 1e-9 * np.maximum(project, 1.0)
+        critical = (latest - finish <= tol).sum(axis=1)
+        return project, critical
+
+    def chunks(self, num_simulations: int, rng: np.random.Generator, chunk_size: Optional[int] = None,
+               criticality: bool = True) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Yield ``run_chunk`` results until ``num_simulations`` samples are drawn."""
+        chunk_size = chunk_size or self.default_chunk_size
+        remaining = num_simulations
+        while remaining > 0:
+            n = min(chunk_size, remaining)
+            yield self.run_chunk(rng, n, criticality)
+            remaining -= n
+
+class RiskSummary:
+    """
+    Constant-memory, mergeable summary of simulated project durations:
+    running moments, a KLL quantile sketch, a fixed-bin histogram and
+    per-task criticality counts.
+    """
+
+    def __init__(self, num_tasks: int, edges: Tuple[float, float], bins: int = 20, k: int = 512,
+                 seed: Optional[int] = None):
+        self.moments = RunningMoments()
+        self.sketch = KLLSketch(k, seed)
+        self.histogram = FixedHistogram(edges[0], edges[1], bins)
+        self.critical = np.zeros(num_tasks, dtype=np.int64)
+
+    def update(self, durations: np.ndarray, critical: Optional[np.ndarray]) -> None:
+        self.moments.update(durations)
+        self.sketch.update(durations)
+        self.histogram.update(durations)
+        if critical is not None:
+            self.critical += critical
+
+    def merge(self, other: "RiskSummary") -> None:
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        self.histogram.merge(other.histogram)
+        self.critical += other.critical
+
+def histogram_range(pilot: np.ndarray, margin: float = 0.25) -> Tuple[float, float]:
+    """Fixed histogram range from a pilot chunk, widened so few samples fall outside."""
+    lo, hi = float(pilot.min()), float(pilot.max())
+    pad = (hi - lo) * margin if hi > lo else max(abs(lo) * margin, 1.0)
+    return lo - pad, hi + pad
+
+def simulate_summary(engine: MonteCarloEngine, num_simulations: int, seed: np.random.SeedSequence,
+                     edges: Tuple[float, float], chunk_size: Optional[int] = None, criticality: bool = True,
+                     k: int = 512) -> RiskSummary:
+    """Stream ``num_simulations`` samples into a RiskSummary; usable as a process-pool task."""
+    rng = np.random.default_rng(seed)
+    summary = RiskSummary(len(engine.network), edges, k=k, seed=int(seed.generate_state(1)[0]))
+    for durations, critical in engine.chunks(num_simulations, rng, chunk_size, criticality):
+        summary.update(durations, critical)
+    return summary
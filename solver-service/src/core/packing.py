@@ -0,0 +1,107 @@
+import bisect
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+class _RoomTree:
+    """Max segment tree over bin rooms, to find the first bin with enough room in O(log n)."""
+
+    def __init__(self, n: int):
+        self.size = 1
+        while self.size < max(n, 1):
+            self.size *= 2
+        self.tree = [-1] * (2 * self.size)
+
+    def set(self, k: int, room: int) -> None:
+        k += self.size
+        self.tree[k] = room
+        while k > 1:
+            k //= 2
+            self.tree[k] = max(self.tree[2 * k], self.tree[2 * k + 1])
+
+    def first_at_least(self, room: int) -> int:
+        if self.tree[1] < room:
+            return -1
+        k = 1
+        while k < self.size:
+            k = 2 * k if self.tree[2 * k] >= room else 2 * k + 1
+        return k - self.size
+
+def first_fit_decreasing(sizes: Sequence[int], capacities: Sequence[int]) -> Optional[List[int]]:
+    """
+    Pack items in decreasing size into bins opened largest capacity first;
+    each item goes to the first open bin with room. Returns the bin index
+    per item, or None when some item fits no remaining bin.
+    """
+    closed = sorted(range(len(capacities)), key=lambda b: (-capacities[b], b))
+    tree = _RoomTree(len(capacities))
+    room: List[int] = []
+    assignment = [-1] * len(sizes)
+    for i in sorted(range(len(sizes)), key=lambda i: (-sizes[i], i)):
+        k = tree.first_at_least(sizes[i])
+        if k < 0:
+            if len(room) == len(closed) or capacities[closed[len(room)]] < sizes[i]:
+                return None
+            k = len(room)
+            room.append(capacities[closed[k]])
+        room[k] -= sizes[i]
+        tree.set(k, room[k])
+        assignment[i] = closed[k]
+    return assignment
+
+def best_fit_decreasing(sizes: Sequence[int], capacities: Sequence[int]) -> Optional[List[int]]:
+    """
+    Like first-fit decreasing, but each item goes to the open bin it
+    leaves with the least room, found by bisecting the sorted rooms.
+    """
+    closed = sorted(range(len(capacities)), key=lambda b: (-capacities[b], b))
+    rooms: List[Tuple[int, int]] = []  # (room, open bin position), sorted
+    opened = 0
+    assignment = [-1] * len(sizes)
+    for i in sorted(range(len(sizes)), key=lambda i: (-sizes[i], i)):
+        j = bisect.bisect_left(rooms, (sizes[i], -1))
+        if j < len(rooms):
+            room, k = rooms.pop(j)
+        else:
+            if opened == len(closed) or capacities[closed[opened]] < sizes[i]:
+                return None
+            room, k = capacities[closed[opened]], opened
+            opened += 1
+        bisect.insort(rooms, (room - sizes[i], k))
+        assignment[i] = closed[k]
+    return assignment
+
+def packing_lower_bound(sizes: Sequence[int], capacities: Sequence[int]) -> int:
+    """
+    Lower bound on the number of bins for packing ``sizes``.
+
+    The volume bound takes the fewest largest bins holding the total size,
+    which is at least ``ceil(sum / max capacity)``. The Martello-Toth L2
+    bound relaxes every bin to the largest capacity ``C`` and, for each
+    threshold ``K <= C / 2``, counts items that need a bin of their own
+    plus the volume of mid-size items that cannot share those bins.
+    """
+    if not sizes:
+        return 0
+    total, volume, count = sum(sizes), 0, 0
+    for count, cap in enumerate(sorted(capacities, reverse=True), start=1):
+        volume += cap
+        if volume >= total:
+            break
+    bound = count if volume >= total else len(capacities) + 1
+    cap = max(capacities, default=0)
+    if cap <= 0:
+        return bound
+    # All thresholds at once over the sorted sizes and their prefix sums
+    sizes = np.sort(np.asarray(sizes, dtype=np.int64))
+    prefix = np.concatenate([[0], np.cumsum(sizes)])
+    k = np.unique(np.concatenate([[0], sizes[2 * sizes <= cap]]))
+    half = np.searchsorted(sizes, cap / 2, side='right')
+    upper = np.searchsorted(sizes, cap - k, side='right')
+    lower = np.searchsorted(sizes, k, side='left')
+    large = len(sizes) - upper
+    medium = upper - half
+    spare = medium * cap - (prefix[upper] - prefix[half])
+    small = prefix[half] - prefix[lower]
+    l2 = large + medium + np.maximum(0, -(-(small - spare) // cap))
+    return max(bound, int(l2.max()))
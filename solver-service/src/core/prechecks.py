@@ -0,0 +1,243 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .cpm import ProjectNetwork, time_windows
+from .eligibility import eligibility_matrix
+from .intervals import merge_windows, task_window
+
+Issue = Dict[str, Any]  # check name, message and the offending entities
+
+def _issue(check: str, message: str, entities: List[Any]) -> Issue:
+    return {"check": check, "message": message, "entities": entities}
+
+# --- Request parsing shared with the handlers, so each check sees the model's own numbers ---
+def delivery_loads(data: Dict[str, Any]) -> Tuple[List[int], List[int]]:
+    """Vehicle capacities and delivery quantities, truncated to integers as the bin packing uses them."""
+    capacities = [int(v.get('capacity', 1)) for v in data.get('vehicles', [])]
+    quantities = [int(d.get('quantity', 1)) for d in data.get('deliveries', [])]
+    return capacities, quantities
+
+def maintenance_slot(duration: float, due: int, horizon: int, max_delay: Optional[float]) -> Tuple[int, int]:
+    """Whole periods a maintenance task takes and its latest start within the horizon and delay limit."""
+    size = max(1, int(np.ceil(duration)))
+    last = horizon - size
+    if max_delay is not None:
+        last = min(last, due + int(max_delay))
+    return size, last
+
+def subcontractor_terms(tasks, subcontractors, contracts, horizon):
+    """Owning subcontractor and contract window per task id, and crew capacity per subcontractor."""
+    capacity = {s.get('id'): int(s.get('capacity', 1)) for s in subcontractors}
+    owner = {t['id']: t['subcontractor_id'] for t in tasks if t.get('subcontractor_id') is not None}
+    for c in contracts:
+        for tid in c.get('task_ids') or []:
+            owner.setdefault(tid, c.get('subcontractor_id'))
+    windows: Dict[Any, Tuple[int, int]] = {}
+    for c in contracts:
+        sub = c.get('subcontractor_id')
+        if 'capacity' in c:
+            capacity[sub] = min(int(c['capacity']), capacity.get(sub, int(c['capacity'])))
+        if 'start' not in c and 'end' not in c:
+            continue
+        scope = c.get('task_ids')
+        if scope is None:
+            scope = [tid for tid, s in owner.items() if s == sub]
+        for tid in scope:
+            lo, hi = windows.get(tid, (0, horizon))
+            windows[tid] = (max(lo, int(c.get('start', 0))), min(hi, int(c.get('end', horizon))))
+    return owner, capacity, windows
+
+def subcontractor_windows(data: Dict[str, Any]):
+    """
+    Precedence network, durations, crew demands, CPM earliest/latest starts,
+    owners and subcontractor capacities of a subcontractor scheduling request.
+    """
+    tasks = data.get('tasks', [])
+    horizon = data.get('time_horizon', 24)
+    network = ProjectNetwork(tasks)
+    owner, capacity, windows = subcontractor_terms(tasks, data.get('subcontractors') or [],
+                                                   data.get('contracts') or [], horizon)
+    ordered = network.tasks
+    durations = np.array([int(t.get('duration', 0)) for t in ordered], dtype=np.int64)
+    demands = [int(t.get('crew_size', 1)) for t in ordered]
+    release = np.array([max(int(t.get('earliest_start', 0)), windows.get(t['id'], (0, horizon))[0])
+                        for t in ordered], dtype=np.int64)
+    deadline = np.array([min(int(t.get('latest_end', horizon)), windows.get(t['id'], (0, horizon))[1])
+                         for t in ordered], dtype=np.int64)
+    es, ls = time_windows(network, durations, release, deadline)
+    return network, durations, demands, es, ls, owner, capacity
+
+def subcontractor_issues(network, demands, es, ls, owner, capacity) -> List[Issue]:
+    """Tasks with no start left between their CPM bounds, and tasks needing more crews than their subcontractor has."""
+    ids = network.ids
+    issues = []
+    late = np.flatnonzero(es > ls)
+    if len(late):
+        issues.append(_issue("cpm_window", f"Tasks {[ids[i] for i in late]} cannot start between their earliest "
+                             "and latest start given predecessors, successors and deadlines",
+                             [ids[i] for i in late]))
+    understaffed = [i for i, t in enumerate(ids) if owner.get(t) is not None
+                    and demands[i] > capacity.get(owner[t], 1)]
+    if understaffed:
+        issues.append(_issue("crew_size", f"Tasks {[ids[i] for i in understaffed]} need more crews than their "
+                             "subcontractor has", [ids[i] for i in understaffed]))
+    return issues
+
+# --- Checks per flow ---
+def check_crew_allocation(data: Dict[str, Any]) -> List[Issue]:
+    """
+    Tasks whose skills no crew holds, tasks longer than the hours of every
+    crew that could take them, and more task hours than all crews have.
+    """
+    crews, tasks = data.get("crews", []), data.get("tasks", [])
+    max_daily = None
+    for rule in data.get("union_rules", []):
+        if "max_work_hours_per_day" in rule:
+            max_daily = rule["max_work_hours_per_day"]
+    hours = np.array([sum(w[1] - w[0] for w in crew.get("availability", [])) for crew in crews], dtype=float)
+    if max_daily is not None:
+        hours = np.minimum(hours, max_daily)
+    durations = np.array([int(t.get("duration", 0)) for t in tasks], dtype=float)
+    eligible = eligibility_matrix([crew.get("skills", []) for crew in crews],
+                                  [t.get("required_skills", []) for t in tasks])
+    issues = []
+    uncovered = np.flatnonzero(~eligible.any(axis=0))
+    if len(uncovered):
+        held = {skill for crew in crews for skill in crew.get("skills", [])}
+        missing = sorted({skill for j in uncovered for skill in tasks[j].get("required_skills", [])} - held)
+        issues.append(_issue("skill_coverage", f"No crew holds the skills of {len(uncovered)} tasks"
+                             + (f"; skills held by no crew: {missing}" if missing else ""),
+                             [tasks[j].get("id") for j in uncovered]))
+    best = np.where(eligible, hours[:, None], -np.inf).max(axis=0, initial=-np.inf)
+    too_long = np.flatnonzero(eligible.any(axis=0) & (durations > best))
+    if len(too_long):
+        issues.append(_issue("crew_hours", f"{len(too_long)} tasks are longer than the hours of every eligible crew",
+                             [tasks[j].get("id") for j in too_long]))
+    if durations.sum() > hours.sum():
+        issues.append(_issue("total_hours", f"Tasks need {durations.sum():g} crew hours but crews have {hours.sum():g}",
+                             []))
+    return issues
+
+def check_material_delivery_optimization(data: Dict[str, Any]) -> List[Issue]:
+    """Deliveries larger than every vehicle, and more quantity than the whole fleet carries."""
+    capacities, quantities = map(np.array, delivery_loads(data))
+    deliveries = data.get("deliveries", [])
+    largest = int(capacities.max(initial=0))
+    issues = []
+    oversized = np.flatnonzero(quantities > largest)
+    if len(oversized):
+        issues.append(_issue("vehicle_capacity",
+                             f"{len(oversized)} deliveries exceed the largest vehicle capacity {largest}",
+                             [deliveries[j].get("id") for j in oversized]))
+    if quantities.sum() > capacities.sum():
+        issues.append(_issue("total_capacity",
+                             f"Deliveries total {quantities.sum()} but vehicles carry {capacities.sum()}", []))
+    return issues
+
+def check_compliance_planning(data: Dict[str, Any]) -> List[Issue]:
+    """
+    Tasks longer than every gap between blackouts within the horizon, tasks
+    needing more crews than exist, and (with limited crews) more crew time
+    than the gaps hold.
+    """
+    tasks = data.get("tasks", [])
+    constraints = data.get("constraints", {}) or {}
+    blackouts = merge_windows(data.get("blackout_windows", []))
+    horizon = int(constraints.get("time_horizon", max((e for _, e in blackouts), default=24)))
+    capacity = constraints.get("crews", constraints.get("capacity"))
+    gaps, last = [], 0
+    for s, e in blackouts + [(horizon, horizon)]:
+        s, e = min(max(s, 0), horizon), min(max(e, 0), horizon)
+        if s > last:
+            gaps.append(s - last)
+        last = max(last, e)
+    longest, free = max(gaps, default=0), sum(gaps)
+    durations = np.array([int(t.get("duration", 0)) for t in tasks])
+    demands = np.array([int(t.get("crew_size", 1)) for t in tasks])
+    issues = []
+    unplaceable = np.flatnonzero(durations > longest)
+    if len(unplaceable):
+        issues.append(_issue("blackout_fit",
+                             f"{len(unplaceable)} tasks are longer than the longest gap ({longest}) between blackouts",
+                             [tasks[j].get("id") for j in unplaceable]))
+    if capacity is not None:
+        capacity = int(capacity)
+        understaffed = np.flatnonzero(demands > capacity)
+        if len(understaffed):
+            issues.append(_issue("crew_size", f"{len(understaffed)} tasks need more than {capacity} crews",
+                                 [tasks[j].get("id") for j in understaffed]))
+        work = int((durations * np.minimum(demands, capacity)).sum())
+        if work > capacity * free:
+            issues.append(_issue("horizon_capacity", f"Tasks need {work} crew periods but {capacity} crews have "
+                                 f"{capacity * free} outside blackouts within the horizon", []))
+    return issues
+
+def check_maintenance(data: Dict[str, Any]) -> List[Issue]:
+    """Maintenance tasks that cannot start within the horizon and the delay limit."""
+    horizon = int(data.get("time_horizon", 0))
+    max_delay = (data.get("constraints") or {}).get("max_maintenance_delay")
+    due = {v.get("id"): v.get("maintenance_interval", horizon) for v in data.get("vehicles", [])}
+    late = [m.get("id") for m in data.get("maintenance_tasks", [])
+            if maintenance_slot(m.get("duration", 0), due.get(m.get("vehicle_id"), horizon), horizon, max_delay)[1] < 0]
+    if not late:
+        return []
+    return [_issue("start_window", f"Maintenance tasks {late} cannot start within the horizon and delay limit", late)]
+
+def check_subcontractor_scheduling(data: Dict[str, Any]) -> List[Issue]:
+    """CPM windows left empty by precedences and deadlines, and crews beyond a subcontractor's capacity."""
+    network, _, demands, es, ls, owner, capacity = subcontractor_windows(data)
+    return subcontractor_issues(network, demands, es, ls, owner, capacity)
+
+def check_labor_scheduling(data: Dict[str, Any]) -> List[Issue]:
+    """Shifts needing more employees per day than hold their skills."""
+    constraints = data.get("constraints") or {}
+    shifts = data.get("shifts", [])
+    if not shifts or int(data.get("time_horizon", 0)) <= 0:
+        return []
+    skill_requirements = constraints.get("skill_requirements", {})
+    coverage = constraints.get("coverage_requirements", {})
+    eligible = eligibility_matrix([e.get("skills", []) for e in data.get("employees", [])],
+                                  [skill_requirements.get(str(s["id"]), []) for s in shifts])
+    short = [s["id"] for s, n in zip(shifts, eligible.sum(axis=0)) if coverage.get(str(s["id"]), 1) > n]
+    if not short:
+        return []
+    return [_issue("shift_coverage", f"Shifts {short} need more employees per day than hold their skills", short)]
+
+def check_equipment_resource_planning(data: Dict[str, Any]) -> List[Issue]:
+    """Usage tasks that do not fit inside their window and the time horizon."""
+    horizon = int(data.get("time_horizon", 0) or 0)
+    tight = []
+    for task in data.get("tasks", []):
+        span = task_window(task, horizon)
+        if span is not None and span[0] + span[2] > span[1]:
+            tight.append(task.get("id"))
+    if not tight:
+        return []
+    return [_issue("task_window", f"Tasks {tight} do not fit inside their window and the time horizon", tight)]
+
+# Necessary-condition checks run on the raw request before any model is built,
+# with the status each flow reports for an infeasible request
+PRECHECKS: Dict[str, Tuple[Callable[[Dict[str, Any]], List[Issue]], str]] = {
+    "crew_allocation": (check_crew_allocation, "infeasible"),
+    "material_delivery_optimization": (check_material_delivery_optimization, "infeasible"),
+    "compliance_planning": (check_compliance_planning, "infeasible"),
+    "subcontractor_scheduling": (check_subcontractor_scheduling, "infeasible"),
+    "equipment_resource_planning": (check_equipment_resource_planning, "infeasible"),
+    "maintenance": (check_maintenance, "failed"),
+    "labor_scheduling": (check_labor_scheduling, "INFEASIBLE"),
+}
+
+def precheck(problem_type: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    The flow's infeasible response with a ``diagnosis`` of the failed
+    checks, or None when the checks pass (or the flow has none).
+    """
+    if problem_type not in PRECHECKS:
+        return None
+    check, status = PRECHECKS[problem_type]
+    issues = check(data)
+    if not issues:
+        return None
+    return {'status': status, 'solution': {}, 'diagnosis': issues,
+            'error': '; '.join(issue['message'] for issue in issues)}
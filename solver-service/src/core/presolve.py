@@ -0,0 +1,126 @@
+import math
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from .flows import integer_costs
+
+# Largest fleet-mix DP (vehicles x capacity x vehicle types) solved before deferring to the MIP
+FLEET_DP_CELLS = 2_000_000
+# Integer rounding tolerance, in line with the MIP's feasibility tolerance
+TOLERANCE = 1e-9
+
+def _ceil(x: float) -> int:
+    return math.ceil(x - TOLERANCE)
+
+def portfolio_greedy(weights: Sequence[float], lower: Sequence[int], upper: Sequence[int],
+                     total: int) -> Optional[np.ndarray]:
+    """
+    Maximize ``sum(weights * x)`` over integers ``lower <= x <= upper`` with
+    ``sum(x) <= total``. A single knapsack row with unit sizes is solved
+    exactly by starting every site at its lower bound and spending what is
+    left on positive weights, heaviest first. Returns None when infeasible.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    lower = np.asarray(lower, dtype=np.int64)
+    upper = np.asarray(upper, dtype=np.int64)
+    if (lower > upper).any() or lower.sum() > total:
+        return None
+    alloc = lower.copy()
+    order = np.argsort(-weights, kind="stable")
+    order = order[weights[order] > 0]
+    room = (upper - lower)[order]
+    left = total - lower.sum()
+    alloc[order] += np.clip(left - (np.cumsum(room) - room), 0, room)
+    return alloc
+
+def workforce_hiring(costs: Sequence[float], demand: Sequence[float],
+                     max_hours: float) -> Tuple[bool, Optional[np.ndarray]]:
+    """
+    Minimize ``sum(costs * h)`` over integers ``h >= 0`` with ``sum(h)``
+    covering every period's demand and ``h[s] * max_hours`` covering the
+    total demand for each skill. Only the peak period binds, so every skill
+    takes its own minimum and the cheapest skill absorbs the rest of the
+    peak. Returns ``(solved, hiring)``: ``solved`` is False for structures
+    this does not cover (negative costs or hours), and ``hiring`` is None
+    when infeasible.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    if (costs < 0).any() or max_hours < 0:
+        return False, None
+    total = float(sum(demand))
+    peak = max(demand, default=0.0)
+    if max_hours == 0:
+        if total > 0 and len(costs):
+            return True, None
+        each = 0
+    else:
+        each = max(0, _ceil(total / max_hours))
+    hiring = np.full(len(costs), each, dtype=np.int64)
+    short = _ceil(peak) - hiring.sum()
+    if short > 0:
+        if not len(costs):
+            return True, None
+        hiring[int(np.argmin(costs))] += short
+    return True, hiring
+
+def fleet_cover(costs: Sequence[float], capacities: Sequence[float], demand: Sequence[float],
+                budget: float, min_vehicles: float, max_vehicles: float) -> Tuple[bool, Optional[np.ndarray]]:
+    """
+    Minimize ``sum(costs * x)`` over integers ``x >= 0`` with the fleet
+    capacity covering the peak demand, the vehicle count in
+    ``[min_vehicles, max_vehicles]`` and the cost within ``budget``.
+
+    This is a covering knapsack with a cardinality row, solved exactly by a
+    DP over (vehicles used, capacity covered, capped at the peak). With
+    non-negative costs no optimal fleet needs more than
+    ``max(min_vehicles, ceil(peak / smallest capacity))`` vehicles, which
+    bounds the table. Returns ``(solved, counts)`` like
+    :func:`workforce_hiring`; capacities needing more than six decimals,
+    negative entries or a table above ``FLEET_DP_CELLS`` are not solved.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    scaled = integer_costs(np.asarray(capacities, dtype=np.float64))
+    if scaled is None or (costs < 0).any() or (scaled[0] < 0).any():
+        return False, None
+    caps, scale = scaled
+    need = max(0, _ceil(max(demand, default=0.0) * scale))
+    positive = caps[caps > 0]
+    if need > 0 and not len(positive):
+        return True, None
+    lo = max(0, _ceil(min_vehicles))
+    cover = -(-need // int(positive.min())) if need > 0 else 0
+    top = max(lo, cover)
+    if math.isfinite(max_vehicles):
+        top = min(top, math.floor(max_vehicles + TOLERANCE))
+    if top < lo:
+        return True, None
+    if not len(caps):
+        return True, (np.zeros(0, dtype=np.int64) if lo == 0 and budget >= 0 else None)
+    if (top + 1) * (need + 1) * len(caps) > FLEET_DP_CELLS:
+        return False, None
+
+    # best[c]: cheapest fleet of exactly k vehicles covering at least c
+    covered = np.arange(need + 1)
+    previous = np.maximum(0, covered[None, :] - np.minimum(caps, need)[:, None])
+    best = np.full(need + 1, np.inf)
+    best[0] = 0.0
+    choice = np.zeros((top + 1, need + 1), dtype=np.int32)
+    finals = [best[need]]
+    for k in range(1, top + 1):
+        candidates = costs[:, None] + best[previous]
+        choice[k] = np.argmin(candidates, axis=0)
+        best = candidates[choice[k], covered]
+        finals.append(best[need])
+    finals = np.asarray(finals)
+    finals[:lo] = np.inf
+    k = int(np.argmin(finals))
+    if not np.isfinite(finals[k]) or finals[k] > budget + 1e-6:
+        return True, None
+    counts = np.zeros(len(caps), dtype=np.int64)
+    c = need
+    for k in range(k, 0, -1):
+        v = choice[k, c]
+        counts[v] += 1
+        c = int(previous[v, c])
+    return True, counts
@@ -0,0 +1,210 @@
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ortools.linear_solver import linear_solver_pb2, pywraplp
+
+# pywraplp backends raced by default, and their model-request solver types
+RACE_BACKENDS = ("SCIP", "CP_SAT", "CBC")
+SOLVER_TYPES = {
+    "SCIP": linear_solver_pb2.MPModelRequest.SCIP_MIXED_INTEGER_PROGRAMMING,
+    "CBC": linear_solver_pb2.MPModelRequest.CBC_MIXED_INTEGER_PROGRAMMING,
+    "CP_SAT": linear_solver_pb2.MPModelRequest.SAT_INTEGER_PROGRAMMING,
+}
+# Statuses that settle the race: no other backend can do better
+DECISIVE = {pywraplp.Solver.OPTIMAL, pywraplp.Solver.INFEASIBLE, pywraplp.Solver.UNBOUNDED}
+# Seconds past the time limit to wait for backends to report before stopping them
+GRACE_SECONDS = 2.0
+# JSON-lines race history shared by every worker process and kept across
+# restarts; unset, each process only counts its own races in memory
+RACE_LOG = os.environ.get("SOLVER_RACE_LOG")
+# Size past which the race log rolls over to "<path>.1", replacing the previous one
+RACE_LOG_MAX_BYTES = 4 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+def record_race(path: str, entry: Dict[str, Any], max_bytes: int = RACE_LOG_MAX_BYTES) -> None:
+    """
+    Log a race and append it to the history at ``path`` as one JSON line,
+    rolling the file over to ``<path>.1`` once it grows past ``max_bytes``.
+    """
+    line = json.dumps(entry, sort_keys=True, default=str)
+    logger.info("race %s", line)
+    # A single O_APPEND write keeps lines from concurrent processes whole
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, (line + "\n").encode())
+        stat = os.fstat(fd)
+        # Only the file just written rolls over, not one another process already replaced it with
+        if stat.st_size > max_bytes and os.stat(path).st_ino == stat.st_ino:
+            os.replace(path, path + ".1")
+    finally:
+        os.close(fd)
+
+def _parse_races(lines: Sequence[str]) -> List[Dict[str, Any]]:
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return entries
+
+def read_races(path: str) -> List[Dict[str, Any]]:
+    """Every race recorded at ``path``, oldest first; unreadable lines are skipped."""
+    if not os.path.exists(path):
+        return []
+    with open(path) as log:
+        return _parse_races(log)
+
+class RaceTally:
+    """
+    Races won per backend for each flow. With a log ``path`` races are
+    appended to it and the counts follow the log, reading only what other
+    processes appended since the last summary (and the rolled-over file
+    once, on first use); without one they are counted in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._wins: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+        self._started = False
+        self._inode: Optional[int] = None
+        self._offset = 0
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        if self.path:
+            record_race(self.path, entry)
+            return
+        logger.info("race %s", json.dumps(entry, sort_keys=True, default=str))
+        with self._lock:
+            self._count([entry])
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            if self.path:
+                self._catch_up()
+            return {flow: dict(counter) for flow, counter in self._wins.items()}
+
+    def _count(self, entries: List[Dict[str, Any]]) -> None:
+        for entry in entries:
+            if entry.get("winner") is not None:
+                self._wins.setdefault(entry["flow"], Counter())[entry["winner"]] += 1
+
+    def _catch_up(self) -> None:
+        if not self._started:
+            self._started = True
+            self._count(read_races(self.path + ".1"))
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if self._inode is not None and (stat.st_ino != self._inode or stat.st_size < self._offset):
+            # Rolled over since the last read: finish the old file, then start the new one
+            self._read_from(self.path + ".1", self._inode)
+            self._offset = 0
+        self._inode = stat.st_ino
+        self._read_from(self.path, stat.st_ino)
+
+    def _read_from(self, path: str, inode: int) -> None:
+        try:
+            with open(path, "rb") as log:
+                if os.fstat(log.fileno()).st_ino != inode:
+                    return
+                log.seek(self._offset)
+                chunk = log.read()
+        except FileNotFoundError:
+            return
+        # A line still being written is left for the next read
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        self._offset += len(complete)
+        self._count(_parse_races(complete.decode().splitlines()))
+
+def _run_backend(backend: str, request: bytes, conn) -> None:
+    """Process entry point: solve a serialized model request and send back the response."""
+    began = time.perf_counter()
+    response = linear_solver_pb2.MPSolutionResponse()
+    pywraplp.Solver.SolveWithProto(linear_solver_pb2.MPModelRequest.FromString(request), response)
+    conn.send((backend, response.SerializeToString(), time.perf_counter() - began))
+    conn.close()
+
+def race(solver: pywraplp.Solver, backends: Sequence[str] = RACE_BACKENDS,
+         time_limit: float = 10.0) -> Tuple[int, Dict[str, Any]]:
+    """
+    Solve the model built in ``solver`` on several backends at once, one
+    process each, from its exported ``MPModelProto``.
+
+    The first backend to prove optimality (or infeasibility) wins and the
+    others are terminated; otherwise the best feasible answer at the time
+    limit wins. The winner's solution is loaded back into ``solver``, so
+    variable and objective values read as after ``solver.Solve()``. Returns
+    the ``pywraplp.Solver`` status and a report with the winner and each
+    backend's status and seconds.
+    """
+    unknown = [b for b in backends if b not in SOLVER_TYPES]
+    if unknown or not backends:
+        raise ValueError(f"Cannot race backends {unknown or list(backends)}; choose from {list(SOLVER_TYPES)}")
+    model = linear_solver_pb2.MPModelProto()
+    solver.ExportModelToProto(model)
+    runs, responses, pending = {}, {}, {}
+    began = time.perf_counter()
+    for backend in backends:
+        request = linear_solver_pb2.MPModelRequest(model=model, solver_type=SOLVER_TYPES[backend],
+                                                   solver_time_limit_seconds=time_limit)
+        receive, send = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=_run_backend, args=(backend, request.SerializeToString(), send),
+                                          daemon=True)
+        process.start()
+        send.close()
+        pending[receive] = (backend, process)
+    winner = None
+    try:
+        while pending and winner is None:
+            left = time_limit + GRACE_SECONDS - (time.perf_counter() - began)
+            ready = wait(list(pending), timeout=max(left, 0))
+            if not ready:
+                break
+            for conn in ready:
+                backend, process = pending.pop(conn)
+                try:
+                    _, payload, seconds = conn.recv()
+                except EOFError:  # the backend process died
+                    runs[backend] = {"status": "ABNORMAL", "seconds": time.perf_counter() - began}
+                    continue
+                finally:
+                    process.join()
+                    conn.close()
+                response = linear_solver_pb2.MPSolutionResponse.FromString(payload)
+                responses[backend] = response
+                name = linear_solver_pb2.MPSolverResponseStatus.Name(response.status)
+                runs[backend] = {"status": name.replace("MPSOLVER_", ""),
+                                 "objective": response.objective_value if response.variable_value else None,
+                                 "seconds": seconds}
+                if response.status in DECISIVE and winner is None:
+                    winner = backend
+    finally:
+        for conn, (backend, process) in pending.items():
+            process.terminate()
+            process.join()
+            runs[backend] = {"status": "STOPPED", "seconds": time.perf_counter() - began}
+            conn.close()
+    if winner is None:
+        feasible = [b for b, r in responses.items() if r.status == pywraplp.Solver.FEASIBLE]
+        if feasible:
+            pick = max if model.maximize else min
+            winner = pick(feasible, key=lambda b: responses[b].objective_value)
+    report = {"winner": winner, "seconds": time.perf_counter() - began,
+              "runs": {b: runs[b] for b in backends if b in runs}}
+    if winner is None:
+        return pywraplp.Solver.NOT_SOLVED, report
+    response = responses[winner]
+    if response.status in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+        solver.LoadSolutionFromProto(response)
+    return response.status, report
@@ -0,0 +1,128 @@
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from ortools.sat.python import cp_model
+
+STABILITY_MODES = ("hint", "penalize", "fix")
+
+def previous_entries(previous: Optional[Dict[str, Any]], key: str) -> List[Dict[str, Any]]:
+    """Entries under ``key`` of a previous solution, given either the solution or the whole response."""
+    if not previous:
+        return []
+    if isinstance(previous.get("solution"), dict):
+        previous = previous["solution"]
+    return [entry for entry in previous.get(key) or [] if isinstance(entry, dict)]
+
+class PlanStability:
+    """
+    Warm start and plan stability when a CP-SAT model is re-solved after a
+    small change.
+
+    Handlers call :meth:`keep` for every variable whose value the previous
+    solution determines, keyed by the entity it belongs to (a task, an
+    employee). ``stability`` options:
+
+    - ``mode``: ``"hint"`` (default) only hints the previous values;
+      ``"penalize"`` adds ``weight`` to the objective for each kept variable
+      that changes; ``"fix"`` pins kept variables to their previous values.
+    - ``weight``: penalty per changed variable, in objective units (default 1).
+    - ``free``: entity ids in the affected area, hinted but never penalized
+      or pinned.
+
+    Previous values outside a variable's current domain are skipped, so
+    entities whose options changed are free to move. :meth:`apply` is
+    called after the handler has posted its own hints and objective.
+    """
+
+    def __init__(self, model: cp_model.CpModel, stability: Optional[Dict[str, Any]] = None):
+        options = stability or {}
+        self.model = model
+        self.mode = options.get("mode", "hint")
+        if self.mode not in STABILITY_MODES:
+            raise ValueError(f"Unknown stability mode {self.mode}; expected one of {list(STABILITY_MODES)}")
+        self.weight = int(options.get("weight", 1))
+        self.free = set(options.get("free") or [])
+        self.hints: Dict[int, int] = {}
+        self.kept: List[tuple] = []  # (entity, var, value)
+        self.penalties: Dict[int, int] = {}  # var index -> objective coefficient
+        self.offset = 0
+
+    @property
+    def active(self) -> bool:
+        """True once some previous value has been kept."""
+        return bool(self.kept)
+
+    @property
+    def pinned(self) -> bool:
+        """True when kept values are hard constraints, so a heuristic fallback plan may not be used."""
+        return self.mode == "fix" and any(entity not in self.free for entity, _, _ in self.kept)
+
+    def _in_domain(self, var: cp_model.IntVar, value: int) -> bool:
+        domain = self.model.Proto().variables[var.Index()].domain
+        return any(lo <= value <= hi for lo, hi in zip(domain[::2], domain[1::2]))
+
+    def hint(self, var: cp_model.IntVar, value: int) -> None:
+        """Hint a derived variable without any stability term."""
+        if self._in_domain(var, int(value)):
+            self.hints[var.Index()] = int(value)
+
+    def keep(self, entity: Hashable, var: cp_model.IntVar, value: int) -> None:
+        value = int(value)
+        if not self._in_domain(var, value):
+            return
+        self.hints[var.Index()] = value
+        self.kept.append((entity, var, value))
+        if entity in self.free or self.mode == "hint":
+            return
+        if self.mode == "fix":
+            self.model.Add(var == value)
+            return
+        index = var.Index()
+        if list(self.model.Proto().variables[index].domain) == [0, 1]:
+            # A changed literal costs weight * x (was 0) or weight * (1 - x) (was 1)
+            sign = -1 if value else 1
+            self.penalties[index] = self.penalties.get(index, 0) + sign * self.weight
+            self.offset += self.weight if value else 0
+        else:
+            changed = self.model.NewBoolVar(f"changed_{var.Name()}")
+            self.model.Add(var == value).OnlyEnforceIf(changed.Not())
+            self.penalties[changed.Index()] = self.weight
+
+    def apply(self) -> None:
+        """
+        Merge the previous values over the handler's own hints (each
+        variable may be hinted once) and add the change penalties to the
+        objective. The integer objective proto always minimizes, so the
+        penalties are added as is for maximization models too; a floating
+        point objective (fractional coefficients) carries its own sense.
+        """
+        if not self.hints and not self.penalties:
+            return
+        proto = self.model.Proto()
+        merged = dict(zip(proto.solution_hint.vars, proto.solution_hint.values))
+        merged.update(self.hints)
+        self.model.ClearHints()
+        for index, value in merged.items():
+            self.model.AddHint(self.model.GetIntVarFromProtoIndex(index), value)
+        if self.penalties:
+            if proto.HasField("floating_point_objective"):
+                objective = proto.floating_point_objective
+                sign = -1 if objective.maximize else 1
+            else:
+                objective, sign = proto.objective, 1
+            terms = dict(zip(objective.vars, objective.coeffs))
+            for index, coeff in self.penalties.items():
+                terms[index] = terms.get(index, 0) + sign * coeff
+            objective.ClearField("vars")
+            objective.ClearField("coeffs")
+            objective.vars.extend(terms)
+            objective.coeffs.extend(terms.values())
+            objective.offset += sign * self.offset
+
+    def report(self, value: Callable[[cp_model.IntVar], int]) -> Dict[str, Any]:
+        """Mode, number of hinted variables and the entities whose kept values changed."""
+        changed = []
+        for entity, var, previous in self.kept:
+            if value(var) != previous and entity not in changed:
+                changed.append(entity)
+        return {"mode": self.mode, "hinted": len(self.hints), "kept": len({e for e, _, _ in self.kept}),
+                "changed": changed}
@@ -0,0 +1,280 @@
+import bisect
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+from ortools.linear_solver import pywraplp
+
+# A priced pattern: (total cost, covered slot indices)
+Pattern = Tuple[float, List[int]]
+
+class RosterMaster:
+    """
+    Restricted master problem of a roster column generation.
+
+    Columns are roster patterns (sets of covered slots) for a class of
+    interchangeable employees. Coverage rows require ``demand[slot]``
+    patterns through each slot and convexity rows allow at most
+    ``class_sizes[c]`` patterns per class; employees left without a pattern
+    are off. Each coverage row has an artificial variable priced at
+    ``penalty`` so the master stays feasible from the first iteration.
+    """
+
+    def __init__(self, demand: Sequence[int], class_sizes: Sequence[int], penalty: float):
+        self.demand = np.asarray(demand, dtype=np.int64)
+        self.class_sizes = list(class_sizes)
+        self.penalty = penalty
+        self.columns: List[Tuple[int, float, Tuple[int, ...]]] = []
+        self._seen = set()
+        self.lp = pywraplp.Solver.CreateSolver('GLOP')
+        self.coverage = [self.lp.Constraint(float(d), self.lp.infinity()) for d in self.demand]
+        self.convexity = [self.lp.Constraint(-self.lp.infinity(), float(n)) for n in self.class_sizes]
+        self.objective = self.lp.Objective()
+        self.objective.SetMinimization()
+        self.artificials = []
+        for row in self.coverage:
+            var = self.lp.NumVar(0, self.lp.infinity(), '')
+            row.SetCoefficient(var, 1)
+            self.objective.SetCoefficient(var, penalty)
+            self.artificials.append(var)
+        self.variables = []
+
+    def add_column(self, cls: int, cost: float, slots: Sequence[int]) -> bool:
+        """Add a pattern unless the class already has it; returns whether it was new."""
+        key = (cls, tuple(sorted(slots)))
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        var = self.lp.NumVar(0, self.lp.infinity(), '')
+        for slot in key[1]:
+            self.coverage[slot].SetCoefficient(var, 1)
+        self.convexity[cls].SetCoefficient(var, 1)
+        self.objective.SetCoefficient(var, cost)
+        self.columns.append((cls, cost, key[1]))
+        self.variables.append(var)
+        return True
+
+    def solve_lp(self) -> Tuple[float, np.ndarray, np.ndarray]:
+        """Master LP objective with coverage and convexity duals."""
+        if self.lp.Solve() != pywraplp.Solver.OPTIMAL:
+            raise RuntimeError("Roster master LP could not be solved")
+        slot_duals = np.array([row.dual_value() for row in self.coverage])
+        class_duals = np.array([row.dual_value() for row in self.convexity])
+        return self.objective.Value(), slot_duals, class_duals
+
+    def lp_values(self) -> np.ndarray:
+        return np.array([var.solution_value() for var in self.variables])
+
+    def solve_integer(self, time_limit: float) -> np.ndarray:
+        """
+        Integer pattern counts over the generated columns (SCIP), or a
+        rounding of the LP when SCIP finds no incumbent. Counts leave
+        coverage short wherever artificials were needed.
+        """
+        mip = pywraplp.Solver.CreateSolver('SCIP')
+        mip.SetTimeLimit(int(time_limit * 1000))
+        counts = [mip.IntVar(0, self.class_sizes[cls], '') for cls, _, _ in self.columns]
+        short = [mip.IntVar(0, int(d), '') for d in self.demand]
+        by_slot: List[List[Any]] = [[s] for s in short]
+        by_class: List[List[Any]] = [[] for _ in self.class_sizes]
+        for var, (cls, _, slots) in zip(counts, self.columns):
+            by_class[cls].append(var)
+            for slot in slots:
+                by_slot[slot].append(var)
+        for terms, d in zip(by_slot, self.demand):
+            mip.Add(mip.Sum(terms) >= int(d))
+        for terms, n in zip(by_class, self.class_sizes):
+            if terms:
+                mip.Add(mip.Sum(terms) <= n)
+        mip.Minimize(mip.Sum([var * cost for var, (_, cost, _) in zip(counts, self.columns)])
+                     + mip.Sum([var * self.penalty for var in short]))
+        if mip.Solve() in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+            return np.array([round(var.solution_value()) for var in counts], dtype=np.int64)
+        return self.round_lp()
+
+    def round_lp(self) -> np.ndarray:
+        """Floor the LP solution, then add the cheapest patterns that still cover a short slot."""
+        counts = np.floor(self.lp_values() + 1e-9).astype(np.int64)
+        covered = np.zeros(len(self.demand), dtype=np.int64)
+        used = np.zeros(len(self.class_sizes), dtype=np.int64)
+        for k, (cls, _, slots) in enumerate(self.columns):
+            covered[list(slots)] += counts[k]
+            used[cls] += counts[k]
+        for k in sorted(range(len(self.columns)), key=lambda k: self.columns[k][1]):
+            cls, _, slots = self.columns[k]
+            while used[cls] < self.class_sizes[cls] and (covered[list(slots)] < self.demand[list(slots)]).any():
+                counts[k] += 1
+                used[cls] += 1
+                covered[list(slots)] += 1
+        return counts
+
+def _price_and_add(master: RosterMaster, price: Callable[[int, np.ndarray], Pattern], deadline: float,
+                   max_iterations: int, tolerance: float) -> Tuple[int, bool, float]:
+    """
+    Alternate master LP solves and pricing until no class has a column
+    with negative reduced cost. Returns the iterations used, whether it
+    converged, and the best Lagrangian lower bound seen.
+    """
+    bound = -np.inf
+    for iteration in range(1, max_iterations + 1):
+        objective, slot_duals, class_duals = master.solve_lp()
+        added, lagrangian = 0, objective
+        for cls, size in enumerate(master.class_sizes):
+            cost, slots = price(cls, slot_duals)
+            reduced = cost - slot_duals[slots].sum() - class_duals[cls]
+            # Each employee of the class can improve the LP by at most the reduced cost
+            lagrangian += size * min(0.0, reduced)
+            if reduced < -tolerance and master.add_column(cls, cost, slots):
+                added += 1
+        bound = max(bound, lagrangian)
+        if added == 0:
+            return iteration, True, bound
+        if time.perf_counter() > deadline:
+            break
+    master.solve_lp()
+    return iteration, False, bound
+
+def generate_rosters(demand: Sequence[int], class_sizes: Sequence[int], price: Callable[[int, np.ndarray], Pattern],
+                     penalty: float, max_iterations: int = 200, time_limit: float = 10.0,
+                     tolerance: float = 1e-6) -> Dict[str, Any]:
+    """
+    Column generation over roster patterns.
+
+    ``price(cls, slot_duals)`` returns the cheapest pattern of class ``cls``
+    under the duals, as ``(cost, slots)`` with ``cost`` the pattern's true
+    cost. Columns are generated until the master LP is optimal, then the
+    LP is dived to an integer solution: every column is fixed at its
+    floor, the most fractional one is rounded up and pricing resumes. If
+    the time budget ends mid-dive, SCIP finishes over the column pool.
+    Returns the patterns chosen per class with convergence metrics.
+    """
+    start = time.perf_counter()
+    deadline = start + time_limit
+    master = RosterMaster(demand, class_sizes, penalty)
+    iterations, converged, lower_bound = _price_and_add(master, price, deadline, max_iterations, tolerance)
+    lp_objective = master.objective.Value()
+    lp_seconds = time.perf_counter() - start
+
+    dives, counts = 0, None
+    while time.perf_counter() < deadline:
+        values = master.lp_values()
+        fractional = values - np.floor(values + tolerance)
+        if (fractional <= tolerance).all():
+            counts = np.round(values).astype(np.int64)
+            break
+        dives += 1
+        for var, value in zip(master.variables, values):
+            var.SetLb(float(np.floor(value + tolerance)))
+        k = int(fractional.argmax())
+        master.variables[k].SetLb(float(np.ceil(values[k])))
+        more, _, _ = _price_and_add(master, price, deadline, max_iterations, tolerance)
+        iterations += more
+    if counts is None:
+        counts = master.solve_integer(max(1.0, deadline - time.perf_counter()))
+
+    patterns: List[List[Tuple[int, ...]]] = [[] for _ in class_sizes]
+    integer_objective = 0.0
+    covered = np.zeros(len(master.demand), dtype=np.int64)
+    for count, (cls, cost, slots) in zip(counts.tolist(), master.columns):
+        patterns[cls].extend([slots] * count)
+        integer_objective += count * cost
+        covered[list(slots)] += count
+    finite = np.isfinite(lower_bound)
+    return {
+        "patterns": patterns,
+        "feasible": bool((covered >= master.demand).all()),
+        "objective": integer_objective,
+        "convergence": {
+            "iterations": iterations,
+            "columns": len(master.columns),
+            "converged": converged,
+            "lp_objective": lp_objective,
+            "lower_bound": float(lower_bound) if finite else None,
+            "gap": abs(integer_objective - lower_bound) / max(1.0, abs(integer_objective)) if finite else None,
+            "dives": dives,
+            "lp_seconds": lp_seconds,
+            "seconds": time.perf_counter() - start
+        }
+    }
+
+def price_daily_roster(costs: np.ndarray, allowed_next: np.ndarray, max_run: int) -> Pattern:
+    """
+    Cheapest roster over ``days x shifts`` slot costs (``inf`` where a shift
+    cannot be worked) with at most one shift per day, runs of at most
+    ``max_run`` consecutive working days, and shift ``b`` allowed the day
+    after shift ``a`` only when ``allowed_next[a, b]``.
+
+    Dynamic program over (day, shift, run length) states; returns the
+    pattern cost and its slots as ``day * shifts + shift``.
+    """
+    days, shifts = costs.shape
+    max_run = max(0, min(max_run, days))
+    if days == 0 or max_run == 0:
+        return 0.0, []
+    # work[d, s, r]: best cost of days 0..d ending with shift s on day d after r earlier working days
+    # off[d + 1]: best cost of days 0..d with day d off (off[0] is the empty prefix)
+    work = np.full((days, shifts, max_run), np.inf)
+    off = np.zeros(days + 1)
+    prev_shift = np.zeros((days, shifts, max_run), dtype=np.int64)
+    prev_work = np.full(days + 1, -1, dtype=np.int64)  # flat (shift, run) before an off day, -1 if off
+    blocked = ~allowed_next[:, :, None]
+    for d in range(days):
+        work[d, :, 0] = off[d] + costs[d]
+        if d and max_run > 1:
+            cand = np.where(blocked, np.inf, work[d - 1][:, None, :max_run - 1])  # (prev shift, shift, run)
+            best = cand.argmin(axis=0)
+            work[d, :, 1:] = np.take_along_axis(cand, best[None], axis=0)[0] + costs[d][:, None]
+            prev_shift[d, :, 1:] = best
+        off[d + 1] = off[d]
+        if d:
+            flat = int(work[d - 1].argmin())
+            if work[d - 1].flat[flat] < off[d]:
+                off[d + 1], prev_work[d + 1] = work[d - 1].flat[flat], flat
+    flat = int(work[days - 1].argmin())
+    if work[days - 1].flat[flat] < off[days]:
+        cost, d, state = float(work[days - 1].flat[flat]), days - 1, divmod(flat, max_run)
+    else:
+        cost, d, state = float(off[days]), days - 1, None
+    slots: List[int] = []
+    while d >= 0:
+        if state is None:
+            # Day d is off; step back to the state that was carried into it
+            flat = int(prev_work[d + 1])
+            d -= 1
+            state = divmod(flat, max_run) if flat >= 0 else None
+            continue
+        s, r = state
+        slots.append(d * shifts + s)
+        state = (int(prev_shift[d, s, r]), r - 1) if r else None
+        d -= 1
+    return cost, sorted(slots)
+
+def price_gap_roster(times: Sequence[int], costs: np.ndarray, min_gap: int) -> Pattern:
+    """
+    Cheapest set of shifts at ``times`` whose pairwise time differences are
+    at least ``min_gap`` (at least 1). Longest-path style DP over shifts
+    sorted by time with a running prefix minimum.
+    """
+    min_gap = max(1, int(min_gap))
+    order = sorted(range(len(times)), key=lambda j: times[j])
+    sorted_times = [times[j] for j in order]
+    best = np.zeros(len(order))
+    prefix = np.zeros(len(order))  # min(0, best[0..k])
+    prefix_arg = np.full(len(order), -1, dtype=np.int64)
+    parent = np.full(len(order), -1, dtype=np.int64)
+    for k, j in enumerate(order):
+        # Last shift that ends the gap before this one
+        p = bisect.bisect_right(sorted_times, sorted_times[k] - min_gap) - 1
+        base, parent[k] = (prefix[p], prefix_arg[p]) if p >= 0 else (0.0, -1)
+        best[k] = costs[j] + base
+        if k and prefix[k - 1] <= best[k]:
+            prefix[k], prefix_arg[k] = prefix[k - 1], prefix_arg[k - 1]
+        else:
+            prefix[k], prefix_arg[k] = min(0.0, best[k]), (k if best[k] < 0 else -1)
+    if not order or prefix[-1] >= 0:
+        return 0.0, []
+    slots, k = [], int(prefix_arg[-1])
+    while k >= 0:
+        slots.append(order[k])
+        k = int(parent[k])
+    return float(prefix[-1]), sorted(slots)
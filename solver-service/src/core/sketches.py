@@ -0,0 +1,137 @@
+from typing import List, Optional
+
+import numpy as np
+
+class RunningMoments:
+    """Count, mean, variance, min and max updated chunk by chunk (Chan et al.)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+        other = RunningMoments()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.merge(other)
+
+    def merge(self, other: "RunningMoments") -> None:
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def stddev(self) -> float:
+        """Population standard deviation, matching ``np.std``."""
+        return float(np.sqrt(self.m2 / self.count)) if self.count else 0.0
+
+class FixedHistogram:
+    """Histogram over fixed edges with explicit underflow/overflow counts."""
+
+    def __init__(self, lo: float, hi: float, bins: int):
+        if not hi > lo:
+            hi = lo + 1.0
+        self.edges = np.linspace(lo, hi, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, values: np.ndarray) -> None:
+        lo, hi = self.edges[0], self.edges[-1]
+        below = values < lo
+        above = values > hi
+        self.underflow += int(below.sum())
+        self.overflow += int(above.sum())
+        inside = values[~(below | above)]
+        bins = len(self.counts)
+        idx = ((inside - lo) * (bins / (hi - lo))).astype(np.int64)
+        np.minimum(idx, bins - 1, out=idx)
+        self.counts += np.bincount(idx, minlength=bins)
+
+    def merge(self, other: "FixedHistogram") -> None:
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bin edges")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+class KLLSketch:
+    """
+    Mergeable KLL quantile sketch (Karnin, Lang, Liberty 2016).
+
+    Level ``h`` holds items of weight ``2**h``; a level over capacity is
+    sorted and every other item (random offset) is promoted. Memory is
+    O(k) regardless of how many values are seen; rank error is about 1.7/k.
+    """
+
+    def __init__(self, k: int = 512, seed: Optional[int] = None):
+        self.k = int(k)
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def update(self, values: np.ndarray) -> None:
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=np.float64)])
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item stays behind so total weight is preserved
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                pairs = items[:len(items) - len(keep)]
+                promoted = pairs[self._rng.integers(2)::2]
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                # Adding a level shrinks lower capacities; recheck from the bottom
+                h = 0
+                continue
+            h += 1
+
+    def quantiles(self, qs) -> np.ndarray:
+        items = np.concatenate(self.levels)
+        if len(items) == 0:
+            return np.full(len(qs), np.nan)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cum = items[order], np.cumsum(weights[order])
+        targets = np.asarray(qs, dtype=np.float64) * cum[-1]
+        idx = np.searchsorted(cum, targets, side="left")
+        return items[np.minimum(idx, len(items) - 1)]
+
+    @property
+    def size(self) -> int:
+        """Number of retained items."""
+        return sum(len(level) for level in self.levels)
@@ -1,9 +1,28 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from ortools.linear_solver import pywraplp
 from ortools.constraint_solver import routing_enums_pb2
 from ortools.constraint_solver import pywrapcp
 from ortools.sat.python import cp_model
 import numpy as np
+from .breaks import place_breaks, preference_deviation
+from .cpm import CPMBaseline, forward_pass
+from .eligibility import SkillIndex, eligibility_components, eligibility_matrix, eligible_pairs
+from .flows import integer_costs, solve_transportation
+from .horizon import rolling_options, rolling_windows
+from .intervals import allowed_start_domain, merge_windows, optional_copies, sweep_pairs, task_window, window_ranges
+from .lns import CrewAllocationLNS, EquipmentPlanningLNS, large_neighborhood_search, run_subproblem, search_options
+from .montecarlo import (
+    MonteCarloEngine, RiskSummary, draw_samples, histogram_range, parse_distribution, simulate_summary
+)
+from .packing import best_fit_decreasing, first_fit_decreasing, packing_lower_bound
+from .prechecks import (
+    delivery_loads, maintenance_slot, precheck, subcontractor_issues, subcontractor_windows
+)
+from .presolve import fleet_cover, portfolio_greedy, workforce_hiring
+from .racing import RACE_BACKENDS, RACE_LOG, RaceTally, race
+from .replan import PlanStability, previous_entries
+from .roster import generate_rosters, price_daily_roster, price_gap_roster
+from .symmetry import add_lex_geq, interchangeable_groups
 from .templates import (
     VehicleAssignmentRequest, FleetMixRequest, MaintenanceScheduleRequest,
     FuelOptimizationRequest, EmployeeScheduleRequest, TaskAssignmentRequest,
@@ -11,9 +30,31 @@ from .templates import (
     ShiftCoverageRequest
 )
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import heapq
+import json
+import os
+import threading
+import time
+
+# Risk simulations above this many samples switch to constant-memory streaming summaries
+STREAMING_THRESHOLD = 1_000_000
+# Baseline CPM passes kept for incremental change-order evaluation
+CPM_BASELINE_CACHE_SIZE = 64
+# Recent CP-SAT solutions kept so a re-plan can refer to them by job id
+JOB_CACHE_SIZE = 64
+# Crew allocation components with at least this many tasks go to the process pool
+COMPONENT_POOL_TASKS = 200
+# Problem types that warm-start from previous_solution / previous_job_id
+REPLAN_TYPES = {
+    "maintenance", "employee_schedule", "labor_scheduling", "crew_allocation", "equipment_resource_planning",
+    "subcontractor_scheduling", "material_delivery_optimization", "compliance_planning"
+}
 
 class SolverService:
-    def __init__(self):
+    def __init__(self, race_log: Optional[str] = None):
         self.solvers = {
             "lp": self._solve_lp,
             "mip": self._solve_mip,
@@ -42,6 +83,15 @@ class SolverService:
             "change_order_impact": self._solve_change_order_impact,
             "compliance_planning": self._solve_compliance_planning
         }
+        # LRU caches shared by the API's worker threads; per process, so job and baseline ids
+        # only resolve on the process that issued them
+        self._cpm_baselines = OrderedDict()
+        self._jobs = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.race_log = race_log or RACE_LOG
+        self._races = RaceTally(self.race_log)
+        self._pool = None
+        self._pool_lock = threading.Lock()
 
     def solve(self, data: Dict[str, Any]) -> Dict[str, Any]:
         problem_type = data.get("type")
@@ -49,10 +99,64 @@ class SolverService:
             raise ValueError(f"Unsupported problem type: {problem_type}")
         
         try:
-            return self.solvers[problem_type](data)
+            if problem_type in REPLAN_TYPES and data.get("previous_job_id") and not data.get("previous_solution"):
+                data = {**data, "previous_solution": self._previous_job(data["previous_job_id"])}
+            rejected = precheck(problem_type, data)
+            if rejected is not None:
+                return rejected
+            result = self.solvers[problem_type](data)
+            if problem_type in REPLAN_TYPES and result.get("solution"):
+                result["job_id"] = self._remember_job(problem_type, result["solution"])
+            return result
         except Exception as e:
             raise Exception(f"Failed to solve {problem_type}: {str(e)}")
 
+    def _process_pool(self) -> ProcessPoolExecutor:
+        """The service's process pool (one per CPU), started on first use and shared by requests."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+            return self._pool
+
+    def _previous_job(self, job_id: str) -> Dict[str, Any]:
+        with self._cache_lock:
+            if job_id not in self._jobs:
+                raise ValueError(f"Unknown previous_job_id {job_id}; job ids only resolve on the process that "
+                                 "issued them (and while cached), send previous_solution")
+            self._jobs.move_to_end(job_id)
+            return self._jobs[job_id]
+
+    def _remember_job(self, problem_type: str, solution: Dict[str, Any]) -> str:
+        """Cache a solution for later re-planning (LRU); returns its job id."""
+        key = hashlib.sha1(json.dumps([problem_type, solution], sort_keys=True, default=str).encode()).hexdigest()
+        with self._cache_lock:
+            self._jobs[key] = solution
+            self._jobs.move_to_end(key)
+            while len(self._jobs) > JOB_CACHE_SIZE:
+                self._jobs.popitem(last=False)
+        return key
+
+    def _solve_linear(self, solver: pywraplp.Solver, config: Dict[str, Any], flow: str):
+        """
+        ``solver.Solve()``, or with ``config`` engine ``"race"`` a race of
+        ``config.backends`` (default SCIP, CP-SAT and CBC) within
+        ``config.time_limit`` seconds, recorded under ``flow`` in the race
+        log with the model size. Returns the status and the race report
+        (None when not raced).
+        """
+        config = config or {}
+        if config.get("engine") != "race":
+            return solver.Solve(), None
+        status, report = race(solver, config.get("backends") or RACE_BACKENDS, float(config.get("time_limit", 10)))
+        self._races.record({"time": time.time(), "flow": flow, "variables": solver.NumVariables(),
+                            "constraints": solver.NumConstraints(), "winner": report["winner"],
+                            "seconds": report["seconds"], "runs": report["runs"]})
+        return status, report
+
+    def race_summary(self) -> Dict[str, Dict[str, int]]:
+        """Races won per backend for each flow, over the race log (this process's races without one)."""
+        return self._races.summary()
+
     def _solve_lp(self, data: Dict[str, Any]) -> Dict[str, Any]:
         solver = pywraplp.Solver.CreateSolver('GLOP')
         if not solver:
@@ -182,18 +286,21 @@ class SolverService:
             solver.Maximize(linear_expr)
 
         # Solve
-        status = solver.Solve()
+        status, raced = self._solve_linear(solver, data.get("solver_config"), "mip")
 
         # Return solution
         if status == pywraplp.Solver.OPTIMAL or status == pywraplp.Solver.FEASIBLE:
             solution = {name: var.solution_value() for name, var in variables.items()}
-            return {
+            result = {
                 "status": "OPTIMAL" if status == pywraplp.Solver.OPTIMAL else "FEASIBLE",
                 "solution": solution,
                 "objective_value": solver.Objective().Value(),
-                "solve_time": solver.WallTime() / 1000,
+                "solve_time": raced["seconds"] if raced else solver.WallTime() / 1000,
                 "iterations": solver.Iterations()
             }
+            if raced:
+                result["race"] = raced
+            return result
         elif status == pywraplp.Solver.INFEASIBLE:
             return {"status": "INFEASIBLE", "solution": {}, "error": "Problem is infeasible"}
         elif status == pywraplp.Solver.UNBOUNDED:
@@ -241,6 +348,8 @@ class SolverService:
                 # Flow conservation: if a task is assigned to a vehicle, it must have exactly one previous task
                 solver.Add(sum(sequence[(v.id, t2.id, t1.id)] for t2 in request.tasks if t1.id != t2.id) == assignments[(v.id, t1.id)])
         
+        distance_matrix = np.asarray(request.distance_matrix)
+        
         # Time window constraints
         M = 100000  # Big M constant
         arrival_time = {}
@@ -258,7 +367,7 @@ class SolverService:
                     if t1.id != t2.id:
                         # If t1 is followed by t2, ensure arrival times are consistent
                         solver.Add(arrival_time[(v.id, t2.id)] >= arrival_time[(v.id, t1.id)] + t1.duration + 
-                                request.distance_matrix[t1.location.id][t2.location.id] - M * (1 - sequence[(v.id, t1.id, t2.id)]))
+                                float(distance_matrix[t1.location.id, t2.location.id]) - M * (1 - sequence[(v.id, t1.id, t2.id)]))
         
         # Objective: minimize total distance
         objective = solver.Objective()
@@ -266,7 +375,7 @@ class SolverService:
             for t1 in request.tasks:
                 for t2 in request.tasks:
                     if t1.id != t2.id:
-                        distance = request.distance_matrix[t1.location.id][t2.location.id]
+                        distance = float(distance_matrix[t1.location.id, t2.location.id])
                         objective.SetCoefficient(sequence[(v.id, t1.id, t2.id)], distance)
         objective.SetMinimization()
         
@@ -300,13 +409,34 @@ class SolverService:
             return {"status": "failed", "error": "No optimal solution found"}
 
     def _solve_fleet_mix(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Every demand period shares the same capacity row, so only the peak
+        binds; the resulting covering knapsack is solved exactly by a DP in
+        :mod:`.presolve` unless ``solver_config.engine`` is ``"mip"`` or
+        ``"race"`` or the instance is outside what the DP covers.
+        """
         request = FleetMixRequest(**data)
+        engine = (request.solver_config or {}).get("engine", "auto")
+        if engine not in ("mip", "race"):
+            solved, counts = fleet_cover([v["cost"] for v in request.vehicle_types],
+                                         [v["capacity"] for v in request.vehicle_types],
+                                         request.demand_forecast, request.constraints["budget"],
+                                         request.constraints["min_vehicles"], request.constraints["max_vehicles"])
+            if solved and counts is None:
+                return {"status": "failed", "error": "No optimal solution found", "engine": "dp"}
+            if solved:
+                solution = {
+                    "vehicle_counts": {v["id"]: int(n) for v, n in zip(request.vehicle_types, counts)},
+                    "total_cost": float(sum(v["cost"] * int(n) for v, n in zip(request.vehicle_types, counts))),
+                    "engine": "dp"
+                }
+                return {"status": "success", "solution": solution}
         solver = pywraplp.Solver.CreateSolver('SCIP')
         
-        # Create variables
+        # Create variables, bounded by the fleet size so every backend gets finite domains
         vehicle_counts = {}
         for v_type in request.vehicle_types:
-            vehicle_counts[v_type["id"]] = solver.IntVar(0, solver.infinity(), f'x_{v_type["id"]}')
+            vehicle_counts[v_type["id"]] = solver.IntVar(0, request.constraints["max_vehicles"], f'x_{v_type["id"]}')
         
         # Add constraints
         # Budget constraint
@@ -316,9 +446,9 @@ class SolverService:
         solver.Add(sum(vehicle_counts.values()) >= request.constraints["min_vehicles"])
         solver.Add(sum(vehicle_counts.values()) <= request.constraints["max_vehicles"])
         
-        # Demand coverage constraints
-        for t, demand in enumerate(request.demand_forecast):
-            solver.Add(sum(vehicle_counts[v["id"]] * v["capacity"] for v in request.vehicle_types) >= demand)
+        # Demand coverage: the rows differ only in their bound, so the peak dominates
+        if request.demand_forecast:
+            solver.Add(sum(vehicle_counts[v["id"]] * v["capacity"] for v in request.vehicle_types) >= max(request.demand_forecast))
         
         # Objective: minimize total cost
         objective = solver.Objective()
@@ -326,268 +456,703 @@ class SolverService:
             objective.SetCoefficient(vehicle_counts[v_type["id"]], v_type["cost"])
         objective.SetMinimization()
         
-        status = solver.Solve()
+        status, raced = self._solve_linear(solver, request.solver_config, "fleet_mix")
         if status == pywraplp.Solver.OPTIMAL:
             solution = {
-                "vehicle_counts": {v_id: int(vehicle_counts[v_id].solution_value()) for v_id in vehicle_counts},
-                "total_cost": objective.Value()
+                "vehicle_counts": {v_id: int(round(vehicle_counts[v_id].solution_value())) for v_id in vehicle_counts},
+                "total_cost": objective.Value(),
+                "engine": "mip"
             }
+            if raced:
+                solution["race"] = raced
             return {"status": "success", "solution": solution}
         else:
             return {"status": "failed", "error": "No optimal solution found"}
 
-    def _solve_maintenance(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _solve_maintenance(self, data: Dict[str, Any], release: int = 0, fixed: List[tuple] = ()) -> Dict[str, Any]:
+        """
+        Schedule maintenance tasks with CP-SAT interval variables.
+
+        Each task is an interval on its owning vehicle (vehicles are serviced
+        one task at a time) and is placed in exactly one facility through an
+        optional interval per facility; each facility carries a cumulative
+        with its ``facility_capacity``. Delay is measured from the start to
+        the vehicle's maintenance interval. A first-fit schedule in due-date
+        order seeds the search and is returned if the time limit expires
+        before CP-SAT reports a solution.
+
+        Tasks start no earlier than ``release``; ``fixed`` holds
+        ``(vehicle_id, facility index or None, start, size)`` of maintenance
+        already scheduled, which occupies its vehicle and facility.
+        ``solver_config.rolling_horizon`` schedules tasks in rolling windows
+        of due dates instead.
+        """
         request = MaintenanceScheduleRequest(**data)
-        solver = pywraplp.Solver.CreateSolver('SCIP')
-        
-        # Create variables
-        maintenance_schedule = {}
-        for v in request.vehicles:
-            for m in request.maintenance_tasks:
-                for t in range(request.time_horizon):
-                    maintenance_schedule[(v.id, m.id, t)] = solver.BoolVar(f'x_{v.id}_{m.id}_{t}')
-        
+        rolling = rolling_options(request.solver_config)
+        if rolling is not None and request.time_horizon > rolling[0]:
+            return self._maintenance_rolling(data, request, *rolling)
+        model = cp_model.CpModel()
+        horizon = request.time_horizon
+        max_delay = request.constraints.get("max_maintenance_delay")
+        capacities = request.constraints.get("facility_capacity") or []
+        vehicles = {v.id: v for v in request.vehicles}
+        facilities = request.maintenance_facilities
+        facility_capacity = [
+            int(capacities[f.id] if 0 <= f.id < len(capacities) else (capacities[k] if k < len(capacities) else 1))
+            for k, f in enumerate(facilities)
+        ]
+        
+        # One start per maintenance task, only on its owning vehicle
+        tasks = request.maintenance_tasks
+        starts, sizes, dues, latest, placed, delays = [], [], [], [], [], []
+        by_vehicle: Dict[int, List[Any]] = {}
+        by_facility: List[List[Any]] = [[] for _ in facilities]
+        for m in tasks:
+            due = vehicles[m.vehicle_id].maintenance_interval if m.vehicle_id in vehicles else horizon
+            size, last = maintenance_slot(m.duration, due, horizon, max_delay)
+            if last < release:
+                return {"status": "failed", "error": f"Maintenance task {m.id} cannot start within the horizon and delay limit"}
+            start = model.NewIntVar(release, last, f'start_{m.id}')
+            by_vehicle.setdefault(m.vehicle_id, []).append(model.NewFixedSizeIntervalVar(start, size, f'm_{m.id}'))
+            literals = [model.NewBoolVar(f'at_{m.id}_{f.id}') for f in facilities]
+            if literals:
+                model.AddExactlyOne(literals)
+                for k, iv in enumerate(optional_copies(model, start, size, literals, f'm_{m.id}_at')):
+                    by_facility[k].append(iv)
+            delay = model.NewIntVar(0, max(0, horizon - due), f'delay_{m.id}')
+            model.Add(delay >= start - due)
+            starts.append(start); sizes.append(size); dues.append(due); latest.append(last)
+            placed.append(literals); delays.append(delay)
+        
+        for vehicle_id, k, begin, size in fixed:
+            interval = model.NewFixedSizeIntervalVar(begin, size, f'fixed_{vehicle_id}_{begin}')
+            by_vehicle.setdefault(vehicle_id, []).append(interval)
+            if k is not None:
+                by_facility[k].append(interval)
+
         # Add constraints
-        # Each maintenance task must be scheduled exactly once
-        for m in request.maintenance_tasks:
-            solver.Add(sum(maintenance_schedule[(v.id, m.id, t)] for t in range(request.time_horizon)) == 1)
-        
-        # Maintenance delay constraints
-        for v in request.vehicles:
-            for m in request.maintenance_tasks:
-                if m.vehicle_id == v.id:
-                    solver.Add(sum(t * maintenance_schedule[(v.id, m.id, t)] for t in range(request.time_horizon)) <= v.maintenance_interval + request.constraints["max_maintenance_delay"])
-        
-        # Facility capacity constraints
-        for f in request.maintenance_facilities:
-            for t in range(request.time_horizon):
-                solver.Add(sum(maintenance_schedule[(v.id, m.id, t)] for v in request.vehicles for m in request.maintenance_tasks) <= request.constraints["facility_capacity"][f.id])
+        for intervals in by_vehicle.values():
+            model.AddNoOverlap(intervals)
+        for k, capacity in enumerate(facility_capacity):
+            model.AddCumulative(by_facility[k], [1] * len(by_facility[k]), capacity)
         
         # Objective: minimize total delay
-        objective = solver.Objective()
-        for v in request.vehicles:
-            for m in request.maintenance_tasks:
-                if m.vehicle_id == v.id:
-                    for t in range(request.time_horizon):
-                        delay = max(0, t - v.maintenance_interval)
-                        objective.SetCoefficient(maintenance_schedule[(v.id, m.id, t)], delay)
-        objective.SetMinimization()
+        model.Minimize(cp_model.LinearExpr.Sum(delays))
+        
+        first_fit = self._maintenance_first_fit(tasks, sizes, dues, latest, facility_capacity, horizon, release, fixed)
+        if first_fit is not None:
+            for i, (t, k) in enumerate(first_fit):
+                model.AddHint(starts[i], t)
+                for kk, lit in enumerate(placed[i]):
+                    model.AddHint(lit, kk == k)
+                model.AddHint(delays[i], max(0, t - dues[i]))
+        stability = PlanStability(model, request.stability)
+        previous = {e.get("maintenance_id"): e for e in previous_entries(request.previous_solution, "schedule")}
+        for i, m in enumerate(tasks):
+            entry = previous.get(m.id)
+            if entry is None or entry.get("time") is None:
+                continue
+            stability.keep(m.id, starts[i], entry["time"])
+            for k, lit in enumerate(placed[i]):
+                stability.keep(m.id, lit, facilities[k].id == entry.get("facility_id"))
+            stability.hint(delays[i], max(0, int(entry["time"]) - dues[i]))
+        stability.apply()
         
-        status = solver.Solve()
-        if status == pywraplp.Solver.OPTIMAL:
-            solution = {
-                "schedule": [],
-                "total_delay": objective.Value()
-            }
-            for v in request.vehicles:
-                for m in request.maintenance_tasks:
-                    for t in range(request.time_horizon):
-                        if maintenance_schedule[(v.id, m.id, t)].solution_value() > 0.5:
-                            solution["schedule"].append({
-                                "vehicle_id": v.id,
-                                "maintenance_id": m.id,
-                                "time": t
-                            })
-            return {"status": "success", "solution": solution}
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = 10
+        status = solver.Solve(model)
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            plan = [(solver.Value(starts[i]), next((k for k, lit in enumerate(placed[i]) if solver.Value(lit)), None))
+                    for i in range(len(tasks))]
+        elif first_fit is not None and status != cp_model.INFEASIBLE and not stability.pinned:
+            plan = first_fit
         else:
             return {"status": "failed", "error": "No optimal solution found"}
+        solution = {
+            "schedule": [],
+            "total_delay": float(sum(max(0, t - due) for (t, _), due in zip(plan, dues))),
+            "optimal": status == cp_model.OPTIMAL
+        }
+        if stability.active and status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            solution["replan"] = stability.report(solver.Value)
+        for m, (t, k), size in zip(tasks, plan, sizes):
+            entry = {"vehicle_id": m.vehicle_id, "maintenance_id": m.id, "time": t, "end": t + size}
+            if k is not None:
+                entry["facility_id"] = facilities[k].id
+            solution["schedule"].append(entry)
+        return {"status": "success", "solution": solution}
+
+    def _maintenance_first_fit(self, tasks, sizes, dues, latest, capacity, horizon, release=0, fixed=()):
+        """
+        Earliest-feasible placement from ``release`` in due-date order,
+        tracking per-slot facility usage and vehicle availability with the
+        ``fixed`` maintenance already in place. Returns ``[(start, facility)]``
+        or None if some task does not fit.
+        """
+        usage = np.zeros((max(len(capacity), 1), horizon + 1), dtype=np.int64)
+        limit = np.array(capacity or [len(tasks) + len(fixed)])[:, None]
+        busy: Dict[int, np.ndarray] = {}
+        for vehicle_id, k, begin, size in fixed:
+            busy.setdefault(vehicle_id, np.zeros(horizon + 1, dtype=bool))[begin:begin + size] = True
+            usage[k if k is not None else 0, begin:begin + size] += 1
+        plan: List[Any] = [None] * len(tasks)
+        for i in sorted(range(len(tasks)), key=lambda i: (latest[i], dues[i])):
+            size = sizes[i]
+            vehicle = busy.setdefault(tasks[i].vehicle_id, np.zeros(horizon + 1, dtype=bool))
+            # Free windows of length `size` for each facility and for the vehicle
+            full = np.lib.stride_tricks.sliding_window_view(usage >= limit, size, axis=1).any(axis=2)
+            taken = np.lib.stride_tricks.sliding_window_view(vehicle, size).any(axis=1)
+            fits = ~full[:, release:latest[i] + 1] & ~taken[None, release:latest[i] + 1]
+            slots = np.argwhere(fits.T)
+            if len(slots) == 0:
+                return None
+            t, k = int(slots[0][0]) + release, int(slots[0][1])
+            usage[k, t:t + size] += 1
+            vehicle[t:t + size] = True
+            plan[i] = (t, k if capacity else None)
+        return plan
+
+    def _maintenance_rolling(self, data: Dict[str, Any], request: MaintenanceScheduleRequest,
+                             window: int, overlap: int) -> Dict[str, Any]:
+        """
+        Rolling horizon over due dates: each window schedules the open tasks
+        due before it ends, starting no earlier than the window, and keeps
+        those starting before its commit slot. Kept maintenance overlapping
+        later windows stays in place on its vehicle and facility.
+        """
+        horizon = request.time_horizon
+        intervals = {v.id: v.maintenance_interval for v in request.vehicles}
+        due = {m.id: min(max(intervals.get(m.vehicle_id, horizon), 0), horizon - 1) for m in request.maintenance_tasks}
+        facility_index = {f.id: k for k, f in enumerate(request.maintenance_facilities)}
+        config = {k: v for k, v in (request.solver_config or {}).items() if k != "rolling_horizon"}
+        schedule, windows = [], []
+        for start, end, commit in rolling_windows(horizon, window, overlap):
+            kept = {entry["maintenance_id"] for entry in schedule}
+            open_tasks = [m for m in data["maintenance_tasks"] if m["id"] not in kept and due[m["id"]] < end]
+            if not open_tasks:
+                continue
+            began = time.perf_counter()
+            fixed = [(entry["vehicle_id"], facility_index.get(entry.get("facility_id")), entry["time"],
+                      entry["end"] - entry["time"]) for entry in schedule if entry["end"] > start]
+            result = self._solve_maintenance({**data, "maintenance_tasks": open_tasks, "solver_config": config},
+                                             release=start, fixed=fixed)
+            windows.append({"start": start, "end": end, "tasks": len(open_tasks), "status": result["status"],
+                            "seconds": time.perf_counter() - began})
+            if result["status"] != "success":
+                return {"status": "failed", "error": f"{result['error']} (window {start}-{end - 1})", "windows": windows}
+            schedule += [entry for entry in result["solution"]["schedule"] if entry["time"] < commit]
+        return {"status": "success", "solution": {
+            "schedule": schedule,
+            "total_delay": float(sum(max(0, entry["time"] - intervals.get(entry["vehicle_id"], horizon))
+                                     for entry in schedule)),
+            "optimal": False,
+            "windows": windows
+        }}
 
     def _solve_fuel(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Choose refuel stops for every vehicle on every route.
+
+        Routes are keyed by their position in ``routes`` (reported as
+        ``route_id``). All route lengths come from one gather over the
+        distance matrix, and a station is a candidate stop for a route only
+        when it is reachable from some location on it within
+        ``constraints.max_detour`` (any finite distance when unset), so the
+        model has one variable per vehicle, route and candidate station.
+        """
         request = FuelOptimizationRequest(**data)
+        distance_matrix = np.asarray(request.distance_matrix, dtype=np.float64)
+        max_fuel = request.constraints["max_fuel_level"]
+        lengths, candidates = self._fuel_routes(distance_matrix, request.routes,
+                                                [s.id for s in request.fuel_stations],
+                                                request.constraints.get("max_detour"))
+        stations = request.fuel_stations
         solver = pywraplp.Solver.CreateSolver('SCIP')
         
-        # Create variables
+        # Create variables, only for stations near each route
         refuel_stops = {}
+        objective = solver.Objective()
         for v in request.vehicles:
-            for r in request.routes:
-                for s in request.fuel_stations:
-                    refuel_stops[(v.id, r[0].id, s.id)] = solver.BoolVar(f'x_{v.id}_{r[0].id}_{s.id}')
-        
-        # Add constraints
-        # Fuel level constraints
-        for v in request.vehicles:
-            for r in request.routes:
-                total_distance = sum(request.distance_matrix[r[i].id][r[i+1].id] for i in range(len(r)-1))
-                fuel_consumption = total_distance / v.fuel_efficiency
-                solver.Add(sum(refuel_stops[(v.id, r[0].id, s.id)] for s in request.fuel_stations) * request.constraints["max_fuel_level"] >= fuel_consumption)
+            for r, near in enumerate(candidates):
+                stops = []
+                for k in near:
+                    var = solver.BoolVar(f'x_{v.id}_{r}_{stations[k].id}')
+                    refuel_stops[(v.id, r, k)] = var
+                    objective.SetCoefficient(var, request.fuel_prices[stations[k].id])
+                    stops.append(var)
+                # Fuel level constraints
+                fuel_consumption = lengths[r] / v.fuel_efficiency
+                if not stops and fuel_consumption > 0:
+                    return {"status": "failed", "error": f"No fuel station within reach of route {r}"}
+                if stops:
+                    solver.Add(solver.Sum(stops) * max_fuel >= fuel_consumption)
         
         # Objective: minimize total fuel cost
-        objective = solver.Objective()
-        for v in request.vehicles:
-            for r in request.routes:
-                for s in request.fuel_stations:
-                    objective.SetCoefficient(refuel_stops[(v.id, r[0].id, s.id)], request.fuel_prices[s.id])
         objective.SetMinimization()
         
         status = solver.Solve()
         if status == pywraplp.Solver.OPTIMAL:
             solution = {
                 "refuel_stops": [],
-                "total_cost": objective.Value()
+                "total_cost": objective.Value(),
+                "model_stats": {"variables": len(refuel_stops),
+                                "dense_variables": len(request.vehicles) * len(request.routes) * len(stations)}
             }
-            for v in request.vehicles:
-                for r in request.routes:
-                    for s in request.fuel_stations:
-                        if refuel_stops[(v.id, r[0].id, s.id)].solution_value() > 0.5:
-                            solution["refuel_stops"].append({
-                                "vehicle_id": v.id,
-                                "route_id": r[0].id,
-                                "station_id": s.id
-                            })
+            for (v_id, r, k), var in refuel_stops.items():
+                if var.solution_value() > 0.5:
+                    solution["refuel_stops"].append({
+                        "vehicle_id": v_id,
+                        "route_id": r,
+                        "station_id": stations[k].id
+                    })
             return {"status": "success", "solution": solution}
         else:
             return {"status": "failed", "error": "No optimal solution found"}
 
+    def _fuel_routes(self, distance_matrix: np.ndarray, routes: List[List[Any]], station_ids: List[int],
+                     max_detour: float = None) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """
+        Length of every route and the candidate station indices per route.
+
+        Consecutive location pairs of all routes are gathered from the
+        matrix at once and summed per route; station reach is looked up for
+        the distinct route locations only and reduced per route.
+        """
+        sizes = np.array([len(r) for r in routes], dtype=np.int64)
+        nodes = np.array([loc.id for r in routes for loc in r], dtype=np.int64)
+        owner = np.repeat(np.arange(len(routes)), sizes)
+        # A leg joins consecutive locations of the same route
+        legs = np.flatnonzero(owner[1:] == owner[:-1]) if len(nodes) else np.zeros(0, dtype=np.int64)
+        lengths = np.bincount(owner[legs], weights=distance_matrix[nodes[legs], nodes[legs + 1]],
+                              minlength=len(routes))
+        if not station_ids:
+            return lengths, [np.zeros(0, dtype=np.int64) for _ in routes]
+        places, index = np.unique(nodes, return_inverse=True)
+        reach = distance_matrix[places[:, None], np.asarray(station_ids)[None, :]]
+        near = np.isfinite(reach) if max_detour is None else reach <= max_detour
+        candidates = [np.zeros(0, dtype=np.int64)] * len(routes)
+        nonempty = np.flatnonzero(sizes)
+        if len(nonempty):
+            starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])[nonempty]
+            on_route = np.logical_or.reduceat(near[index], starts, axis=0)
+            for r, row in zip(nonempty.tolist(), on_route):
+                candidates[r] = np.flatnonzero(row)
+        return lengths, candidates
+
     def _solve_employee_schedule(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Assign tasks to eligible employees.
+
+        Without numeric ``min_rest_hours``/``max_consecutive_hours`` nothing
+        depends on the hour, so the E x T assignment is solved and each task
+        is reported at the start of its time window. Otherwise tasks become
+        intervals inside their windows (see ``_employee_schedule_intervals``),
+        solved in rolling windows of hours when ``solver_config`` has a
+        ``rolling_horizon``. All paths report ``model_stats`` against the
+        time-indexed model.
+        """
         request = EmployeeScheduleRequest(**data)
+        eligible = eligibility_matrix([e.skills for e in request.employees],
+                                      [t.required_skills for t in request.tasks])
+        pairs = eligible_pairs(eligible)
+        timed = {k: v for k, v in request.constraints.items()
+                 if k in ("min_rest_hours", "max_consecutive_hours") and isinstance(v, (int, float))}
+        rolling = rolling_options(request.solver_config)
+        if timed and rolling is not None and request.time_horizon > rolling[0]:
+            result = self._employee_schedule_rolling(request, timed, *rolling)
+        elif timed:
+            result = self._employee_schedule_intervals(request, pairs, timed)
+        else:
+            result = self._employee_schedule_assignment(request, pairs)
+        if "solution" in result:
+            time_indexed = len(request.employees) * len(request.tasks) * request.time_horizon
+            result["solution"]["model_stats"]["time_indexed_variables"] = time_indexed
+            result["solution"]["model_stats"]["reduction"] = time_indexed / max(1, result["solution"]["model_stats"]["variables"])
+        return result
+
+    def _employee_schedule_assignment(self, request: EmployeeScheduleRequest, pairs: List[tuple]) -> Dict[str, Any]:
         solver = pywraplp.Solver.CreateSolver('SCIP')
         
-        # Create variables
+        # Create variables, only for employees holding every required skill
         schedule = {}
-        for e in request.employees:
-            for t in request.tasks:
-                for h in range(request.time_horizon):
-                    schedule[(e.id, t.id, h)] = solver.BoolVar(f'x_{e.id}_{t.id}_{h}')
+        by_task = {t.id: [] for t in request.tasks}
+        by_employee = {e.id: [] for e in request.employees}
+        for i, j in pairs:
+            e, t = request.employees[i], request.tasks[j]
+            var = schedule[(e.id, t.id)] = solver.BoolVar(f'x_{e.id}_{t.id}')
+            by_task[t.id].append(var)
+            by_employee[e.id].append(var * t.duration)
         
         # Add constraints
-        # Each task must be assigned to exactly one employee
+        # Each task must be assigned to exactly one eligible employee
         for t in request.tasks:
-            solver.Add(sum(schedule[(e.id, t.id, h)] for e in request.employees for h in range(request.time_horizon)) == 1)
+            solver.Add(solver.Sum(by_task[t.id]) == 1)
         
         # Employee working hours constraints
         for e in request.employees:
-            solver.Add(sum(schedule[(e.id, t.id, h)] * t.duration for t in request.tasks for h in range(request.time_horizon)) <= e.max_hours)
-        
-        # Skill requirements
-        for t in request.tasks:
-            for e in request.employees:
-                if not all(skill in e.skills for skill in t.required_skills):
-                    solver.Add(sum(schedule[(e.id, t.id, h)] for h in range(request.time_horizon)) == 0)
+            solver.Add(solver.Sum(by_employee[e.id]) <= e.max_hours)
         
         # Objective: minimize total cost
         objective = solver.Objective()
-        for e in request.employees:
-            for t in request.tasks:
-                for h in range(request.time_horizon):
-                    objective.SetCoefficient(schedule[(e.id, t.id, h)], e.hourly_rate * t.duration)
+        rates = {e.id: e.hourly_rate for e in request.employees}
+        durations = {t.id: t.duration for t in request.tasks}
+        for (e_id, t_id), var in schedule.items():
+            objective.SetCoefficient(var, rates[e_id] * durations[t_id])
         objective.SetMinimization()
         
         status = solver.Solve()
         if status == pywraplp.Solver.OPTIMAL:
+            # Hours are interchangeable: report each task at its window start
+            last_hour = max(request.time_horizon - 1, 0)
+            hours = {t.id: min(max(int(t.time_window[0]), 0), last_hour) if t.time_window else 0 for t in request.tasks}
             solution = {
                 "schedule": [],
-                "total_cost": objective.Value()
+                "total_cost": objective.Value(),
+                "model_stats": {"formulation": "assignment", "variables": len(schedule)}
             }
-            for e in request.employees:
-                for t in request.tasks:
-                    for h in range(request.time_horizon):
-                        if schedule[(e.id, t.id, h)].solution_value() > 0.5:
-                            solution["schedule"].append({
-                                "employee_id": e.id,
-                                "task_id": t.id,
-                                "hour": h
-                            })
+            for (e_id, t_id), var in schedule.items():
+                if var.solution_value() > 0.5:
+                    solution["schedule"].append({
+                        "employee_id": e_id,
+                        "task_id": t_id,
+                        "hour": hours[t_id]
+                    })
             return {"status": "success", "solution": solution}
         else:
             return {"status": "failed", "error": "No optimal solution found"}
 
+    @staticmethod
+    def _employee_rest_hours(timed: Dict[str, float]) -> int:
+        """Whole hours kept free after each task."""
+        return int(np.ceil(timed.get("min_rest_hours", 0)))
+
+    @staticmethod
+    def _limit_work_blocks(model: cp_model.CpModel, x: Dict[tuple, Any], starts: Dict[Any, Any],
+                           sizes: Dict[Any, int], busy: Dict[Any, List[tuple]], limit: float) -> None:
+        """
+        Cap back-to-back work at ``limit`` hours. ``run`` is the length of an
+        employee's block up to the end of each of their tasks: at least its
+        size, plus the run of a task or busy block ending exactly at its
+        start. A gap is only forced where a chain would exceed the limit.
+        """
+        limit = int(np.floor(limit))
+        bounds = {t_id: tuple(var.Proto().domain) for t_id, var in starts.items()}
+        touching = {}
+
+        def touches(expr, at, name):
+            # True whenever `expr` equals `at`; only ever true otherwise if that helps
+            lit = model.NewBoolVar(name)
+            model.Add(expr != at).OnlyEnforceIf(lit.Not())
+            return lit
+
+        tasks_of: Dict[Any, List[Any]] = {}
+        for e_id, t_id in x:
+            tasks_of.setdefault(e_id, []).append(t_id)
+        for e_id, tasks in tasks_of.items():
+            run = {t: model.NewIntVar(0, limit, f'run_{e_id}_{t}') for t in tasks}
+            for b in tasks:
+                lo_b, hi_b = bounds[b][0], bounds[b][-1]
+                model.Add(run[b] >= sizes[b]).OnlyEnforceIf(x[(e_id, b)])
+                for a in tasks:
+                    lo_a, hi_a = bounds[a][0], bounds[a][-1]
+                    if a == b or lo_a + sizes[a] > hi_b or hi_a + sizes[a] < lo_b:
+                        continue
+                    if (a, b) not in touching:
+                        touching[(a, b)] = touches(starts[a] + sizes[a], starts[b], f'touch_{a}_{b}')
+                    model.Add(run[b] >= sizes[b] + run[a]).OnlyEnforceIf(
+                        [x[(e_id, a)], x[(e_id, b)], touching[(a, b)]])
+                for lo, hi in merge_windows(busy.get(e_id, [])):
+                    if lo_b <= hi <= hi_b:
+                        after = touches(starts[b], hi, f'after_{e_id}_{b}_{hi}')
+                        model.Add(run[b] >= sizes[b] + hi - lo).OnlyEnforceIf([x[(e_id, b)], after])
+                    if lo_b <= lo - sizes[b] <= hi_b:
+                        before = touches(starts[b] + sizes[b], lo, f'before_{e_id}_{b}_{lo}')
+                        model.Add(run[b] + hi - lo <= limit).OnlyEnforceIf([x[(e_id, b)], before])
+
+    def _employee_schedule_intervals(self, request: EmployeeScheduleRequest, pairs: List[tuple],
+                                     timed: Dict[str, float], busy: Dict[Any, List[tuple]] = None) -> Dict[str, Any]:
+        """
+        Interval formulation: one start per task inside its time window and
+        the horizon, an optional interval per eligible employee, and a
+        no-overlap per employee over intervals padded by the rest time.
+        ``max_consecutive_hours`` rules out employees for tasks longer than
+        it and, without rest padding, caps chains of back-to-back tasks (see
+        ``_limit_work_blocks``); any free hour ends a block. ``busy`` adds
+        fixed ``(start, end)`` blocks per employee id, padded the same way.
+        """
+        model = cp_model.CpModel()
+        horizon = request.time_horizon
+        max_block = timed.get("max_consecutive_hours")
+        rest = self._employee_rest_hours(timed)
+        starts, sizes = {}, {}
+        for t in request.tasks:
+            size = max(1, int(np.ceil(t.duration)))
+            window = t.time_window if len(t.time_window) > 1 else [0, horizon]
+            lo, hi = max(0, int(window[0])), min(horizon, int(window[1]))
+            if lo + size > hi:
+                return {"status": "failed", "error": f"Task {t.id} does not fit inside its time window and the horizon"}
+            starts[t.id] = model.NewIntVar(lo, hi - size, f'start_{t.id}')
+            sizes[t.id] = size
+        by_task: Dict[int, List[Any]] = {t.id: [] for t in request.tasks}
+        for i, j in pairs:
+            e, t = request.employees[i], request.tasks[j]
+            if max_block is None or t.duration <= max_block:
+                by_task[t.id].append(e)
+        
+        x, hours, cost = {}, {e.id: ([], []) for e in request.employees}, ([], [])
+        by_employee: Dict[int, List[Any]] = {e.id: [] for e in request.employees}
+        for t in request.tasks:
+            literals = [model.NewBoolVar(f'x_{e.id}_{t.id}') for e in by_task[t.id]]
+            model.AddExactlyOne(literals)
+            # Padded copies keep `rest` hours free after the task on the same employee
+            padded = optional_copies(model, starts[t.id], sizes[t.id] + rest, literals, f'iv_{t.id}')
+            for e, lit, iv in zip(by_task[t.id], literals, padded):
+                x[(e.id, t.id)] = lit
+                by_employee[e.id].append(iv)
+                hours[e.id][0].append(lit)
+                hours[e.id][1].append(sizes[t.id])
+                cost[0].append(lit)
+                cost[1].append(int(round(e.hourly_rate * t.duration * 100)))
+        for e_id, blocks in (busy or {}).items():
+            if e_id in by_employee:
+                by_employee[e_id] += [model.NewFixedSizeIntervalVar(lo, hi - lo + rest, f'busy_{e_id}_{lo}')
+                                      for lo, hi in blocks]
+        for e in request.employees:
+            model.AddNoOverlap(by_employee[e.id])
+            model.Add(cp_model.LinearExpr.WeightedSum(*hours[e.id]) <= int(np.floor(e.max_hours)))
+        if max_block is not None and rest == 0:
+            self._limit_work_blocks(model, x, starts, sizes, busy or {}, max_block)
+        # Objective in cents so fractional rates stay exact
+        total_cost = cp_model.LinearExpr.WeightedSum(*cost)
+        model.Minimize(total_cost)
+        stability = PlanStability(model, request.stability)
+        for entry in previous_entries(request.previous_solution, "schedule"):
+            t_id = entry.get("task_id")
+            if t_id not in starts:
+                continue
+            for e in by_task[t_id]:
+                stability.keep(t_id, x[(e.id, t_id)], e.id == entry.get("employee_id"))
+            if entry.get("hour") is not None:
+                stability.keep(t_id, starts[t_id], entry["hour"])
+        stability.apply()
+        
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = 10
+        status = solver.Solve(model)
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            solution = {
+                "schedule": [],
+                "total_cost": solver.Value(total_cost) / 100,
+                "model_stats": {"formulation": "interval", "variables": len(model.Proto().variables),
+                                "optimal": status == cp_model.OPTIMAL}
+            }
+            if stability.active:
+                solution["replan"] = stability.report(solver.Value)
+            for (e_id, t_id), lit in x.items():
+                if solver.Value(lit):
+                    solution["schedule"].append({
+                        "employee_id": e_id,
+                        "task_id": t_id,
+                        "hour": solver.Value(starts[t_id]),
+                        "end": solver.Value(starts[t_id]) + sizes[t_id]
+                    })
+            return {"status": "success", "solution": solution}
+        return {"status": "failed", "error": "No feasible schedule found"}
+
+    def _employee_schedule_rolling(self, request: EmployeeScheduleRequest, timed: Dict[str, float],
+                                   window: int, overlap: int) -> Dict[str, Any]:
+        """
+        Rolling horizon over hours: each window schedules the open tasks whose
+        time window opens before it ends and keeps those starting before its
+        commit hour. Kept tasks still within rest time (or, without rest, one
+        work block) of the open ones stay as busy blocks of their employee,
+        and every employee's ``max_hours`` shrinks by the hours already kept.
+        """
+        horizon = request.time_horizon
+        rest = self._employee_rest_hours(timed)
+        # Without rest, kept tasks a back-to-back block away still count towards it
+        reach = rest or int(np.ceil(timed.get("max_consecutive_hours", 0)))
+        release = {t.id: min(max(0, int(t.time_window[0])) if len(t.time_window) > 1 else 0, max(horizon - 1, 0))
+                   for t in request.tasks}
+        hours_left = {e.id: e.max_hours for e in request.employees}
+        rates = {e.id: e.hourly_rate for e in request.employees}
+        durations = {t.id: t.duration for t in request.tasks}
+        schedule, windows, variables = [], [], 0
+        for start, end, commit in rolling_windows(horizon, window, overlap):
+            kept = {entry["task_id"] for entry in schedule}
+            open_tasks = [t for t in request.tasks if t.id not in kept and release[t.id] < end]
+            if not open_tasks:
+                continue
+            began = time.perf_counter()
+            earliest = min(release[t.id] for t in open_tasks)
+            busy: Dict[Any, List[tuple]] = {}
+            for entry in schedule:
+                if entry["end"] + reach >= earliest:
+                    busy.setdefault(entry["employee_id"], []).append((entry["hour"], entry["end"]))
+            employees = [e.model_copy(update={"max_hours": hours_left[e.id]}) for e in request.employees]
+            part = request.model_copy(update={"tasks": open_tasks, "employees": employees})
+            eligible = eligibility_matrix([e.skills for e in employees], [t.required_skills for t in open_tasks])
+            result = self._employee_schedule_intervals(part, eligible_pairs(eligible), timed, busy)
+            windows.append({"start": start, "end": end, "tasks": len(open_tasks), "status": result["status"],
+                            "seconds": time.perf_counter() - began})
+            if result["status"] != "success":
+                return {"status": "failed", "error": f"{result['error']} in hours {start}-{end - 1}",
+                        "windows": windows}
+            variables = max(variables, result["solution"]["model_stats"]["variables"])
+            for entry in result["solution"]["schedule"]:
+                if entry["hour"] < commit:
+                    schedule.append(entry)
+                    hours_left[entry["employee_id"]] -= entry["end"] - entry["hour"]
+        return {"status": "success", "solution": {
+            "schedule": schedule,
+            "total_cost": sum(rates[entry["employee_id"]] * durations[entry["task_id"]] for entry in schedule),
+            "model_stats": {"formulation": "interval", "variables": variables, "optimal": False},
+            "windows": windows
+        }}
+
     def _solve_task_assignment(self, data: Dict[str, Any]) -> Dict[str, Any]:
         request = TaskAssignmentRequest(**data)
+        eligible = eligibility_matrix([e.skills for e in request.employees],
+                                      [t.required_skills for t in request.tasks])
+        max_tasks = request.constraints["max_tasks_per_employee"]
+        engine = (request.solver_config or {}).get("engine", "auto")
+        # One employee per task and a task cap per employee: a transportation problem
+        if engine != "mip" and isinstance(max_tasks, int):
+            priorities = np.array([t.priority for t in request.tasks], dtype=np.int64)
+            costs = np.broadcast_to(-priorities, eligible.shape)
+            used, assignment = solve_transportation(costs, eligible, [max_tasks] * len(request.employees))
+            if assignment is None:
+                return {"status": "failed", "error": "No optimal solution found", "engine": used}
+            solution = {
+                "assignments": [{"employee_id": request.employees[i].id, "task_id": t.id}
+                                for t, i in zip(request.tasks, assignment.tolist())],
+                "total_priority": float(priorities.sum()),
+                "engine": used
+            }
+            return {"status": "success", "solution": solution}
+        return self._task_assignment_mip(request, eligible)
+
+    def _task_assignment_mip(self, request: TaskAssignmentRequest, eligible: np.ndarray) -> Dict[str, Any]:
         solver = pywraplp.Solver.CreateSolver('SCIP')
         
-        # Create variables
+        # Create variables, only for employees holding every required skill
         assignments = {}
-        for e in request.employees:
-            for t in request.tasks:
-                assignments[(e.id, t.id)] = solver.BoolVar(f'x_{e.id}_{t.id}')
+        by_task = {t.id: [] for t in request.tasks}
+        by_employee = {e.id: [] for e in request.employees}
+        for i, j in eligible_pairs(eligible):
+            e, t = request.employees[i], request.tasks[j]
+            var = assignments[(e.id, t.id)] = solver.BoolVar(f'x_{e.id}_{t.id}')
+            by_task[t.id].append(var)
+            by_employee[e.id].append(var)
         
         # Add constraints
-        # Each task must be assigned to exactly one employee
+        # Each task must be assigned to exactly one eligible employee
         for t in request.tasks:
-            solver.Add(sum(assignments[(e.id, t.id)] for e in request.employees) == 1)
+            solver.Add(solver.Sum(by_task[t.id]) == 1)
         
         # Maximum tasks per employee
         for e in request.employees:
-            solver.Add(sum(assignments[(e.id, t.id)] for t in request.tasks) <= request.constraints["max_tasks_per_employee"])
-        
-        # Skill requirements
-        for t in request.tasks:
-            for e in request.employees:
-                if not all(skill in e.skills for skill in t.required_skills):
-                    solver.Add(assignments[(e.id, t.id)] == 0)
+            solver.Add(solver.Sum(by_employee[e.id]) <= request.constraints["max_tasks_per_employee"])
         
         # Objective: maximize task priority
         objective = solver.Objective()
-        for e in request.employees:
-            for t in request.tasks:
-                objective.SetCoefficient(assignments[(e.id, t.id)], t.priority)
+        priorities = {t.id: t.priority for t in request.tasks}
+        for (e_id, t_id), var in assignments.items():
+            objective.SetCoefficient(var, priorities[t_id])
         objective.SetMaximization()
         
         status = solver.Solve()
         if status == pywraplp.Solver.OPTIMAL:
             solution = {
                 "assignments": [],
-                "total_priority": objective.Value()
+                "total_priority": objective.Value(),
+                "engine": "mip"
             }
-            for e in request.employees:
-                for t in request.tasks:
-                    if assignments[(e.id, t.id)].solution_value() > 0.5:
-                        solution["assignments"].append({
-                            "employee_id": e.id,
-                            "task_id": t.id
-                        })
+            for (e_id, t_id), var in assignments.items():
+                if var.solution_value() > 0.5:
+                    solution["assignments"].append({
+                        "employee_id": e_id,
+                        "task_id": t_id
+                    })
             return {"status": "success", "solution": solution}
         else:
             return {"status": "failed", "error": "No optimal solution found"}
 
     def _solve_break_schedule(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Place ``break_duration`` break slots per employee, none before
+        ``min_work_before_break`` and at least one in every
+        ``max_work_before_break`` consecutive slots, minimizing the distance
+        to each employee's nearest preferred break time.
+
+        Employees do not interact, so the default engine solves every
+        employee exactly with the DP in :mod:`.breaks`;
+        ``solver_config.engine == "mip"`` builds the MIP with running-sum
+        window rows instead.
+        """
         request = BreakScheduleRequest(**data)
+        horizon = request.time_horizon
+        deviation = preference_deviation([e.id for e in request.employees],
+                                         request.constraints["preferred_break_times"], horizon)
+        count = request.constraints["break_duration"]
+        min_work = int(np.ceil(request.constraints["min_work_before_break"]))
+        max_work = int(request.constraints["max_work_before_break"])
+        if float(count).is_integer() and (request.solver_config or {}).get("engine", "auto") != "mip":
+            chosen = place_breaks(deviation, int(count), min_work, max_work)
+            if chosen is None:
+                return {"status": "failed", "error": "No optimal solution found", "engine": "dp"}
+            solution = {
+                "breaks": [{"employee_id": e.id, "time": int(t)}
+                           for e, row in zip(request.employees, chosen.tolist()) for t in row],
+                "total_deviation": float(np.take_along_axis(deviation, chosen, axis=1).sum()),
+                "engine": "dp"
+            }
+            return {"status": "success", "solution": solution}
         solver = pywraplp.Solver.CreateSolver('SCIP')
         
-        # Create variables
+        # Create variables, only from the minimum work time on
         breaks = {}
-        for e in request.employees:
-            for t in range(request.time_horizon):
+        objective = solver.Objective()
+        for i, e in enumerate(request.employees):
+            for t in range(min(max(min_work, 0), horizon), horizon):
                 breaks[(e.id, t)] = solver.BoolVar(f'x_{e.id}_{t}')
+                objective.SetCoefficient(breaks[(e.id, t)], float(deviation[i, t]))
         
         # Add constraints
-        # Break duration
         for e in request.employees:
-            solver.Add(sum(breaks[(e.id, t)] for t in range(request.time_horizon)) == request.constraints["break_duration"])
-        
-        # Minimum work before break
-        for e in request.employees:
-            for t in range(request.time_horizon):
-                if t < request.constraints["min_work_before_break"]:
-                    solver.Add(breaks[(e.id, t)] == 0)
-        
-        # Maximum work before break
-        for e in request.employees:
-            for t in range(request.time_horizon):
-                if t > request.constraints["max_work_before_break"]:
-                    solver.Add(sum(breaks[(e.id, t2)] for t2 in range(t-request.constraints["max_work_before_break"], t)) >= 1)
+            mine = [breaks.get((e.id, t)) for t in range(horizon)]
+            # Break duration
+            solver.Add(solver.Sum([x for x in mine if x is not None]) == count)
+            # Maximum work before break: every window [t - max_work, t) with
+            # t > max_work holds a break, written on running sums so each row
+            # has two terms instead of max_work
+            if max_work < horizon - 1:
+                if max_work <= 0:
+                    return {"status": "failed", "error": "No optimal solution found", "engine": "mip"}
+                running = [0]
+                for t, x in enumerate(mine):
+                    running.append(running[-1] if x is None else solver.NumVar(0, t + 1, f'c_{e.id}_{t + 1}'))
+                    if x is not None:
+                        solver.Add(running[-1] == running[-2] + x)
+                for t in range(max_work + 1, horizon):
+                    solver.Add(running[t] - running[t - max_work] >= 1)
         
         # Objective: minimize deviation from preferred break times
-        objective = solver.Objective()
-        for e in request.employees:
-            for t in range(request.time_horizon):
-                deviation = min(abs(t - p["time"]) for p in request.constraints["preferred_break_times"] if p["employee_id"] == e.id)
-                objective.SetCoefficient(breaks[(e.id, t)], deviation)
         objective.SetMinimization()
         
         status = solver.Solve()
         if status == pywraplp.Solver.OPTIMAL:
             solution = {
                 "breaks": [],
-                "total_deviation": objective.Value()
+                "total_deviation": objective.Value(),
+                "engine": "mip"
             }
-            for e in request.employees:
-                for t in range(request.time_horizon):
-                    if breaks[(e.id, t)].solution_value() > 0.5:
-                        solution["breaks"].append({
-                            "employee_id": e.id,
-                            "time": t
-                        })
+            for (e_id, t), var in breaks.items():
+                if var.solution_value() > 0.5:
+                    solution["breaks"].append({
+                        "employee_id": e_id,
+                        "time": t
+                    })
             return {"status": "success", "solution": solution}
         else:
             return {"status": "failed", "error": "No optimal solution found"}
@@ -595,70 +1160,101 @@ class SolverService:
     def _solve_labor_cost(self, data: Dict[str, Any]) -> Dict[str, Any]:
         request = LaborCostRequest(**data)
         solver = pywraplp.Solver.CreateSolver('SCIP')
+        skills = SkillIndex([t.required_skills for t in request.tasks], [e.skills for e in request.employees])
+        held = skills.encode([e.skills for e in request.employees])
+        eligible = eligibility_matrix([e.skills for e in request.employees],
+                                      [t.required_skills for t in request.tasks])
         
-        # Create variables
+        # Create variables, only for employees holding every required skill
         assignments = {}
-        for e in request.employees:
-            for t in request.tasks:
-                assignments[(e.id, t.id)] = solver.BoolVar(f'x_{e.id}_{t.id}')
+        for i, j in eligible_pairs(eligible):
+            e, t = request.employees[i], request.tasks[j]
+            assignments[(e.id, t.id)] = solver.BoolVar(f'x_{e.id}_{t.id}')
+        rates = {e.id: e.hourly_rate for e in request.employees}
+        durations = {t.id: t.duration for t in request.tasks}
+        by_employee = {e.id: [] for e in request.employees}
+        for (e_id, t_id), var in assignments.items():
+            by_employee[e_id].append(var * durations[t_id])
         
         # Add constraints
         # Budget constraint
-        solver.Add(sum(assignments[(e.id, t.id)] * e.hourly_rate * t.duration for e in request.employees for t in request.tasks) <= request.constraints["budget"])
+        solver.Add(solver.Sum([var * rates[e_id] * durations[t_id] for (e_id, t_id), var in assignments.items()])
+                   <= request.constraints["budget"])
         
-        # Minimum coverage
+        # Minimum coverage: assignments made by employees holding the skill
         for skill, count in request.constraints["min_coverage"].items():
-            solver.Add(sum(assignments[(e.id, t.id)] for e in request.employees for t in request.tasks if skill in e.skills) >= count)
+            holders = {request.employees[i].id for i in np.flatnonzero(skills.has_skill(held, skill))}
+            solver.Add(solver.Sum([var for (e_id, _), var in assignments.items() if e_id in holders]) >= count)
         
         # Maximum overtime
         for e in request.employees:
-            solver.Add(sum(assignments[(e.id, t.id)] * t.duration for t in request.tasks) <= e.max_hours + request.constraints["max_overtime"])
+            solver.Add(solver.Sum(by_employee[e.id]) <= e.max_hours + request.constraints["max_overtime"])
         
         # Objective: maximize task completion
         objective = solver.Objective()
-        for e in request.employees:
-            for t in request.tasks:
-                objective.SetCoefficient(assignments[(e.id, t.id)], 1)
+        for var in assignments.values():
+            objective.SetCoefficient(var, 1)
         objective.SetMaximization()
         
-        status = solver.Solve()
+        status, raced = self._solve_linear(solver, request.solver_config, "labor_cost")
         if status == pywraplp.Solver.OPTIMAL:
             solution = {
                 "assignments": [],
                 "total_tasks": objective.Value()
             }
-            for e in request.employees:
-                for t in request.tasks:
-                    if assignments[(e.id, t.id)].solution_value() > 0.5:
-                        solution["assignments"].append({
-                            "employee_id": e.id,
-                            "task_id": t.id
-                        })
+            if raced:
+                solution["race"] = raced
+            for (e_id, t_id), var in assignments.items():
+                if var.solution_value() > 0.5:
+                    solution["assignments"].append({
+                        "employee_id": e_id,
+                        "task_id": t_id
+                    })
             return {"status": "success", "solution": solution}
         else:
             return {"status": "failed", "error": "No optimal solution found"}
 
     def _solve_workforce_capacity(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Hiring only has to cover the peak period and each skill's hours, so
+        non-negative costs are solved in closed form by :mod:`.presolve`;
+        ``solver_config.engine == "mip"`` forces the MIP.
+        """
         request = WorkforceCapacityRequest(**data)
+        skills = list(request.constraints["skill_requirements"].keys())
+        engine = (request.solver_config or {}).get("engine", "auto")
+        if engine != "mip":
+            costs = [request.constraints["hiring_costs"][skill] for skill in skills]
+            solved, hires = workforce_hiring(costs, request.demand_forecast,
+                                             request.constraints["max_hours_per_employee"])
+            if solved and hires is None:
+                return {"status": "failed", "error": "No optimal solution found", "engine": "closed_form"}
+            if solved:
+                solution = {
+                    "hiring": {skill: int(n) for skill, n in zip(skills, hires)},
+                    "total_cost": float(sum(c * int(n) for c, n in zip(costs, hires))),
+                    "engine": "closed_form"
+                }
+                return {"status": "success", "solution": solution}
         solver = pywraplp.Solver.CreateSolver('SCIP')
         
         # Create variables
         hiring = {}
-        for skill in request.constraints["skill_requirements"].keys():
+        for skill in skills:
             hiring[skill] = solver.IntVar(0, solver.infinity(), f'h_{skill}')
         
         # Add constraints
-        # Demand coverage
-        for t, demand in enumerate(request.demand_forecast):
-            solver.Add(sum(hiring[skill] for skill in request.constraints["skill_requirements"].keys()) >= demand)
+        # Demand coverage: the rows differ only in their bound, so the peak dominates
+        if request.demand_forecast:
+            solver.Add(sum(hiring[skill] for skill in skills) >= max(request.demand_forecast))
         
         # Maximum hours per employee
-        for skill in request.constraints["skill_requirements"].keys():
+        for skill in skills:
             solver.Add(hiring[skill] * request.constraints["max_hours_per_employee"] >= sum(request.demand_forecast))
         
         # Objective: minimize hiring costs
         objective = solver.Objective()
-        for skill in request.constraints["skill_requirements"].keys():
+        for skill in skills:
             objective.SetCoefficient(hiring[skill], request.constraints["hiring_costs"][skill])
         objective.SetMinimization()
         
@@ -666,7 +1262,8 @@ class SolverService:
         if status == pywraplp.Solver.OPTIMAL:
             solution = {
                 "hiring": {skill: int(hiring[skill].solution_value()) for skill in hiring},
-                "total_cost": objective.Value()
+                "total_cost": objective.Value(),
+                "engine": "mip"
             }
             return {"status": "success", "solution": solution}
         else:
@@ -674,6 +1271,9 @@ class SolverService:
 
     def _solve_shift_coverage(self, data: Dict[str, Any]) -> Dict[str, Any]:
         request = ShiftCoverageRequest(**data)
+        config = request.solver_config or {}
+        if config.get("engine") == "roster":
+            return self._shift_coverage_roster(request, config)
         solver = pywraplp.Solver.CreateSolver('SCIP')
         
         # Create variables
@@ -685,17 +1285,25 @@ class SolverService:
         # Add constraints
         # Minimum employees per shift
         for s in request.shifts:
-            solver.Add(sum(assignments[(e.id, s["id"])] for e in request.employees) >= request.constraints["min_employees_per_shift"][s["type"]])
-        
-        # Maximum consecutive shifts
-        for e in request.employees:
-            for t in range(request.time_horizon - request.constraints["max_consecutive_shifts"]):
-                solver.Add(sum(assignments[(e.id, s["id"])] for s in request.shifts if s["time"] in range(t, t + request.constraints["max_consecutive_shifts"])) <= request.constraints["max_consecutive_shifts"])
-        
+            solver.Add(solver.Sum([assignments[(e.id, s["id"])] for e in request.employees]) >= request.constraints["min_employees_per_shift"][s["type"]])
+        
+        # Shift windows are computed once on a time-sorted index and shared by
+        # all employees. Only shifts at whole time steps fall in a window.
+        timed = sorted((int(s["time"]), s["id"]) for s in request.shifts if float(s["time"]).is_integer())
+        times = [t for t, _ in timed]
+        max_consec = int(request.constraints["max_consecutive_shifts"])
+        min_rest = int(request.constraints["min_rest_between_shifts"])
         # Minimum rest between shifts
+        windows = [(lo, hi, 1) for lo, hi in window_ranges(times, range(request.time_horizon), min_rest, 1)]
+        # Maximum consecutive shifts. With a rest of at least one step, the
+        # ceil(max_consec / min_rest) rest windows spanning a consecutive
+        # window already allow no more than max_consec shifts in it.
+        if min_rest < 1:
+            windows += [(lo, hi, max_consec) for lo, hi in
+                        window_ranges(times, range(request.time_horizon - max_consec), max_consec, max_consec)]
         for e in request.employees:
-            for t in range(request.time_horizon):
-                solver.Add(sum(assignments[(e.id, s["id"])] for s in request.shifts if s["time"] in range(t, t + request.constraints["min_rest_between_shifts"])) <= 1)
+            for lo, hi, cap in windows:
+                solver.Add(solver.Sum([assignments[(e.id, s_id)] for _, s_id in timed[lo:hi]]) <= cap)
         
         # Objective: maximize shift coverage
         objective = solver.Objective()
@@ -721,9 +1329,43 @@ class SolverService:
         else:
             return {"status": "failed", "error": "No optimal solution found"}
 
-    def _solve_labor_scheduling(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _shift_coverage_roster(self, request: ShiftCoverageRequest, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Shift coverage by column generation. Employees are interchangeable
+        here, so a single roster class prices the longest set of shifts at
+        least ``min_rest_between_shifts`` apart (at most one shift per time).
+        """
+        shifts = request.shifts
+        times = [s["time"] for s in shifts]
+        demand = [request.constraints["min_employees_per_shift"][s["type"]] for s in shifts]
+        min_gap = request.constraints["min_rest_between_shifts"]
+
+        def price(cls, duals):
+            _, slots = price_gap_roster(times, -1 - duals, min_gap)
+            return -float(len(slots)), slots
+
+        result = generate_rosters(demand, [len(request.employees)], price, penalty=1.0 + len(shifts),
+                                  max_iterations=config.get("max_iterations", 200),
+                                  time_limit=config.get("time_limit", 10))
+        if not result["feasible"]:
+            return {"status": "failed", "error": "No feasible roster found", "convergence": result["convergence"]}
+        solution = {
+            "assignments": [{"employee_id": e.id, "shift_id": shifts[j]["id"]}
+                            for e, pattern in zip(request.employees, result["patterns"][0]) for j in pattern],
+            "total_coverage": -result["objective"],
+            "engine": "roster",
+            "convergence": result["convergence"]
+        }
+        return {"status": "success", "solution": solution}
+
+    def _solve_labor_scheduling(self, data: Dict[str, Any], history: List[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Solve labor scheduling using CP-SAT (OR-Tools).
+
+        ``history`` holds schedule entries already fixed on the days before
+        day 0 (negative days); they count towards the consecutive-day limit
+        and the rest rule on day 0. ``solver_config.rolling_horizon`` solves
+        the horizon in overlapping windows of days instead.
         """
         from ortools.sat.python import cp_model
         model = cp_model.CpModel()
@@ -733,89 +1375,397 @@ class SolverService:
         constraints = data["constraints"]
         objective_type = data.get("objective", "minimize_cost")
 
-        # Variables: shift_assignments[(e, s, d)] = 1 if employee e works shift s on day d
+        # Variables: shift_assignments[(e, s, d)] = 1 if employee e works shift s on day d,
+        # created only for employees holding the shift's required skills
+        skill_requirements = constraints.get("skill_requirements", {})
+        eligible = eligibility_matrix([e.get("skills", []) for e in employees],
+                                      [skill_requirements.get(str(s["id"]), []) for s in shifts])
+        config = data.get("solver_config") or {}
+        rolling = rolling_options(config)
+        if rolling is not None and time_horizon > rolling[0]:
+            return self._labor_scheduling_rolling(data, *rolling)
+        if config.get("engine") == "roster":
+            return self._labor_scheduling_roster(data, eligible, config)
         shift_assignments = {}
-        for e in employees:
-            for s in shifts:
-                for d in range(time_horizon):
-                    shift_assignments[(e["id"], s["id"], d)] = model.NewBoolVar(f"x_{e['id']}_{s['id']}_{d}")
+        by_shift_day = {(s["id"], d): [] for s in shifts for d in range(time_horizon)}
+        by_employee_day = {(e["id"], d): [] for e in employees for d in range(time_horizon)}
+        for i, j in eligible_pairs(eligible):
+            e, s = employees[i], shifts[j]
+            for d in range(time_horizon):
+                var = model.NewBoolVar(f"x_{e['id']}_{s['id']}_{d}")
+                shift_assignments[(e["id"], s["id"], d)] = var
+                by_shift_day[(s["id"], d)].append(var)
+                by_employee_day[(e["id"], d)].append((s["id"], var))
 
         # Constraint: Each shift must be covered by at least required employees
         for s in shifts:
             for d in range(time_horizon):
                 model.Add(
-                    sum(shift_assignments[(e["id"], s["id"], d)] for e in employees) >= constraints["coverage_requirements"].get(str(s["id"]), 1)
+                    cp_model.LinearExpr.Sum(by_shift_day[(s["id"], d)]) >= constraints["coverage_requirements"].get(str(s["id"]), 1)
                 )
 
-        # Constraint: Max consecutive hours per employee
-        max_consec = int(constraints.get("max_consecutive_hours", 8))
+        # Shifts worked per employee and day, shared by the rest and consecutive rules
+        worked = {}
         for e in employees:
-            for d in range(time_horizon - max_consec):
-                model.Add(
-                    sum(shift_assignments[(e["id"], s["id"], dd)] for s in shifts for dd in range(d, d+max_consec+1)) <= max_consec
-                )
+            for d in range(time_horizon):
+                day_vars = [var for _, var in by_employee_day[(e["id"], d)]]
+                if day_vars:
+                    worked[(e["id"], d)] = model.NewIntVar(0, len(day_vars), f"w_{e['id']}_{d}")
+                    model.Add(worked[(e["id"], d)] == cp_model.LinearExpr.Sum(day_vars))
+
+        # Constraint: Max consecutive hours per employee, as differences of a
+        # running total instead of one overlapping window sum per day. Days
+        # carried in from ``history`` start the total as constants
+        max_consec = int(constraints.get("max_consecutive_hours", 8))
+        history = history or []
+        carried = min(max_consec, -min((entry["day"] for entry in history), default=0))
+        worked_before: Dict[Any, List[int]] = {}
+        for entry in history:
+            if -entry["day"] <= carried:
+                worked_before.setdefault(entry["employee_id"], [0] * carried)[carried + entry["day"]] += 1
+        if carried + time_horizon > max_consec:
+            for e in employees:
+                if not by_employee_day[(e["id"], 0)]:
+                    continue
+                total, prefix = 0, [0]
+                for count in worked_before.get(e["id"], [0] * carried):
+                    total += count
+                    prefix.append(total)
+                for d in range(time_horizon):
+                    if (e["id"], d) in worked:
+                        nxt = model.NewIntVar(0, len(shifts) * (carried + d + 1), f"p_{e['id']}_{d}")
+                        model.Add(nxt == total + worked[(e["id"], d)])
+                        total = nxt
+                    prefix.append(total)
+                for d in range(max(0, carried - max_consec), carried + time_horizon - max_consec):
+                    model.Add(prefix[d + max_consec + 1] - prefix[d] <= max_consec)
 
-        # Constraint: Min rest hours between shifts
+        # Constraint: Min rest hours between shifts. A shift on day d rules out
+        # its precomputed conflicts on day d + 1, enforced once per shift
         min_rest = int(constraints.get("min_rest_hours", 8))
+        next_day_conflicts = self._rest_conflicts(shifts, min_rest)
         for e in employees:
             for d in range(time_horizon - 1):
-                for s1 in shifts:
-                    for s2 in shifts:
-                        if s1["id"] != s2["id"]:
-                            model.Add(
-                                shift_assignments[(e["id"], s1["id"], d)] + shift_assignments[(e["id"], s2["id"], d+1)] <= 1
-                            )
-
-        # Constraint: Skill requirements
-        for s in shifts:
-            required_skills = constraints.get("skill_requirements", {}).get(str(s["id"]), [])
-            for d in range(time_horizon):
-                for e in employees:
-                    if not all(skill in e["skills"] for skill in required_skills):
-                        model.Add(shift_assignments[(e["id"], s["id"], d)] == 0)
+                next_day = dict(by_employee_day[(e["id"], d + 1)])
+                if not next_day:
+                    continue
+                for s1, var1 in by_employee_day[(e["id"], d)]:
+                    blocked = next_day_conflicts[s1]
+                    if blocked is None:
+                        # Conflicts with every other shift: nothing but s1 may be worked next day
+                        model.Add(worked[(e["id"], d + 1)] <= next_day.get(s1, 0)).OnlyEnforceIf(var1)
+                    else:
+                        blocked = [next_day[s2].Not() for s2 in blocked if s2 in next_day]
+                        if blocked:
+                            model.AddBoolAnd(blocked).OnlyEnforceIf(var1)
+        # The last carried-in day restricts day 0 the same way
+        for entry in history:
+            if entry["day"] != -1 or (entry["employee_id"], 0) not in worked:
+                continue
+            first_day = dict(by_employee_day[(entry["employee_id"], 0)])
+            blocked = next_day_conflicts[entry["shift_id"]]
+            if blocked is None:
+                model.Add(worked[(entry["employee_id"], 0)] <= first_day.get(entry["shift_id"], 0))
+            else:
+                for s2 in blocked:
+                    if s2 in first_day:
+                        model.Add(first_day[s2] == 0)
+
+        # Symmetry: employees with the same eligible shifts and rate are
+        # interchangeable, so order their schedules lexicographically. A
+        # previous schedule or carried-in days tell them apart, so those keep
+        # them unordered
+        rates = [e.get("hourly_rate", 1) for e in employees]
+        previous = previous_entries(data.get("previous_solution"), "schedule")
+        groups = [] if previous or history else interchangeable_groups(
+            [(eligible[i].tobytes(), rates[i]) for i in range(len(employees))])
+        for group in groups:
+            schedules = [[var for d in range(time_horizon) for _, var in by_employee_day[(employees[i]["id"], d)]]
+                         for i in group]
+            for k in range(len(group) - 1):
+                add_lex_geq(model, schedules[k], schedules[k + 1], f"lex_{employees[group[k]]['id']}")
+
+        coverage = [constraints["coverage_requirements"].get(str(s["id"]), 1) for s in shifts]
+        conflicts = [next_day_conflicts[s["id"]] for s in shifts]
+        shift_index = {s["id"]: j for j, s in enumerate(shifts)}
+        carry = []
+        for e in employees:
+            days = worked_before.get(e["id"], [])
+            run = next((k for k, count in enumerate(reversed(days)) if not count), len(days))
+            last = [shift_index[entry["shift_id"]] for entry in history
+                    if entry["day"] == -1 and entry["employee_id"] == e["id"]]
+            carry.append((last[0] if last else -1, run))
+        first_fit = self._labor_first_fit(eligible, coverage, rates, conflicts, [s["id"] for s in shifts],
+                                          time_horizon, max_consec, carry, carried)
+        if first_fit is not None:
+            # Permute hinted schedules within each group so the hint meets the lex order
+            for group in groups:
+                columns = np.flatnonzero(eligible[group[0]])
+                ranked = sorted((first_fit[i] for i in group), reverse=True,
+                                key=lambda plan: [plan[d] == j for d in range(time_horizon) for j in columns])
+                for i, plan in zip(group, ranked):
+                    first_fit[i] = plan
+            for i, j in eligible_pairs(eligible):
+                for d in range(time_horizon):
+                    model.AddHint(shift_assignments[(employees[i]["id"], shifts[j]["id"], d)], first_fit[i][d] == j)
 
         # Objective: Minimize total cost or maximize coverage
         if objective_type == "minimize_cost":
-            model.Minimize(
-                sum(shift_assignments[(e["id"], s["id"], d)] * e.get("hourly_rate", 1)
-                    for e in employees for s in shifts for d in range(time_horizon))
-            )
+            rate_of = {e["id"]: rate for e, rate in zip(employees, rates)}
+            keys = list(shift_assignments)
+            objective = cp_model.LinearExpr.WeightedSum([shift_assignments[k] for k in keys],
+                                                        [rate_of[k[0]] for k in keys])
+            model.Minimize(objective)
         else:
-            model.Maximize(
-                sum(shift_assignments[(e["id"], s["id"], d)] for e in employees for s in shifts for d in range(time_horizon))
-            )
+            objective = cp_model.LinearExpr.Sum(list(shift_assignments.values()))
+            model.Maximize(objective)
+
+        # Re-plan: every shift of an employee in the previous schedule is kept
+        stability = PlanStability(model, data.get("stability"))
+        worked_before = {(entry.get("employee_id"), entry.get("shift_id"), entry.get("day")) for entry in previous}
+        planned = {e_id for e_id, _, _ in worked_before}
+        for key, var in shift_assignments.items():
+            if key[0] in planned:
+                stability.keep(key[0], var, key in worked_before)
+        stability.apply()
 
         # Solve
         solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = 10
         status = solver.Solve(model)
+        if status == cp_model.MODEL_INVALID:
+            raise ValueError(f"Invalid labor scheduling model: {model.Validate()}")
         if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
             schedule = []
-            for e in employees:
-                for s in shifts:
-                    for d in range(time_horizon):
-                        if solver.Value(shift_assignments[(e["id"], s["id"], d)]) > 0.5:
-                            schedule.append({
-                                "employee_id": e["id"],
-                                "shift_id": s["id"],
-                                "day": d
-                            })
+            for (e_id, s_id, d), var in shift_assignments.items():
+                if solver.Value(var) > 0.5:
+                    schedule.append({
+                        "employee_id": e_id,
+                        "shift_id": s_id,
+                        "day": d
+                    })
+            solution = {"schedule": schedule}
+            if stability.active:
+                solution["replan"] = stability.report(solver.Value)
             return {
                 "status": "OPTIMAL" if status == cp_model.OPTIMAL else "FEASIBLE",
-                "solution": {"schedule": schedule},
-                "objective_value": solver.ObjectiveValue()
+                "solution": solution,
+                "objective_value": float(solver.Value(objective))
             }
+        elif first_fit is not None and status != cp_model.INFEASIBLE and not stability.pinned:
+            schedule = [{"employee_id": e["id"], "shift_id": shifts[j]["id"], "day": d}
+                        for e, plan in zip(employees, first_fit) for d, j in enumerate(plan) if j >= 0]
+            if objective_type == "minimize_cost":
+                value = sum(rates[i] for i, plan in enumerate(first_fit) for j in plan if j >= 0)
+            else:
+                value = len(schedule)
+            return {"status": "FEASIBLE", "solution": {"schedule": schedule}, "objective_value": float(value)}
         else:
             return {"status": "INFEASIBLE", "solution": {}, "error": "No feasible schedule found"}
 
+    def _labor_scheduling_rolling(self, data: Dict[str, Any], window: int, overlap: int) -> Dict[str, Any]:
+        """
+        Rolling horizon: solve ``window`` days at a time, keep the first
+        ``window - overlap`` and start the next window there. Each window
+        sees the last ``max_consecutive_hours`` kept days as history, so the
+        consecutive-day and rest rules hold across window boundaries. Windows
+        are solved with CP-SAT; the previous schedule of a re-plan is cut to
+        each window.
+        """
+        config = {k: v for k, v in (data.get("solver_config") or {}).items() if k not in ("rolling_horizon", "engine")}
+        previous = previous_entries(data.get("previous_solution"), "schedule")
+        max_consec = int(data["constraints"].get("max_consecutive_hours", 8))
+        schedule, windows = [], []
+        for start, end, commit in rolling_windows(data["time_horizon"], window, overlap):
+            began = time.perf_counter()
+            history = [dict(entry, day=entry["day"] - start) for entry in schedule
+                       if entry["day"] >= start - max(max_consec, 1)]
+            part = {**data, "time_horizon": end - start, "solver_config": config,
+                    "previous_solution": {"schedule": [dict(entry, day=entry["day"] - start) for entry in previous
+                                                       if start <= entry.get("day", -1) < end]} if previous else None}
+            result = self._solve_labor_scheduling(part, history)
+            windows.append({"start": start, "end": end, "status": result["status"],
+                            "seconds": time.perf_counter() - began})
+            if "schedule" not in result["solution"]:
+                return {"status": "INFEASIBLE", "solution": {"windows": windows},
+                        "error": f"No feasible schedule found for days {start}-{end - 1}"}
+            schedule += [dict(entry, day=entry["day"] + start) for entry in result["solution"]["schedule"]
+                         if entry["day"] < commit - start]
+        rate_of = {e["id"]: e.get("hourly_rate", 1) for e in data["employees"]}
+        minimize = data.get("objective", "minimize_cost") == "minimize_cost"
+        value = sum(rate_of[entry["employee_id"]] for entry in schedule) if minimize else len(schedule)
+        return {"status": "FEASIBLE", "solution": {"schedule": schedule, "windows": windows},
+                "objective_value": float(value)}
+
+    def _labor_scheduling_roster(self, data: Dict[str, Any], eligible: np.ndarray, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Labor scheduling by column generation over per-employee rosters.
+
+        Employees with the same eligible shifts and rate form one class, so
+        the master has a convexity row per class rather than per employee.
+        Patterns hold at most one shift per day and are priced by a shortest
+        path over (day, shift, run length) that applies the rest and
+        consecutive-day rules of the CP-SAT model.
+        """
+        employees, shifts = data["employees"], data["shifts"]
+        time_horizon, constraints = data["time_horizon"], data["constraints"]
+        minimize = data.get("objective", "minimize_cost") == "minimize_cost"
+        max_consec = int(constraints.get("max_consecutive_hours", 8))
+        conflicts = self._rest_conflicts(shifts, int(constraints.get("min_rest_hours", 8)))
+        # allowed_next[a, b]: shift b may be worked the day after shift a
+        allowed_next = np.eye(len(shifts), dtype=bool)
+        for a, s in enumerate(shifts):
+            if conflicts[s["id"]] is not None:
+                allowed_next[a] = [b["id"] not in conflicts[s["id"]] for b in shifts]
+        max_run = max_consec if time_horizon > max_consec else time_horizon
+
+        rates = [e.get("hourly_rate", 1) for e in employees]
+        members: Dict[Any, List[int]] = {}
+        for i in range(len(employees)):
+            members.setdefault((eligible[i].tobytes(), rates[i]), []).append(i)
+        classes = list(members.values())
+        # Cost of one shift per class, inf where the class lacks the skills
+        unit_costs = [np.where(eligible[group[0]], float(rates[group[0]]) if minimize else -1.0, np.inf)
+                      for group in classes]
+        demand = np.tile([constraints["coverage_requirements"].get(str(s["id"]), 1) for s in shifts], time_horizon)
+
+        def price(cls, duals):
+            costs = unit_costs[cls][None, :] - duals.reshape(time_horizon, len(shifts))
+            _, slots = price_daily_roster(costs, allowed_next, max_run)
+            return float(unit_costs[cls][np.asarray(slots, dtype=np.int64) % len(shifts)].sum()), slots
+
+        worst = max([float(np.abs(c[np.isfinite(c)]).max(initial=0)) for c in unit_costs], default=0.0)
+        result = generate_rosters(demand, [len(group) for group in classes], price,
+                                  penalty=1.0 + worst * max(1, time_horizon),
+                                  max_iterations=config.get("max_iterations", 200),
+                                  time_limit=config.get("time_limit", 10))
+        if not result["feasible"]:
+            return {"status": "INFEASIBLE", "solution": {"convergence": result["convergence"]},
+                    "error": "No feasible schedule found"}
+        schedule = []
+        for group, patterns in zip(classes, result["patterns"]):
+            for i, pattern in zip(group, patterns):
+                for slot in pattern:
+                    d, j = divmod(slot, len(shifts))
+                    schedule.append({"employee_id": employees[i]["id"], "shift_id": shifts[j]["id"], "day": d})
+        gap = result["convergence"]["gap"]
+        return {
+            # Optimal among rosters with at most one shift per day
+            "status": "OPTIMAL" if gap is not None and gap < 1e-9 else "FEASIBLE",
+            "solution": {"schedule": schedule, "engine": "roster", "convergence": result["convergence"]},
+            "objective_value": result["objective"] if minimize else -result["objective"]
+        }
+
+    def _labor_first_fit(self, eligible, coverage, rates, conflicts, shift_ids, time_horizon, max_consec,
+                         carry=None, carried=0):
+        """
+        Day-by-day greedy schedule with at most one shift per employee and
+        day: shifts with the fewest eligible employees are staffed first, by
+        the cheapest employees that respect the rest rule and the
+        consecutive-day limit. ``carry`` gives each employee's shift index
+        on day -1 and the run of worked days up to it, over ``carried``
+        earlier days. Returns the shift index (or -1) per employee and day,
+        or None if some shift cannot be covered.
+        """
+        num_employees, num_shifts = eligible.shape
+        plan = [[-1] * time_horizon for _ in range(num_employees)]
+        carry = carry or [(-1, 0)] * num_employees
+        run = [r for _, r in carry]
+        limit = max_consec if carried + time_horizon > max_consec else carried + time_horizon
+        order = sorted(range(num_shifts), key=lambda j: eligible[:, j].sum())
+        for d in range(time_horizon):
+            for j in order:
+                candidates = []
+                for i in np.flatnonzero(eligible[:, j]).tolist():
+                    prev = plan[i][d - 1] if d else carry[i][0]
+                    if plan[i][d] >= 0 or run[i] >= limit:
+                        continue
+                    if prev >= 0 and (prev != j if conflicts[prev] is None else shift_ids[j] in conflicts[prev]):
+                        continue
+                    candidates.append((rates[i], run[i], i))
+                if len(candidates) < coverage[j]:
+                    return None
+                for _, _, i in sorted(candidates)[:coverage[j]]:
+                    plan[i][d] = j
+            for i in range(num_employees):
+                run[i] = run[i] + 1 if plan[i][d] >= 0 else 0
+        return plan
+
+    def _rest_conflicts(self, shifts, min_rest):
+        """
+        Shifts that may not follow each shift on the next day. With start/end
+        hours on every shift, a pair conflicts when the gap between them is
+        under ``min_rest`` (shifts ending at or before their start run past
+        midnight). Otherwise every other shift conflicts, reported as None.
+        """
+        if not all("start" in s and "end" in s for s in shifts):
+            return {s["id"]: None for s in shifts}
+        conflicts = {}
+        for s1 in shifts:
+            end = s1["end"] if s1["end"] > s1["start"] else s1["end"] + 24
+            conflicts[s1["id"]] = [s2["id"] for s2 in shifts if 24 + s2["start"] - end < min_rest]
+        return conflicts
+
     def _solve_equipment_allocation(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Solve equipment allocation as a transportation/assignment problem (OR-Tools MIP).
+        Solve equipment allocation as a transportation/assignment problem.
+
+        Every supported constraint keeps the network structure (restrictions
+        remove arcs, ``min_tasks_per_equipment`` is a lower bound on the
+        equipment's supply arc, and the per-location limit only compares
+        task counts), so with integral costs it runs as a min-cost flow or
+        linear sum assignment. Other constraints, fractional costs beyond
+        six decimals or ``solver_config.engine`` ``"mip"`` (or ``"race"``,
+        racing MIP backends) use the MIP.
         """
-        solver = pywraplp.Solver.CreateSolver('SCIP')
         equipment = data["equipment"]
         tasks = data["tasks"]
-        cost_matrix = data["cost_matrix"]
+        cost_matrix = np.asarray(data["cost_matrix"])
         constraints = data["constraints"]
+        config = data.get("solver_config") or {}
+        engine = config.get("engine", "auto")
+        flow_keys = {"max_equipment_per_location", "min_tasks_per_equipment", "assignment_restrictions"}
+        if engine not in ("mip", "race") and set(constraints) <= flow_keys:
+            eq_index = [eq['id'] for eq in equipment]
+            task_index = [t['id'] for t in tasks]
+            costs = cost_matrix[np.ix_(eq_index, task_index)] if equipment and tasks else np.zeros((len(equipment), len(tasks)))
+            scaled = integer_costs(costs)
+            if scaled is not None:
+                return self._equipment_allocation_flow(equipment, tasks, costs, scaled[0], constraints)
+        return self._equipment_allocation_mip(equipment, tasks, cost_matrix, constraints, config)
+
+    def _equipment_allocation_flow(self, equipment, tasks, costs, int_costs, constraints) -> Dict[str, Any]:
+        infeasible = {"status": "INFEASIBLE", "solution": {}, "error": "No feasible assignment found"}
+        if "max_equipment_per_location" in constraints:
+            # Each task is assigned exactly once, so a location receives one assignment per task
+            per_location = {}
+            for t in tasks:
+                per_location[t['location']['id']] = per_location.get(t['location']['id'], 0) + 1
+            if max(per_location.values(), default=0) > constraints["max_equipment_per_location"]:
+                return {**infeasible, "engine": "min_cost_flow"}
+        allowed = np.ones(costs.shape, dtype=bool)
+        eq_pos = {eq['id']: r for r, eq in enumerate(equipment)}
+        task_pos = {t['id']: c for c, t in enumerate(tasks)}
+        for restriction in constraints.get("assignment_restrictions", []):
+            r, c = eq_pos.get(restriction.get("equipment_id")), task_pos.get(restriction.get("task_id"))
+            if r is not None and c is not None:
+                allowed[r, c] = False
+        lower = [int(constraints.get("min_tasks_per_equipment", 0))] * len(equipment)
+        used, assignment = solve_transportation(int_costs, allowed, [len(tasks)] * len(equipment), lower)
+        if assignment is None:
+            return {**infeasible, "engine": used}
+        return {
+            "status": "OPTIMAL",
+            "solution": {
+                "assignments": [{"equipment_id": equipment[r]['id'], "task_id": t['id']}
+                                for t, r in zip(tasks, assignment.tolist())],
+                "engine": used
+            },
+            "objective_value": float(costs[assignment, np.arange(len(tasks))].sum())
+        }
+
+    def _equipment_allocation_mip(self, equipment, tasks, cost_matrix, constraints, config=None) -> Dict[str, Any]:
+        solver = pywraplp.Solver.CreateSolver('SCIP')
         # Variables: assign[(eq, t)] = 1 if equipment eq assigned to task t
         assign = {}
         for eq in equipment:
@@ -826,10 +1776,11 @@ class SolverService:
             solver.Add(sum(assign[(eq['id'], t['id'])] for eq in equipment) == 1)
         # Max equipment per location
         if "max_equipment_per_location" in constraints:
-            for loc in set(t['location']['id'] for t in tasks):
-                solver.Add(
-                    sum(assign[(eq['id'], t['id'])] for eq in equipment for t in tasks if t['location']['id'] == loc) <= constraints["max_equipment_per_location"]
-                )
+            by_location = {}
+            for t in tasks:
+                by_location.setdefault(t['location']['id'], []).extend(assign[(eq['id'], t['id'])] for eq in equipment)
+            for loc_vars in by_location.values():
+                solver.Add(solver.Sum(loc_vars) <= constraints["max_equipment_per_location"])
         # Min tasks per equipment
         if "min_tasks_per_equipment" in constraints:
             for eq in equipment:
@@ -846,18 +1797,21 @@ class SolverService:
         objective = solver.Objective()
         for eq in equipment:
             for t in tasks:
-                objective.SetCoefficient(assign[(eq['id'], t['id'])], cost_matrix[eq['id']][t['id']])
+                objective.SetCoefficient(assign[(eq['id'], t['id'])], float(cost_matrix[eq['id'], t['id']]))
         objective.SetMinimization()
-        status = solver.Solve()
+        status, raced = self._solve_linear(solver, config, "equipment_allocation")
         if status == pywraplp.Solver.OPTIMAL:
             assignments = []
             for eq in equipment:
                 for t in tasks:
                     if assign[(eq['id'], t['id'])].solution_value() > 0.5:
                         assignments.append({"equipment_id": eq['id'], "task_id": t['id']})
+            solution = {"assignments": assignments, "engine": "mip"}
+            if raced:
+                solution["race"] = raced
             return {
                 "status": "OPTIMAL",
-                "solution": {"assignments": assignments},
+                "solution": solution,
                 "objective_value": objective.Value()
             }
         else:
@@ -872,7 +1826,7 @@ class SolverService:
         deliveries = data["deliveries"]
         locations = data["locations"]
         time_windows = data["time_windows"]
-        distance_matrix = data["distance_matrix"]
+        distance_matrix = np.asarray(data["distance_matrix"])
         constraints = data["constraints"]
         num_vehicles = len(vehicles)
         depot = 0  # Assume first location is depot
@@ -883,7 +1837,7 @@ class SolverService:
         def distance_callback(from_index, to_index):
             from_node = manager.IndexToNode(from_index)
             to_node = manager.IndexToNode(to_index)
-            return int(distance_matrix[from_node][to_node])
+            return int(distance_matrix[from_node, to_node])
         transit_callback_index = routing.RegisterTransitCallback(distance_callback)
         routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
         # Add time window constraints
@@ -938,275 +1892,905 @@ class SolverService:
 
     def _solve_risk_simulation(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Run Monte Carlo simulation and CPM for risk analysis (NumPy + custom logic).
-        """
-        import numpy as np
-        project_network = data["project_network"]
-        risk_factors = data["risk_factors"]
-        num_simulations = data.get("num_simulations", 1000)
-        # Build task duration distributions
-        task_durations = {}
-        for task in project_network:
-            rf = next((r for r in risk_factors if r["task_id"] == task["id"]), None)
-            if rf:
-                # Assume normal distribution for demo
-                mu, sigma = rf.get("mean", 1), rf.get("stddev", 0.1)
-                task_durations[task["id"]] = np.random.normal(mu, sigma, num_simulations)
-            else:
-                task_durations[task["id"]] = np.ones(num_simulations)
-        # CPM simulation
-        results = []
-        for sim in range(num_simulations):
-            # Build a dict of task finish times
-            finish_times = {}
-            for task in project_network:
-                preds = task.get("predecessors", [])
-                pred_finish = max([finish_times.get(pid, 0) for pid in preds], default=0)
-                finish_times[task["id"]] = pred_finish + task_durations[task["id"]][sim]
-            project_duration = max(finish_times.values())
-            results.append(project_duration)
+        Run Monte Carlo simulation and CPM for risk analysis (vectorized NumPy engine).
+        """
+        engine = MonteCarloEngine(data["project_network"], data["risk_factors"])
+        num_simulations = int(data.get("num_simulations", 1000))
+        if num_simulations < 1:
+            raise ValueError("num_simulations must be at least 1")
+        for option in ("chunk_size", "workers", "sketch_k"):
+            if data.get(option) is not None and int(data[option]) < 1:
+                raise ValueError(f"{option} must be at least 1")
+        criticality = data.get("criticality", True)
+        streaming = data.get("streaming")
+        if streaming is None:
+            streaming = num_simulations > STREAMING_THRESHOLD
+        if streaming:
+            return self._stream_risk_simulation(engine, num_simulations, data)
+        rng = np.random.default_rng(data.get("seed"))
+        results = np.empty(num_simulations)
+        critical_counts = np.zeros(len(engine.network), dtype=np.int64)
+        offset = 0
+        for durations, critical in engine.chunks(num_simulations, rng, data.get("chunk_size"), criticality):
+            results[offset:offset + len(durations)] = durations
+            offset += len(durations)
+            if critical is not None:
+                critical_counts += critical
         # Summarize risk profile
         risk_profile = {
             "mean": float(np.mean(results)),
             "stddev": float(np.std(results)),
+            "p50": float(np.percentile(results, 50)),
             "p90": float(np.percentile(results, 90)),
             "p95": float(np.percentile(results, 95)),
             "histogram": np.histogram(results, bins=20)[0].tolist()
         }
+        solution = {"risk_profile": risk_profile}
+        if criticality:
+            solution["criticality_index"] = {
+                tid: float(count) / num_simulations
+                for tid, count in zip(engine.network.ids, critical_counts)
+            }
+        return {
+            "status": "SUCCESS",
+            "solution": solution
+        }
+    def _stream_risk_simulation(self, engine: MonteCarloEngine, num_simulations: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Risk simulation with mergeable streaming summaries (KLL sketch, fixed-bin
+        histogram, running moments) so memory stays constant in num_simulations.
+        Sample ranges are split into `workers` shares, run on the service's
+        shared process pool (so at most one process per CPU) and merged at the end.
+        """
+        criticality = data.get("criticality", True)
+        chunk_size = data.get("chunk_size")
+        workers = max(1, int(data.get("workers") or 1))
+        k = int(data.get("sketch_k") or 512)
+        seeds = np.random.SeedSequence(data.get("seed")).spawn(workers + 1)
+        # A pilot chunk fixes the histogram range shared by every worker
+        pilot_n = min(num_simulations, chunk_size or engine.default_chunk_size)
+        pilot, pilot_critical = engine.run_chunk(np.random.default_rng(seeds[0]), pilot_n, criticality)
+        edges = histogram_range(pilot)
+        summary = RiskSummary(len(engine.network), edges, k=k, seed=int(seeds[0].generate_state(1)[0]))
+        summary.update(pilot, pilot_critical)
+        remaining = num_simulations - pilot_n
+        shares = [remaining // workers + (1 if i < remaining % workers else 0) for i in range(workers)]
+        jobs = [(n, seed) for n, seed in zip(shares, seeds[1:]) if n > 0]
+        if len(jobs) > 1:
+            pool = self._process_pool()
+            futures = [pool.submit(simulate_summary, engine, n, seed, edges, chunk_size, criticality, k)
+                       for n, seed in jobs]
+            for future in futures:
+                summary.merge(future.result())
+        else:
+            for n, seed in jobs:
+                summary.merge(simulate_summary(engine, n, seed, edges, chunk_size, criticality, k))
+        p50, p90, p95 = summary.sketch.quantiles([0.5, 0.9, 0.95])
+        risk_profile = {
+            "mean": summary.moments.mean,
+            "stddev": summary.moments.stddev,
+            "min": summary.moments.min,
+            "max": summary.moments.max,
+            "p50": float(p50),
+            "p90": float(p90),
+            "p95": float(p95),
+            "histogram": summary.histogram.counts.tolist(),
+            "histogram_edges": summary.histogram.edges.tolist(),
+            "underflow": summary.histogram.underflow,
+            "overflow": summary.histogram.overflow
+        }
+        solution = {"risk_profile": risk_profile, "mode": "streaming", "workers": workers}
+        if criticality:
+            solution["criticality_index"] = {
+                tid: float(count) / num_simulations
+                for tid, count in zip(engine.network.ids, summary.critical)
+            }
         return {
             "status": "SUCCESS",
-            "solution": {"risk_profile": risk_profile}
+            "solution": solution
         }
+
     # --- Construction Optimization Implementations ---
     def _solve_crew_allocation(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        crews = data.get('crews', [])
-        tasks = data.get('tasks', [])
-        priorities = data.get('priorities', {})
-        # Max hours per crew from availability and union rules
-        max_hours = {}
-        for crew in crews:
-            cid = crew.get('id')
-            avail = crew.get('availability', [])
-            total_avail = sum((w[1] - w[0]) for w in avail)
-            max_daily = None
-            for rule in data.get('union_rules', []):
-                if 'max_work_hours_per_day' in rule:
-                    max_daily = rule['max_work_hours_per_day']
-            cap = min(total_avail, max_daily) if max_daily is not None else total_avail
-            max_hours[cid] = int(cap)
-        model = cp_model.CpModel()
-        x = {}
-        for crew in crews:
-            c = crew.get('id')
-            skills = set(crew.get('skills', []))
-            for task in tasks:
-                t = task.get('id')
-                req = set(task.get('required_skills', []))
-                dur = int(task.get('duration', 0))
-                if req.issubset(skills):
-                    var = model.NewBoolVar(f'x_c{c}_t{t}')
-                    x[(c, t)] = (var, dur)
-        for task in tasks:
-            t = task.get('id')
-            model.Add(sum(var for (c2, t2), (var, _) in x.items() if t2 == t) == 1)
-        for crew in crews:
-            c = crew.get('id')
-            model.Add(sum(var * dur for (c2, t2), (var, dur) in x.items() if c2 == c) <= max_hours.get(c, 0))
-        objective = []
+        """
+        Crews and tasks split into the connected components of the
+        eligibility graph (no crew can work in two components), and each
+        component is its own CP-SAT model. Components are solved in process
+        unless ``solver_config.workers`` asks for more than one worker, or
+        (when unset) at least two components have ``COMPONENT_POOL_TASKS``
+        tasks; then they go to the service's shared process pool.
+        Per-component sizes and timings are reported.
+        """
+        config = data.get('solver_config') or {}
+        if config.get('engine') == 'lns':
+            return self._crew_allocation_lns(data)
+        crews, tasks = data.get('crews', []), data.get('tasks', [])
+        crew_label, task_label = eligibility_components(
+            eligibility_matrix([crew.get('skills', []) for crew in crews],
+                               [t.get('required_skills', []) for t in tasks]))
+        parts = []
+        for k in np.unique(task_label):
+            parts.append({**data, 'crews': [crews[i] for i in np.flatnonzero(crew_label == k)],
+                          'tasks': [tasks[j] for j in np.flatnonzero(task_label == k)]})
+        if config.get('workers') is not None:
+            pooled = int(config['workers']) > 1 and len(parts) > 1
+        else:
+            pooled = sum(len(part['tasks']) >= COMPONENT_POOL_TASKS for part in parts) > 1
+        if pooled:
+            pool = self._process_pool()
+            futures = [pool.submit(run_subproblem, '_crew_allocation_component', part) for part in parts]
+            results = [future.result() for future in futures]
+        else:
+            results = [self._crew_allocation_component(part) for part in parts]
+        components = [{'crews': len(part['crews']), 'tasks': len(part['tasks']), 'status': result['status'],
+                       'seconds': result['seconds']} for part, result in zip(parts, results)]
+        failed = [part for part, result in zip(parts, results) if result['status'] != 'success']
+        if failed:
+            error = 'No feasible crew allocation'
+            if len(parts) > 1:
+                error += f" for tasks {[t.get('id') for part in failed for t in part['tasks']]}"
+            return {'status': 'infeasible', 'solution': {'components': components}, 'error': error}
+        sol = {'assignments': [a for result in results for a in result['solution']['assignments']],
+               'components': components}
+        reports = [result['solution']['replan'] for result in results if 'replan' in result['solution']]
+        if reports:
+            sol['replan'] = {'mode': reports[0]['mode'], 'hinted': sum(r['hinted'] for r in reports),
+                             'kept': sum(r['kept'] for r in reports),
+                             'changed': [e for r in reports for e in r['changed']]}
+        return {'status': 'success', 'solution': sol}
+
+    def _crew_allocation_component(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """One CP-SAT solve of a crew allocation; the result carries its wall time in ``seconds``."""
+        began = time.perf_counter()
+        model, x = self._build_crew_allocation(data)
+        stability = PlanStability(model, data.get('stability'))
+        crew_of = {a.get('task_id'): a.get('crew_id')
+                   for a in previous_entries(data.get('previous_solution'), 'assignments')}
         for (c, t), (var, _) in x.items():
-            site = next((tsk.get('site_id') for tsk in tasks if tsk.get('id') == t), None)
-            weight = priorities.get(site, 1)
-            objective.append(var * int(weight))
-        model.Maximize(sum(objective))
+            if t in crew_of:
+                stability.keep(t, var, crew_of[t] == c)
+        stability.apply()
         solver = cp_model.CpSolver()
         solver.parameters.max_time_in_seconds = 10
         status = solver.Solve(model)
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             assignments = [{'crew_id': c, 'task_id': t}
                            for (c, t), (var, _) in x.items() if solver.Value(var)]
-            return {'status': 'success', 'solution': {'assignments': assignments}}
-        return {'status': 'infeasible', 'solution': {}, 'error': 'No feasible crew allocation'}
+            sol = {'assignments': assignments}
+            if stability.active:
+                sol['replan'] = stability.report(solver.Value)
+            return {'status': 'success', 'solution': sol, 'seconds': time.perf_counter() - began}
+        return {'status': 'infeasible', 'solution': {}, 'error': 'No feasible crew allocation',
+                'seconds': time.perf_counter() - began}
 
-    def _solve_equipment_resource_planning(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        equipment = data.get('equipment', [])
+    def _crew_allocation_lns(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Large neighborhood search from a greedy assignment (see core/lns.py),
+        for instances too large for one CP-SAT solve. Tasks still uncovered
+        when the budget runs out are reported as infeasible.
+        """
+        problem = CrewAllocationLNS(data)
+        options = search_options(data.get('solver_config'))
+        pool = self._process_pool() if options['workers'] > 1 else None
+        plan, stats = large_neighborhood_search(problem, problem.greedy(), pool=pool, **options)
+        sol = {'assignments': [{'crew_id': c, 'task_id': t} for t, c in plan.items()], 'engine': 'lns', 'lns': stats}
+        unassigned = [t for t in problem.tasks if t not in plan]
+        if unassigned:
+            sol['unassigned'] = unassigned
+            return {'status': 'infeasible', 'solution': sol,
+                    'error': f'{len(unassigned)} tasks left unassigned by the neighborhood search'}
+        return {'status': 'success', 'solution': sol}
+
+    def _crew_allocation_subproblem(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Assign as much priority as fits; the neighborhood search's subproblem."""
+        model, x = self._build_crew_allocation(data, partial=True)
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = float((data.get('solver_config') or {}).get('time_limit', 10))
+        status = solver.Solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return {'status': 'infeasible', 'solution': {}}
+        assignments = [{'crew_id': c, 'task_id': t} for (c, t), (var, _) in x.items() if solver.Value(var)]
+        return {'status': 'success', 'solution': {'assignments': assignments}}
+
+    def _build_crew_allocation(self, data: Dict[str, Any], partial: bool = False):
+        """
+        Crew/task assignment model; returns the model and ``(crew, task) ->
+        (var, duration)``. With ``partial`` a task may stay unassigned.
+        """
+        crews = data.get('crews', [])
         tasks = data.get('tasks', [])
+        priorities = data.get('priorities', {})
+        max_daily = None
+        for rule in data.get('union_rules', []):
+            if 'max_work_hours_per_day' in rule:
+                max_daily = rule['max_work_hours_per_day']
         model = cp_model.CpModel()
         x = {}
-        for eq in equipment:
-            eid = eq.get('id')
-            for task in tasks:
-                tid = task.get('id')
-                x[(eid, tid)] = model.NewBoolVar(f'x_e{eid}_t{tid}')
-        for task in tasks:
-            tid = task.get('id')
-            model.Add(sum(x[(eid, tid)] for eid, _ in x if _ == tid) == 1)
-        for eq in equipment:
-            eid = eq.get('id')
-            for t1 in tasks:
-                for t2 in tasks:
-                    if t1.get('id') >= t2.get('id'):
+        by_task: Dict[Any, List[Any]] = {t.get('id'): [] for t in tasks}
+        required = [(t.get('id'), int(t.get('duration', 0)), int(priorities.get(t.get('site_id'), 1))) for t in tasks]
+        eligible = eligibility_matrix([crew.get('skills', []) for crew in crews],
+                                      [t.get('required_skills', []) for t in tasks])
+        objective_vars, objective_weights = [], []
+        for i, crew in enumerate(crews):
+            c = crew.get('id')
+            # Max hours per crew from availability and union rules
+            total_avail = sum((w[1] - w[0]) for w in crew.get('availability', []))
+            cap = min(total_avail, max_daily) if max_daily is not None else total_avail
+            load_vars, load_hours = [], []
+            for j in np.flatnonzero(eligible[i]):
+                t, dur, weight = required[j]
+                var = model.NewBoolVar(f'x_c{c}_t{t}')
+                x[(c, t)] = (var, dur)
+                by_task[t].append(var)
+                load_vars.append(var)
+                load_hours.append(dur)
+                objective_vars.append(var)
+                objective_weights.append(weight)
+            model.Add(cp_model.LinearExpr.WeightedSum(load_vars, load_hours) <= int(cap))
+        for t, vars_t in by_task.items():
+            if partial:
+                model.AddAtMostOne(vars_t)
+            else:
+                model.AddExactlyOne(vars_t)
+        model.Maximize(cp_model.LinearExpr.WeightedSum(objective_vars, objective_weights))
+        return model, x
+
+    def _solve_equipment_resource_planning(self, data: Dict[str, Any],
+                                           busy: Dict[Any, List[tuple]] = None) -> Dict[str, Any]:
+        """
+        Assign usage tasks to equipment with optional intervals.
+
+        Each task has one start/end shared by an optional interval per
+        equipment, and every equipment carries a no-overlap. A task occupies
+        its ``time_window`` unless it has a ``duration``, in which case it
+        may start anywhere inside the window (or the horizon). ``move_times``
+        between task sites become transition times on the pairs a sweep-line
+        finds close enough to need them. Identical equipment is used in
+        order and task ``j`` (by earliest start) may only go to the first
+        ``j + 1`` units of its group. ``solver_config`` engine ``"lns"``
+        improves the first solution by large neighborhood search instead.
+
+        ``busy`` maps equipment ids to ``(start, end, site)`` blocks already
+        planned on them (start None for untimed work); those units count as
+        used, and move times apply between their blocks and the tasks.
+        """
+        config = data.get('solver_config') or {}
+        if config.get('engine') == 'lns':
+            return self._equipment_resource_planning_lns(data)
+        equipment = data.get('equipment', [])
+        tasks = data.get('tasks', [])
+        horizon = int(data.get('time_horizon', 0) or 0)
+        move = np.asarray(data.get('move_times') if data.get('move_times') is not None else [])
+        site_index = {p.get('id'): i for i, p in enumerate(data.get('projects', []) or []) if isinstance(p, dict)}
+        model = cp_model.CpModel()
+        num_tasks = len(tasks)
+        eq_ids = [e.get('id') for e in equipment]
+        task_ids = [t.get('id') for t in tasks]
+        busy = busy or {}
+
+        def site_of(site):
+            # Row of ``move_times`` for a site id or index, None without one
+            if site is not None and move.ndim == 2 and move.size:
+                k = site_index.get(site, site)
+                if isinstance(k, (int, np.integer)) and 0 <= k < min(move.shape):
+                    return int(k)
+            return None
+
+        # Earliest start / latest end per task index; untimed tasks never conflict
+        es, le, timed, fixed = [0] * num_tasks, [0] * num_tasks, [False] * num_tasks, [False] * num_tasks
+        starts, ends, sizes, sites = [None] * num_tasks, [None] * num_tasks, [0] * num_tasks, [None] * num_tasks
+        for j, task in enumerate(tasks):
+            span = task_window(task, horizon)
+            if span is None:
+                continue
+            lo, hi, size = span
+            if lo + size > hi:
+                return {'status': 'infeasible', 'solution': {},
+                        'error': f'Task {task_ids[j]} does not fit inside its window and the time horizon'}
+            es[j], le[j], sizes[j], timed[j], fixed[j] = lo, hi, size, True, lo + size == hi
+            starts[j] = model.NewIntVar(lo, hi - size, f'start_{task_ids[j]}')
+            ends[j] = starts[j] + size
+            sites[j] = site_of(task.get('site_id', task.get('project_id')))
+        # Symmetry breaking: task rank by earliest start bounds the unit within a group
+        rank = {j: r for r, j in enumerate(sorted(range(num_tasks), key=lambda j: (es[j], j)))}
+        groups: Dict[str, List[int]] = {}
+        for i, eq in enumerate(equipment):
+            key = json.dumps({k: v for k, v in eq.items() if k != 'id'}, sort_keys=True, default=str)
+            groups.setdefault(key, []).append(i)
+        position = {i: p for members in groups.values() for p, i in enumerate(members)}
+        x: Dict[tuple, Any] = {}
+        by_task: List[List[Any]] = [[] for _ in tasks]
+        by_eq: List[List[int]] = [[] for _ in equipment]
+        by_interval: List[List[Any]] = [[] for _ in equipment]
+        # A previous plan or busy units tell identical units apart, so both skip the symmetry breaking
+        previous = {a.get('task_id'): a for a in previous_entries(data.get('previous_solution'), 'assignments')}
+        if previous or busy:
+            position = {i: 0 for i in position}
+            groups = {str(i): [i] for i in range(len(equipment))}
+        for j in range(num_tasks):
+            members = [i for i in range(len(equipment)) if position[i] <= rank[j]]
+            for i in members:
+                x[(i, j)] = model.NewBoolVar(f'x_e{eq_ids[i]}_t{task_ids[j]}')
+                by_eq[i].append(j)
+            by_task[j] = [x[(i, j)] for i in members]
+            model.AddExactlyOne(by_task[j])
+            if timed[j]:
+                for i, iv in zip(members, optional_copies(model, starts[j], sizes[j], by_task[j], f'iv_t{task_ids[j]}')):
+                    by_interval[i].append(iv)
+        blocks = [[(b, e, site_of(site)) for b, e, site in busy.get(eid, []) if b is not None] for eid in eq_ids]
+        for i, eid in enumerate(eq_ids):
+            by_interval[i] += [model.NewFixedSizeIntervalVar(b, e - b, f'busy_{eid}_{b}') for b, e, _ in blocks[i]]
+        for intervals in by_interval:
+            model.AddNoOverlap(intervals)
+        unit: Dict[int, Any] = {}
+
+        def unit_of(j):
+            # Integer unit index channelled from the assignment literals
+            if j not in unit:
+                unit[j] = model.NewIntVar(0, max(len(equipment) - 1, 0), f'unit_{task_ids[j]}')
+                members = [i for i in range(len(equipment)) if (i, j) in x]
+                model.Add(unit[j] == cp_model.LinearExpr.WeightedSum([x[(i, j)] for i in members], members))
+            return unit[j]
+
+        transition_pairs = 0
+        if move.ndim == 2 and move.size and move.max() > 0:
+            timed_idx = [j for j in range(num_tasks) if timed[j] and sites[j] is not None]
+            reach = [int(move[sites[j]].max()) for j in timed_idx]
+            for a, b in sweep_pairs([es[j] for j in timed_idx], [le[j] for j in timed_idx], reach):
+                a, b = timed_idx[a], timed_idx[b]
+                m_ab, m_ba = int(move[sites[a], sites[b]]), int(move[sites[b], sites[a]])
+                if m_ab == 0 and m_ba == 0:
+                    continue
+                if fixed[a] and fixed[b]:
+                    if es[a] < le[b] and es[b] < le[a]:
+                        continue  # overlapping: the no-overlap already separates them
+                    if le[a] + m_ab <= es[b] or le[b] + m_ba <= es[a]:
                         continue
-                    w1 = t1.get('time_window')
-                    w2 = t2.get('time_window')
-                    if w1 and w2 and not (w1[1] <= w2[0] or w2[1] <= w1[0]):
-                        model.Add(x[(eid, t1.get('id'))] + x[(eid, t2.get('id'))] <= 1)
-        used = {e.get('id'): model.NewBoolVar(f'u_{e.get("id")}') for e in equipment}
-        for eid in used:
-            for task in tasks:
-                tid = task.get('id')
-                model.Add(used[eid] >= x[(eid, tid)])
-        model.Minimize(sum(used.values()))
+                    # Too close for the move: never on the same unit
+                    model.Add(unit_of(a) != unit_of(b))
+                else:
+                    shared = [i for i in range(len(equipment)) if (i, a) in x and (i, b) in x]
+                    before = model.NewBoolVar(f'order_{task_ids[a]}_{task_ids[b]}')
+                    for i in shared:
+                        model.Add(starts[b] >= ends[a] + m_ab).OnlyEnforceIf([before, x[(i, a)], x[(i, b)]])
+                        model.Add(starts[a] >= ends[b] + m_ba).OnlyEnforceIf([before.Not(), x[(i, a)], x[(i, b)]])
+                transition_pairs += 1
+            # Moves to and from the busy blocks of the task's candidate units
+            for i in range(len(equipment)):
+                for b, e, site in blocks[i]:
+                    for j in by_eq[i]:
+                        if not timed[j] or site is None or sites[j] is None:
+                            continue
+                        m_in, m_out = int(move[site, sites[j]]), int(move[sites[j], site])
+                        if le[j] + m_out <= b or e + m_in <= es[j]:
+                            continue
+                        after = model.NewBoolVar(f'after_{eq_ids[i]}_{b}_{task_ids[j]}')
+                        model.Add(starts[j] >= e + m_in).OnlyEnforceIf([after, x[(i, j)]])
+                        model.Add(ends[j] + m_out <= b).OnlyEnforceIf([after.Not(), x[(i, j)]])
+                        transition_pairs += 1
+        used = [model.NewBoolVar(f'u_{eid}') for eid in eq_ids]
+        for i in range(len(equipment)):
+            if eq_ids[i] in busy:
+                model.Add(used[i] == 1)
+            elif by_eq[i]:
+                model.AddMaxEquality(used[i], [x[(i, j)] for j in by_eq[i]])
+            else:
+                model.Add(used[i] == 0)
+        for members in groups.values():
+            for a, b in zip(members, members[1:]):
+                model.AddImplication(used[b], used[a])
+        model.Minimize(sum(used))
+        # First-fit in start order as a hint; it already satisfies the symmetry breaking
+        units = sorted(range(len(equipment)), key=lambda i: (position[i], i))
+        free: Dict[int, tuple] = {}
+        first_fit: Dict[int, tuple] = {}  # task -> (unit, start)
+        for j in sorted(range(num_tasks), key=lambda j: (es[j], j)):
+            for i in units:
+                if (i, j) not in x:
+                    continue
+                if not timed[j]:
+                    first_fit[j] = (i, None)
+                    break
+                last_end, last_site = free.get(i, (es[j], None))
+                gap = int(move[last_site, sites[j]]) if last_site is not None and sites[j] is not None else 0
+                begin = max(es[j], last_end + gap)
+                if begin + sizes[j] <= le[j]:
+                    first_fit[j] = (i, begin)
+                    free[i] = (begin + sizes[j], sites[j])
+                    model.AddHint(starts[j], begin)
+                    break
+        for (i, j), var in x.items():
+            model.AddHint(var, first_fit.get(j, (None,))[0] == i)
+        for j, var in unit.items():
+            if j in first_fit:
+                model.AddHint(var, first_fit[j][0])
+        hinted_units = {i for i, _ in first_fit.values()} | {i for i, eid in enumerate(eq_ids) if eid in busy}
+        for i, var in enumerate(used):
+            model.AddHint(var, i in hinted_units)
+        stability = PlanStability(model, data.get('stability'))
+        for j, tid in enumerate(task_ids):
+            entry = previous.get(tid)
+            if entry is None:
+                continue
+            for i in range(len(equipment)):
+                if (i, j) in x:
+                    stability.keep(tid, x[(i, j)], eq_ids[i] == entry.get('equipment_id'))
+            if timed[j] and entry.get('start') is not None:
+                stability.keep(tid, starts[j], entry['start'])
+        if previous:
+            was_used = {a.get('equipment_id') for a in previous.values()}
+            for i, var in enumerate(used):
+                stability.hint(var, eq_ids[i] in was_used)
+        stability.apply()
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 10
+        solver.parameters.max_time_in_seconds = float(config.get('time_limit', 10))
+        # Identical units are already ordered above; skip the costly symmetry detection and probing
+        solver.parameters.symmetry_level = 0
+        solver.parameters.cp_model_probing_level = 0
         status = solver.Solve(model)
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-            sol = {
-                'assignments': [{'equipment_id': eid, 'task_id': tid}
-                                for (eid, tid), var in x.items() if solver.Value(var)],
-                'equipment_used': [eid for eid, var in used.items() if solver.Value(var)]
-            }
-            return {'status': 'success', 'solution': sol}
-        return {'status': 'infeasible', 'solution': {}, 'error': 'No feasible equipment plan'}
+            plan = {j: (i, solver.Value(starts[j]) if timed[j] else None)
+                    for (i, j), var in x.items() if solver.Value(var)}
+            units_used = [i for i, var in enumerate(used) if solver.Value(var)]
+        elif len(first_fit) == num_tasks and not stability.pinned and not busy:
+            # Search ran out of time before improving on the first-fit plan
+            plan, units_used = first_fit, sorted(hinted_units)
+        else:
+            return {'status': 'infeasible', 'solution': {}, 'error': 'No feasible equipment plan'}
+        assignments = []
+        for j, (i, begin) in sorted(plan.items()):
+            entry = {'equipment_id': eq_ids[i], 'task_id': task_ids[j]}
+            if begin is not None:
+                entry['start'], entry['end'] = begin, begin + sizes[j]
+            assignments.append(entry)
+        sol = {
+            'assignments': assignments,
+            'equipment_used': [eq_ids[i] for i in units_used],
+            'optimal': status == cp_model.OPTIMAL,
+            'transition_pairs': transition_pairs
+        }
+        if stability.active and status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            sol['replan'] = stability.report(solver.Value)
+        return {'status': 'success', 'solution': sol}
+
+    def _equipment_resource_planning_lns(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Large neighborhood search (see core/lns.py) from the first solution
+        found within ``start_time_limit`` seconds (the first-fit plan when
+        none is); subproblems re-solve the freed tasks only, around the
+        pinned ones.
+        """
+        config = {k: v for k, v in (data.get('solver_config') or {}).items() if k != 'engine'}
+        start = self._solve_equipment_resource_planning(
+            {**data, 'solver_config': {'time_limit': float(config.get('start_time_limit', 1))}})
+        if start['status'] != 'success':
+            return start
+        optimal = start['solution']['optimal']
+        # An optimal start leaves nothing to improve
+        problem = EquipmentPlanningLNS({**data, 'solver_config': config},
+                                       bound=-len(start['solution']['equipment_used']) if optimal else -1.0)
+        options = search_options(config)
+        pool = self._process_pool() if options['workers'] > 1 else None
+        plan, stats = large_neighborhood_search(problem, start['solution'], pool=pool, **options)
+        return {'status': 'success', 'solution': {**plan, 'optimal': optimal, 'engine': 'lns', 'lns': stats}}
+
+    def _equipment_resource_planning_subproblem(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """The neighborhood search's subproblem: freed tasks around the ``busy`` blocks of the pinned ones."""
+        return self._solve_equipment_resource_planning({k: v for k, v in data.items() if k != 'busy'},
+                                                       busy=data['busy'])
 
     def _solve_subcontractor_scheduling(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Minimize makespan under precedences and subcontractor crew limits.
+
+        A task belongs to a subcontractor through its ``subcontractor_id``
+        or a contract's ``task_ids``. A subcontractor runs at most
+        ``capacity`` crews at once (its tightest contract, else its own
+        record, default 1), each task using ``crew_size`` crews (default 1).
+        A contract's ``start``/``end`` bound the tasks it covers. A CPM pass
+        over release times and deadlines fixes every start domain before
+        the model is built, so unreachable windows are reported unsolved.
+        """
         tasks = data.get('tasks', [])
-        horizon = data.get('time_horizon', 24)
+        network, durations, demands, es, ls, owner, capacity = subcontractor_windows(data)
+        ordered = network.tasks
+        issues = subcontractor_issues(network, demands, es, ls, owner, capacity)
+        if issues:
+            return {'status': 'infeasible', 'solution': {}, 'diagnosis': issues,
+                    'error': '; '.join(issue['message'] for issue in issues)}
+
         model = cp_model.CpModel()
-        starts, ends = {}, {}
-        for task in tasks:
-            tid = task.get('id')
-            dur = int(task.get('duration', 0))
-            est = int(task.get('earliest_start', 0))
-            let = int(task.get('latest_end', horizon))
-            start = model.NewIntVar(est, let - dur, f'start_{tid}')
-            end = model.NewIntVar(est + dur, let, f'end_{tid}')
-            model.Add(end == start + dur)
-            starts[tid], ends[tid] = start, end
-        for task in tasks:
-            tid = task.get('id')
-            for pred in task.get('predecessors', []):
-                model.Add(starts[tid] >= ends.get(pred, 0))
-        makespan = model.NewIntVar(0, horizon, 'makespan')
-        model.AddMaxEquality(makespan, list(ends.values()))
+        starts, ends = [], []
+        by_sub: Dict[Any, List[int]] = {}
+        intervals = []
+        for i, t in enumerate(ordered):
+            d = int(durations[i])
+            start = model.NewIntVar(int(es[i]), int(ls[i]), f"start_{t['id']}")
+            end = model.NewIntVar(int(es[i]) + d, int(ls[i]) + d, f"end_{t['id']}")
+            intervals.append(model.NewIntervalVar(start, d, end, f"iv_{t['id']}"))
+            starts.append(start); ends.append(end)
+            if t['id'] in owner:
+                by_sub.setdefault(owner[t['id']], []).append(i)
+        # Precedences already implied by the CPM windows are left out
+        for i, preds in enumerate(network.predecessors):
+            for p in preds.tolist():
+                if ls[p] + durations[p] > es[i]:
+                    model.Add(starts[i] >= ends[p])
+        for sub, members in by_sub.items():
+            if sum(demands[i] for i in members) > capacity.get(sub, 1):
+                model.AddCumulative([intervals[i] for i in members], [demands[i] for i in members], capacity.get(sub, 1))
+        lower = int((es + durations).max(initial=0))
+        upper = int((ls + durations).max(initial=0))
+        makespan = model.NewIntVar(lower, max(lower, upper), 'makespan')
+        model.AddMaxEquality(makespan, [ends[i] for i in network.sinks.tolist()] or [0])
         model.Minimize(makespan)
+
+        serial = self._subcontractor_serial_schedule(network, durations, es, ls, demands, owner, capacity)
+        if serial is not None:
+            for i, begin in enumerate(serial):
+                model.AddHint(starts[i], begin)
+        stability = PlanStability(model, data.get('stability'))
+        for entry in previous_entries(data.get('previous_solution'), 'schedule'):
+            i = network.index.get(entry.get('task_id'))
+            if i is not None and entry.get('start') is not None:
+                stability.keep(entry['task_id'], starts[i], entry['start'])
+                stability.hint(ends[i], int(entry['start']) + int(durations[i]))
+        stability.apply()
         solver = cp_model.CpSolver()
         solver.parameters.max_time_in_seconds = 10
         status = solver.Solve(model)
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-            schedule = [{'task_id': tid,
-                         'start': solver.Value(starts[tid]),
-                         'end': solver.Value(ends[tid])}
-                        for tid in starts]
-            return {'status': 'success', 'solution': {'makespan': solver.Value(makespan), 'schedule': schedule}}
-        return {'status': 'infeasible', 'solution': {}, 'error': 'No feasible schedule'}
+            plan = [solver.Value(start) for start in starts]
+        elif serial is not None and status != cp_model.INFEASIBLE and not stability.pinned:
+            plan = serial
+        else:
+            return {'status': 'infeasible', 'solution': {}, 'error': 'No feasible schedule'}
+        schedule = []
+        for t in tasks:
+            i = network.index[t['id']]
+            entry = {'task_id': t['id'], 'start': int(plan[i]), 'end': int(plan[i] + durations[i])}
+            if t['id'] in owner:
+                entry['subcontractor_id'] = owner[t['id']]
+            schedule.append(entry)
+        sol = {
+            'makespan': max((e['end'] for e in schedule), default=0),
+            'schedule': schedule,
+            'optimal': status == cp_model.OPTIMAL,
+            'lower_bound': lower
+        }
+        if stability.active and status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            sol['replan'] = stability.report(solver.Value)
+        return {'status': 'success', 'solution': sol}
+
+    def _subcontractor_serial_schedule(self, network, durations, es, ls, demands, owner, capacity):
+        """
+        Serial schedule generation: ready tasks in order of latest start,
+        each placed at the first time after its predecessors where its
+        subcontractor has free crews for the whole duration. Returns starts
+        in network order, or None if some task would miss its latest start.
+        """
+        length = int((ls + durations).max(initial=0)) + 1
+        usage: Dict[Any, np.ndarray] = {}
+        finish = np.zeros(len(network), dtype=np.int64)
+        plan = [0] * len(network)
+        pending = [len(preds) for preds in network.predecessors]
+        ready = [(int(ls[i]), i) for i, n in enumerate(pending) if n == 0]
+        heapq.heapify(ready)
+        while ready:
+            _, i = heapq.heappop(ready)
+            preds = network.predecessors[i]
+            t0, d = int(max(es[i], finish[preds].max())) if len(preds) else int(es[i]), int(durations[i])
+            sub = owner.get(network.ids[i])
+            if sub is not None and d > 0:
+                profile = usage.setdefault(sub, np.zeros(length, dtype=np.int64))
+                busy = np.concatenate([[0], np.cumsum(profile + demands[i] > capacity.get(sub, 1))])
+                free = np.flatnonzero(busy[t0 + d:] - busy[t0:length - d + 1] == 0) if t0 + d <= length else []
+                if len(free) == 0:
+                    return None
+                t0 = t0 + int(free[0])
+                profile[t0:t0 + d] += demands[i]
+            if t0 > ls[i]:
+                return None
+            plan[i], finish[i] = t0, t0 + d
+            for s in network.successors[i]:
+                pending[s] -= 1
+                if pending[s] == 0:
+                    heapq.heappush(ready, (int(ls[s]), s))
+        return plan
 
     def _solve_material_delivery_optimization(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Bin packing of deliveries onto the fewest vehicles. First-fit and
+        best-fit decreasing run first; the better packing seeds CP-SAT and
+        the volume and L2 bounds are posted on the vehicle count, so the
+        search stops as soon as it meets the bound. When a heuristic already
+        meets it, CP-SAT is skipped.
+        """
+        time_limit = 10
+        began = time.perf_counter()
         vehicles = data.get('vehicles', [])
         deliveries = data.get('deliveries', [])
-        model = cp_model.CpModel()
-        x = {}
-        for v in vehicles:
-            vid = v.get('id'); cap = int(v.get('capacity', 1))
-            for d in deliveries:
-                did = d.get('id'); qty = int(d.get('quantity', 1))
-                if qty <= cap:
-                    x[(vid, did)] = model.NewBoolVar(f'x_v{vid}_d{did}')
-        for d in deliveries:
-            did = d.get('id')
-            model.Add(sum(x[(vid, did)] for vid, _ in x if _ == did) == 1)
-        for v in vehicles:
-            vid = v.get('id'); cap = int(v.get('capacity', 1))
-            model.Add(sum(x[(vid, d.get('id'))] * int(d.get('quantity', 1))
-                          for d in deliveries if (vid, d.get('id')) in x) <= cap)
-        used = {v.get('id'): model.NewBoolVar(f'u_{v.get("id")}') for v in vehicles}
-        for vid in used:
-            for d in deliveries:
-                did = d.get('id')
-                if (vid, did) in x:
-                    model.Add(used[vid] >= x[(vid, did)])
-        model.Minimize(sum(used.values()))
+        capacities, quantities = delivery_loads(data)
+        lower_bound = packing_lower_bound(quantities, capacities)
+        heuristic, packing = None, None
+        for name, pack in (('first_fit_decreasing', first_fit_decreasing), ('best_fit_decreasing', best_fit_decreasing)):
+            candidate = pack(quantities, capacities)
+            if candidate is not None and (packing is None or len(set(candidate)) < len(set(packing))):
+                heuristic, packing = name, candidate
+        heuristic_count = len(set(packing)) if packing is not None else None
+
+        def respond(plan, optimal):
+            elapsed = time.perf_counter() - began
+            return {'status': 'success', 'solution': {
+                'assignments': [{'vehicle_id': vehicles[k].get('id'), 'delivery_id': d.get('id')}
+                                for d, k in zip(deliveries, plan)],
+                'vehicles_used': [vehicles[k].get('id') for k in sorted(set(plan))],
+                'vehicle_count': len(set(plan)),
+                'lower_bound': lower_bound,
+                'heuristic': {'method': heuristic, 'vehicle_count': heuristic_count},
+                'optimal': optimal,
+                'solve_seconds': elapsed,
+                # Relative to running out the time limit without a proof
+                'time_saved': max(0.0, time_limit - elapsed) if optimal else 0.0
+            }}
+
+        previous = {a.get('delivery_id'): a.get('vehicle_id')
+                    for a in previous_entries(data.get('previous_solution'), 'assignments')}
+        stable = previous and (data.get('stability') or {}).get('mode', 'hint') != 'hint'
+        if packing is not None and heuristic_count == lower_bound and not stable:
+            return respond(packing, True)
+        if lower_bound > len(vehicles):
+            return {'status': 'infeasible', 'solution': {}, 'error': 'No feasible delivery plan'}
+
+        model, x, used = self._build_material_delivery_optimization(data)
+        ids = [v.get('id') for v in vehicles]
+        # A used vehicle can always be swapped for an unused larger one, so
+        # only the largest vehicles need to be used, in capacity order. A
+        # previous plan may use any vehicles, so re-plans skip the ordering
+        if not previous:
+            by_size = sorted(range(len(vehicles)), key=lambda k: (-capacities[k], k))
+            for a, b in zip(by_size, by_size[1:]):
+                model.AddImplication(used[ids[b]], used[ids[a]])
+        model.Add(cp_model.LinearExpr.Sum(list(used.values())) >= lower_bound)
+        if packing is not None:
+            hinted = {(ids[k], d.get('id')) for d, k in zip(deliveries, packing)}
+            for key, var in x.items():
+                model.AddHint(var, key in hinted)
+            for k, vid in enumerate(ids):
+                model.AddHint(used[vid], k in set(packing))
+        stability = PlanStability(model, data.get('stability'))
+        for (vid, did), var in x.items():
+            if did in previous:
+                stability.keep(did, var, previous[did] == vid)
+        if previous:
+            for vid, var in used.items():
+                stability.hint(var, vid in set(previous.values()))
+        stability.apply()
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 10
+        solver.parameters.max_time_in_seconds = time_limit
+        # Dual reductions in presolve would otherwise discard the heuristic packing
+        solver.parameters.keep_all_feasible_solutions_in_presolve = True
         status = solver.Solve(model)
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-            assignments = [{'vehicle_id': vid, 'delivery_id': did}
-                           for (vid, did), var in x.items() if solver.Value(var)]
-            vehicles_used = [vid for vid, var in used.items() if solver.Value(var)]
-            return {'status': 'success', 'solution': {'assignments': assignments, 'vehicles_used': vehicles_used}}
+            position = {vid: k for k, vid in enumerate(ids)}
+            vehicle_of = {did: position[vid] for (vid, did), var in x.items() if solver.Value(var)}
+            result = respond([vehicle_of[d.get('id')] for d in deliveries], status == cp_model.OPTIMAL)
+            if stability.active:
+                result['solution']['replan'] = stability.report(solver.Value)
+            return result
+        if packing is not None and status != cp_model.INFEASIBLE and not stability.pinned:
+            return respond(packing, False)
         return {'status': 'infeasible', 'solution': {}, 'error': 'No feasible delivery plan'}
 
+    def _build_material_delivery_optimization(self, data: Dict[str, Any]):
+        """Delivery/vehicle assignment model; returns the model, assignment and vehicle-used literals."""
+        vehicles = data.get('vehicles', [])
+        deliveries = [(d.get('id'), int(d.get('quantity', 1))) for d in data.get('deliveries', [])]
+        model = cp_model.CpModel()
+        x, used = {}, {}
+        by_delivery: Dict[Any, List[Any]] = {did: [] for did, _ in deliveries}
+        for v in vehicles:
+            vid = v.get('id'); cap = int(v.get('capacity', 1))
+            used[vid] = model.NewBoolVar(f'u_{vid}')
+            load_vars, load_qty = [], []
+            for did, qty in deliveries:
+                if qty <= cap:
+                    var = model.NewBoolVar(f'x_v{vid}_d{did}')
+                    x[(vid, did)] = var
+                    by_delivery[did].append(var)
+                    load_vars.append(var)
+                    load_qty.append(qty)
+                    model.AddImplication(var, used[vid])
+            model.Add(cp_model.LinearExpr.WeightedSum(load_vars, load_qty) <= cap)
+        for did, vars_d in by_delivery.items():
+            model.AddExactlyOne(vars_d)
+        model.Minimize(cp_model.LinearExpr.Sum(list(used.values())))
+        return model, x, used
+
     def _solve_portfolio_balancing(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        One capacity row with unit sizes and box bounds: solved exactly by a
+        greedy pass over the weights unless ``solver_config.engine == "mip"``.
+        """
         sites = data.get('sites', [])
         resources = data.get('resources', [])
         weights = data.get('weights', {})
         constr = data.get('constraints', {})
         total_res = sum(int(r.get('count', 0)) for r in resources)
+        ids = [site.get('id') for site in sites]
+        lower = [int(constr.get('min_allocations', {}).get(sid, 0)) for sid in ids]
+        upper = [int(constr.get('max_allocations', {}).get(sid, total_res)) for sid in ids]
+        gains = [float(weights.get(sid, 1.0)) for sid in ids]
+        infeasible = {'status': 'infeasible', 'solution': {}, 'error': 'No feasible portfolio allocation'}
+        if (data.get('solver_config') or {}).get('engine', 'auto') != 'mip':
+            alloc = portfolio_greedy(gains, lower, upper, total_res)
+            if alloc is None:
+                return infeasible
+            sol = {sid: int(n) for sid, n in zip(ids, alloc)}
+            return {'status': 'success', 'solution': {'allocations': sol, 'engine': 'greedy'}}
         solver = pywraplp.Solver.CreateSolver('SCIP')
-        alloc = {}
-        for site in sites:
-            sid = site.get('id')
-            lo = int(constr.get('min_allocations', {}).get(sid, 0))
-            hi = int(constr.get('max_allocations', {}).get(sid, total_res))
-            alloc[sid] = solver.IntVar(lo, hi, f'x_{sid}')
-        solver.Add(sum(alloc.values()) <= total_res)
+        alloc = [solver.IntVar(lo, hi, f'x_{sid}') for sid, lo, hi in zip(ids, lower, upper)]
+        solver.Add(sum(alloc) <= total_res)
         objective = solver.Objective()
-        for sid, var in alloc.items():
-            w = float(weights.get(sid, 1.0))
+        for var, w in zip(alloc, gains):
             objective.SetCoefficient(var, w)
         objective.SetMaximization()
         status = solver.Solve()
         if status in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
-            sol = {sid: int(var.solution_value()) for sid, var in alloc.items()}
-            return {'status': 'success', 'solution': {'allocations': sol}}
-        return {'status': 'infeasible', 'solution': {}, 'error': 'No feasible portfolio allocation'}
+            sol = {sid: int(var.solution_value()) for sid, var in zip(ids, alloc)}
+            return {'status': 'success', 'solution': {'allocations': sol, 'engine': 'mip'}}
+        return infeasible
 
     def _solve_change_order_impact(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        plan = data.get('original_plan', {})
+        """
+        Evaluate change orders incrementally against a cached baseline CPM pass;
+        only the downstream/upstream cones of the changed tasks are recomputed.
+        """
+        plan = data.get('original_plan') or {}
         changes = data.get('change_orders', [])
-        tasks = plan.get('tasks', [])
-        duration_map = {t.get('id'): int(t.get('duration', 0)) for t in tasks}
+        baseline_id, entry = self._cpm_baseline(plan, data.get('baseline_id'))
+        baseline = entry['baseline']
+        deltas = {}
         for ch in changes:
             tid = ch.get('task_id')
-            delta = int(ch.get('duration_delta', 0))
-            if tid in duration_map:
-                duration_map[tid] += delta
-        finish = {}
-        for t in tasks:
-            tid = t.get('id')
-            preds = t.get('predecessors', [])
-            pf = max(finish.get(p, 0) for p in preds) if preds else 0
-            finish[tid] = pf + duration_map.get(tid, 0)
-        makespan = max(finish.values()) if finish else 0
-        return {'status': 'success', 'solution': {'new_makespan': makespan}} 
+            deltas[tid] = deltas.get(tid, 0) + int(ch.get('duration_delta', 0))
+        solution = baseline.what_if(deltas)
+        solution['baseline_id'] = baseline_id
+        num_simulations = int(data.get('num_simulations') or 0)
+        if num_simulations > 0:
+            solution['simulation'] = self._simulate_change_orders(entry, changes, num_simulations, data.get('seed'))
+        return {'status': 'success', 'solution': solution}
+
+    def _cpm_baseline(self, plan: Dict[str, Any], baseline_id: str = None):
+        """Look up or compile the baseline CPM pass for a plan (LRU cached)."""
+        with self._cache_lock:
+            if baseline_id in self._cpm_baselines:
+                self._cpm_baselines.move_to_end(baseline_id)
+                return baseline_id, self._cpm_baselines[baseline_id]
+        if not plan.get('tasks') and baseline_id:
+            raise ValueError(f"Unknown baseline_id {baseline_id}; send original_plan")
+        key = hashlib.sha1(json.dumps(plan, sort_keys=True, default=str).encode()).hexdigest()
+        with self._cache_lock:
+            entry = self._cpm_baselines.get(key)
+        if entry is None:
+            # Compiled outside the lock; a concurrent request compiling the same plan keeps the first copy
+            entry = {'baseline': CPMBaseline(plan.get('tasks', [])),
+                     'risk_factors': plan.get('risk_factors', []), 'engine': None}
+        with self._cache_lock:
+            entry = self._cpm_baselines.setdefault(key, entry)
+            self._cpm_baselines.move_to_end(key)
+            while len(self._cpm_baselines) > CPM_BASELINE_CACHE_SIZE:
+                self._cpm_baselines.popitem(last=False)
+        return key, entry
+
+    def _simulate_change_orders(self, entry: Dict[str, Any], changes: List[Dict[str, Any]],
+                                num_simulations: int, seed: int = None) -> Dict[str, Any]:
+        """
+        Vectorized Monte Carlo over the changed plan. Plan tasks may carry
+        `risk_factors`; change orders may give their delta a distribution.
+        """
+        baseline = entry['baseline']
+        network = baseline.network
+        if entry['engine'] is None:
+            engine = MonteCarloEngine(network.tasks, entry['risk_factors'], network=network, default_duration=0)
+            with self._cache_lock:
+                entry['engine'] = entry['engine'] or engine
+        engine = entry['engine']
+        delta_draws = []
+        for ch in changes:
+            if ch.get('task_id') not in network.index:
+                continue
+            delta = ch.get('duration_delta', 0)
+            stochastic = 'distribution' in ch or 'stddev' in ch
+            kind, params = parse_distribution({**ch, 'mean': delta} if stochastic else None, delta)
+            delta_draws.append((network.index[ch['task_id']], kind, np.array(params, dtype=np.float64)[:, None]))
+        rng = np.random.default_rng(seed)
+        results = np.empty(num_simulations)
+        offset = 0
+        while offset < num_simulations:
+            n = min(engine.default_chunk_size, num_simulations - offset)
+            durations = engine.sample(rng, n)
+            for row, kind, p in delta_draws:
+                durations[row] += draw_samples(rng, kind, p, (1, n))[0]
+            np.maximum(durations, 0, out=durations)
+            if len(network):
+                results[offset:offset + n] = forward_pass(network, durations)[network.sinks].max(axis=0)
+            else:
+                results[offset:offset + n] = 0
+            offset += n
+        return {
+            'num_simulations': num_simulations,
+            'mean': float(results.mean()),
+            'stddev': float(results.std()),
+            'p50': float(np.percentile(results, 50)),
+            'p90': float(np.percentile(results, 90)),
+            'p95': float(np.percentile(results, 95)),
+            'prob_delay': float((results > baseline.makespan).mean())
+        }
 
     def _solve_compliance_planning(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Schedule tasks around blackout windows with interval variables.
+
+        Blackouts are merged once and cut out of each task's start domain
+        (one domain per distinct duration). ``constraints.crews`` (or
+        ``capacity``) limits concurrent work: 1 gives a no-overlap over the
+        tasks and the blackouts as fixed intervals, more gives a cumulative
+        with per-task ``crew_size`` demands; unlimited by default.
+        """
         tasks = data.get('tasks', [])
-        blacks = data.get('blackout_windows', [])
-        horizon = data.get('constraints', {}).get('time_horizon', max((bw[1] for bw in blacks), default=24))
+        constraints = data.get('constraints', {}) or {}
+        blackouts = merge_windows(data.get('blackout_windows', []))
+        horizon = int(constraints.get('time_horizon', max((e for _, e in blackouts), default=24)))
+        capacity = constraints.get('crews', constraints.get('capacity'))
         model = cp_model.CpModel()
-        starts, ends = {}, {}
+        domains: Dict[int, Any] = {}
+        starts, ends, intervals, demands = {}, {}, [], []
         for t in tasks:
             tid = t.get('id')
             dur = int(t.get('duration', 0))
-            start = model.NewIntVar(0, horizon, f'start_{tid}')
+            if dur not in domains:
+                domains[dur] = allowed_start_domain(blackouts, dur, horizon)
+            if domains[dur].IsEmpty():
+                return {'status': 'infeasible', 'solution': {},
+                        'error': f'Task {tid} cannot be placed within the horizon outside blackout windows'}
+            start = model.NewIntVarFromDomain(domains[dur], f'start_{tid}')
             end = model.NewIntVar(0, horizon, f'end_{tid}')
-            model.Add(end == start + dur)
+            intervals.append(model.NewIntervalVar(start, dur, end, f'task_{tid}'))
+            demands.append(int(t.get('crew_size', 1)))
             starts[tid], ends[tid] = start, end
-            for bw in blacks:
-                bw_s, bw_e = int(bw[0]), int(bw[1])
-                b = model.NewBoolVar(f'bw_{tid}_{bw_s}_{bw_e}')
-                model.Add(end <= bw_s).OnlyEnforceIf(b)
-                model.Add(start >= bw_e).OnlyEnforceIf(b.Not())
+        if capacity is not None:
+            capacity = int(capacity)
+            fixed = [model.NewFixedSizeIntervalVar(s, e - s, f'blackout_{s}_{e}') for s, e in blackouts]
+            if capacity == 1 and all(d <= 1 for d in demands):
+                model.AddNoOverlap(intervals + fixed)
+            else:
+                model.AddCumulative(intervals + fixed, demands + [capacity] * len(fixed), capacity)
         makespan = model.NewIntVar(0, horizon, 'makespan')
         model.AddMaxEquality(makespan, list(ends.values()))
         model.Minimize(makespan)
+        stability = PlanStability(model, data.get('stability'))
+        for entry in previous_entries(data.get('previous_solution'), 'schedule'):
+            tid = entry.get('task_id')
+            if tid in starts and entry.get('start') is not None:
+                stability.keep(tid, starts[tid], entry['start'])
+                if entry.get('end') is not None:
+                    stability.hint(ends[tid], entry['end'])
+        stability.apply()
         solver = cp_model.CpSolver()
         solver.parameters.max_time_in_seconds = 10
         status = solver.Solve(model)
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             schedule = [{'task_id': tid, 'start': solver.Value(starts[tid]), 'end': solver.Value(ends[tid])}
                         for tid in starts]
-            return {'status': 'success', 'solution': {'makespan': solver.Value(makespan), 'schedule': schedule}}
+            sol = {
+                'makespan': solver.Value(makespan),
+                'schedule': schedule,
+                'blackout_windows': [list(w) for w in blackouts]
+            }
+            if stability.active:
+                sol['replan'] = stability.report(solver.Value)
+            return {'status': 'success', 'solution': sol}
         return {'status': 'infeasible', 'solution': {}, 'error': 'No feasible compliance schedule'}
 
     def build_model(self, request: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,37 @@
+from typing import Dict, Hashable, List, Sequence
+
+from ortools.sat.python import cp_model
+
+def interchangeable_groups(keys: Sequence[Hashable]) -> List[List[int]]:
+    """
+    Indices sharing a key, in input order, for every key held by more than
+    one item. Items with equal keys have identical variables, constraints
+    and objective terms, so any permutation within a group maps solutions
+    to solutions.
+    """
+    groups: Dict[Hashable, List[int]] = {}
+    for i, key in enumerate(keys):
+        groups.setdefault(key, []).append(i)
+    return [members for members in groups.values() if len(members) > 1]
+
+def add_lex_geq(model: cp_model.CpModel, a: Sequence[cp_model.IntVar], b: Sequence[cp_model.IntVar],
+                name: str) -> None:
+    """
+    Constrain the Boolean vector ``a`` to be lexicographically >= ``b``.
+
+    ``eq_k`` is true exactly when ``a`` and ``b`` agree on positions
+    ``0..k``; while the prefix agrees, ``a`` may not drop below ``b`` at the
+    next position. The encoding is linear in the vector length.
+    """
+    equal = []
+    for k, (x, y) in enumerate(zip(a, b)):
+        model.AddImplication(y, x).OnlyEnforceIf(equal)
+        if k == len(a) - 1:
+            break
+        nxt = model.NewBoolVar(f"{name}_eq_{k}")
+        if equal:
+            model.AddImplication(nxt, equal[0])
+        model.AddImplication(x, y).OnlyEnforceIf(nxt)
+        model.AddBoolOr([x, y, nxt]).OnlyEnforceIf(equal)
+        model.AddBoolOr([x.Not(), y.Not(), nxt]).OnlyEnforceIf(equal)
+        equal = [nxt]
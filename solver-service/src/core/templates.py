@@ -1,5 +1,6 @@
-from typing import Dict, Any, List
-from pydantic import BaseModel
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, conint
+from .matrix import Matrix
 
 class Location(BaseModel):
     id: int
@@ -39,12 +40,18 @@ class MaintenanceTask(BaseModel):
     required_parts: List[str]
     priority: int
 
+# Warm start for CP-SAT templates from an earlier solve (see core/replan.py)
+class ReplanOptions(BaseModel):
+    previous_solution: Optional[Dict[str, Any]] = None  # solution (or response) of the earlier solve
+    previous_job_id: Optional[str] = None               # or the job_id it returned (same process only)
+    stability: Optional[Dict[str, Any]] = None          # mode: "hint" | "penalize" | "fix", weight, free
+
 # FleetOps Templates
 class VehicleAssignmentRequest(BaseModel):
     vehicles: List[Vehicle]
     tasks: List[Task]
     locations: List[Location]
-    distance_matrix: List[List[float]]
+    distance_matrix: Matrix
     constraints: Dict[str, Any] = {
         "max_distance": float,
         "max_working_hours": float,
@@ -60,8 +67,9 @@ class FleetMixRequest(BaseModel):
         "min_vehicles": int,
         "max_vehicles": int
     }
+    solver_config: Optional[Dict[str, Any]] = None  # engine: "auto" | "mip" | "race"
 
-class MaintenanceScheduleRequest(BaseModel):
+class MaintenanceScheduleRequest(ReplanOptions):
     vehicles: List[Vehicle]
     maintenance_tasks: List[MaintenanceTask]
     maintenance_facilities: List[Location]
@@ -71,20 +79,23 @@ class MaintenanceScheduleRequest(BaseModel):
         "facility_capacity": List[int],
         "working_hours": List[Dict[str, Any]]
     }
+    solver_config: Optional[Dict[str, Any]] = None  # rolling_horizon: {window, overlap} in time slots
 
 class FuelOptimizationRequest(BaseModel):
     vehicles: List[Vehicle]
     routes: List[List[Location]]
     fuel_stations: List[Location]
     fuel_prices: List[float]
+    distance_matrix: Matrix
     constraints: Dict[str, Any] = {
         "min_fuel_level": float,
         "max_fuel_level": float,
-        "fuel_consumption_rate": float
+        "fuel_consumption_rate": float,
+        "max_detour": Optional[float]
     }
 
 # Workforce Management Templates
-class EmployeeScheduleRequest(BaseModel):
+class EmployeeScheduleRequest(ReplanOptions):
     employees: List[Driver]
     tasks: List[Task]
     time_horizon: int
@@ -94,6 +105,7 @@ class EmployeeScheduleRequest(BaseModel):
         "required_breaks": List[Dict[str, Any]],
         "skill_requirements": Dict[str, List[str]]
     }
+    solver_config: Optional[Dict[str, Any]] = None  # rolling_horizon: {window, overlap} in hours
 
 class TaskAssignmentRequest(BaseModel):
     employees: List[Driver]
@@ -105,6 +117,7 @@ class TaskAssignmentRequest(BaseModel):
         "skill_requirements": Dict[str, List[str]],
         "preferred_assignments": List[Dict[str, Any]]
     }
+    solver_config: Optional[Dict[str, Any]] = None  # engine: "auto" | "flow" | "mip"
 
 class BreakScheduleRequest(BaseModel):
     employees: List[Driver]
@@ -116,6 +129,7 @@ class BreakScheduleRequest(BaseModel):
         "max_work_before_break": float,
         "preferred_break_times": List[Dict[str, Any]]
     }
+    solver_config: Optional[Dict[str, Any]] = None  # engine: "auto" | "mip"
 
 class LaborCostRequest(BaseModel):
     employees: List[Driver]
@@ -128,6 +142,7 @@ class LaborCostRequest(BaseModel):
         "max_overtime": float,
         "skill_requirements": Dict[str, List[str]]
     }
+    solver_config: Optional[Dict[str, Any]] = None  # engine: "race", backends, time_limit
 
 class WorkforceCapacityRequest(BaseModel):
     employees: List[Driver]
@@ -139,6 +154,7 @@ class WorkforceCapacityRequest(BaseModel):
         "skill_requirements": Dict[str, List[str]],
         "hiring_costs": Dict[str, float]
     }
+    solver_config: Optional[Dict[str, Any]] = None  # engine: "auto" | "mip"
 
 class ShiftCoverageRequest(BaseModel):
     employees: List[Driver]
@@ -150,10 +166,11 @@ class ShiftCoverageRequest(BaseModel):
         "min_rest_between_shifts": float,
         "skill_requirements": Dict[str, List[str]]
     }
+    solver_config: Optional[Dict[str, Any]] = None  # engine: "mip" | "roster"
 
 # --- New World-Class OR Models ---
 
-class LaborSchedulingRequest(BaseModel):
+class LaborSchedulingRequest(ReplanOptions):
     employees: List[Driver]
     shifts: List[Dict[str, Any]]
     time_horizon: int
@@ -165,25 +182,27 @@ class LaborSchedulingRequest(BaseModel):
         "coverage_requirements": Dict[str, int]
     }
     objective: str = "minimize_cost"  # or "maximize_coverage"
+    solver_config: Optional[Dict[str, Any]] = None  # engine: "cp_sat" | "roster", rolling_horizon: {window, overlap} in days
 
 class EquipmentAllocationRequest(BaseModel):
     equipment: List[Dict[str, Any]]  # id, type, capacity, cost
     tasks: List[Task]
     locations: List[Location]
-    cost_matrix: List[List[float]]
+    cost_matrix: Matrix
     constraints: Dict[str, Any] = {
         "max_equipment_per_location": int,
         "min_tasks_per_equipment": int,
         "assignment_restrictions": List[Dict[str, Any]]
     }
     objective: str = "minimize_total_cost"
+    solver_config: Optional[Dict[str, Any]] = None  # engine: "auto" | "flow" | "mip" | "race"
 
 class MaterialDeliveryPlanningRequest(BaseModel):
     vehicles: List[Vehicle]
     deliveries: List[Task]  # Each task is a delivery
     locations: List[Location]
     time_windows: List[List[float]]
-    distance_matrix: List[List[float]]
+    distance_matrix: Matrix
     constraints: Dict[str, Any] = {
         "vehicle_capacity": float,
         "max_route_time": float,
@@ -196,35 +215,43 @@ class RiskSimulationRequest(BaseModel):
     risk_factors: List[Dict[str, Any]]  # e.g., distributions for durations
     num_simulations: int = 1000
     objective: str = "estimate_risk"
+    seed: Optional[int] = None           # RNG seed for reproducible runs
+    chunk_size: Optional[conint(gt=0)] = None  # samples per vectorized chunk
+    criticality: bool = True             # report per-task criticality indices
+    streaming: Optional[bool] = None     # constant-memory summaries; auto above 10^6 samples
+    workers: Optional[conint(gt=0)] = None     # processes for streaming runs
+    sketch_k: Optional[conint(gt=0)] = None    # KLL sketch accuracy parameter
 
 # --- Construction Optimization Use Cases ---
-class CrewAllocationRequest(BaseModel):
+class CrewAllocationRequest(ReplanOptions):
     crews: List[Dict[str, Any]]       # list of workers with skills, availability
     sites: List[Dict[str, Any]]       # work sites with requirements
     tasks: List[Dict[str, Any]]       # tasks to assign per site
     shifts: List[Dict[str, Any]]      # shift definitions (start, end, break rules)
     union_rules: List[Dict[str, Any]] # contractual and legal constraints
     priorities: Dict[int, int]        # site_id -> priority weight
+    solver_config: Optional[Dict[str, Any]] = None  # engine: "cp_sat" | "lns", time_limit, iterations, workers
 
-class EquipmentResourcePlanningRequest(BaseModel):
+class EquipmentResourcePlanningRequest(ReplanOptions):
     equipment: List[Dict[str, Any]]   # high-value assets with capacities
     projects: List[Dict[str, Any]]    # project sites and timelines
     tasks: List[Dict[str, Any]]       # equipment usage tasks per site
     time_horizon: int                 # planning horizon in days
-    move_times: List[List[float]]     # transport/setup times matrix
+    move_times: Matrix                # transport/setup times matrix
     constraints: Dict[str, Any]       # budget, max moves, etc.
+    solver_config: Optional[Dict[str, Any]] = None  # engine: "cp_sat" | "lns", time_limit, iterations, workers
 
-class SubcontractorScheduleRequest(BaseModel):
-    subcontractors: List[Dict[str, Any]]  # subcontractor entities
-    tasks: List[Dict[str, Any]]           # project tasks with dependencies
-    contracts: List[Dict[str, Any]]       # time windows and scopes
-    time_horizon: int                     # overall schedule horizon
+class SubcontractorScheduleRequest(ReplanOptions):
+    subcontractors: List[Dict[str, Any]] = []  # subcontractor entities with crew capacity
+    tasks: List[Dict[str, Any]]                # project tasks with dependencies
+    contracts: List[Dict[str, Any]] = []       # time windows, scopes and crew limits
+    time_horizon: int                          # overall schedule horizon
 
-class MaterialDeliveryOptimizationRequest(BaseModel):
+class MaterialDeliveryOptimizationRequest(ReplanOptions):
     deliveries: List[Dict[str, Any]]      # material drop-offs with qty, time windows
     vehicles: List[Dict[str, Any]]        # delivery vehicles
     storage: List[Dict[str, Any]]         # storage facilities with capacity
-    distance_matrix: List[List[float]]    # travel distances between locations
+    distance_matrix: Matrix               # travel distances between locations
     constraints: Dict[str, Any]           # inventory and site constraints
 
 class PortfolioBalancingRequest(BaseModel):
@@ -234,11 +261,13 @@ class PortfolioBalancingRequest(BaseModel):
     constraints: Dict[str, Any]           # min/max allocations, budgets
 
 class ChangeOrderImpactRequest(BaseModel):
-    original_plan: Dict[str, Any]         # prior schedule or resource plan
+    original_plan: Dict[str, Any] = {}    # prior schedule or resource plan
     change_orders: List[Dict[str, Any]]   # new scope changes
     num_simulations: int = 100            # Monte Carlo runs for impact
+    baseline_id: Optional[str] = None     # reuse a cached baseline instead of resending the plan (same process only)
+    seed: Optional[int] = None
 
-class CompliancePlanningRequest(BaseModel):
+class CompliancePlanningRequest(ReplanOptions):
     tasks: List[Dict[str, Any]]           # scheduled work tasks
     blackout_windows: List[List[float]]   # forbidden time intervals [start,end]
     constraints: Dict[str, Any]           # permit rules, noise curfews, etc.
\ No newline at end of file
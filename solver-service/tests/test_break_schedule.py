@@ -0,0 +1,46 @@
+import numpy as np
+from src.core.breaks import place_breaks, preference_deviation
+from src.core.solver import SolverService
+
+def _data(rng, employees, horizon, **constraints):
+    return {
+        "employees": [{"id": i, "name": f"e{i}", "skills": [], "max_hours": 8, "hourly_rate": 10,
+                       "availability": []} for i in range(employees)],
+        "tasks": [],
+        "time_horizon": horizon,
+        "constraints": {
+            "preferred_break_times": [{"employee_id": int(i), "time": float(rng.integers(0, horizon))}
+                                      for i in rng.integers(0, employees + 1, 2 * employees)],
+            **constraints,
+        },
+    }
+
+def test_preference_deviation_groups_by_employee():
+    deviation = preference_deviation([7, 8, 9], [{"employee_id": 8, "time": 5}, {"employee_id": 7, "time": 1},
+                                                 {"employee_id": 8, "time": 0}, {"employee_id": 3, "time": 2}], 6)
+    assert deviation.tolist() == [[1, 0, 1, 2, 3, 4], [0, 1, 2, 2, 1, 0], [0] * 6]
+
+def test_break_dp_matches_mip():
+    rng = np.random.default_rng(4)
+    for _ in range(40):
+        horizon = int(rng.integers(4, 16))
+        data = _data(rng, int(rng.integers(1, 4)), horizon,
+                     break_duration=int(rng.integers(0, 4)), min_work_before_break=int(rng.integers(0, 4)),
+                     max_work_before_break=int(rng.integers(1, horizon + 1)))
+        dp = SolverService()._solve_break_schedule(data)
+        mip = SolverService()._solve_break_schedule({**data, "solver_config": {"engine": "mip"}})
+        assert dp["status"] == mip["status"], data
+        if dp["status"] == "success":
+            assert dp["solution"]["engine"] == "dp"
+            assert abs(dp["solution"]["total_deviation"] - mip["solution"]["total_deviation"]) < 1e-6, data
+
+def test_place_breaks_covers_every_window():
+    rng = np.random.default_rng(9)
+    cost = rng.uniform(0, 10, (50, 60))
+    chosen = place_breaks(cost, 5, 3, 12)
+    assert chosen.shape == (50, 5) and (chosen >= 3).all() and (np.diff(chosen, axis=1) > 0).all()
+    taken = np.zeros((50, 60), dtype=bool)
+    np.put_along_axis(taken, chosen, True, axis=1)
+    windows = np.lib.stride_tricks.sliding_window_view(taken[:, 1:59], 12, axis=1)
+    assert windows.any(axis=2).all()
+    assert place_breaks(cost, 3, 3, 12) is None
@@ -0,0 +1,68 @@
+import numpy as np
+from fastapi.testclient import TestClient
+from src.api.routes import app
+from src.core.cpm import CPMBaseline
+
+client = TestClient(app)
+
+def _full_cpm(tasks, deltas):
+    """Reference CPM recomputed from scratch over the whole network."""
+    baseline = CPMBaseline([{**t, "duration": t["duration"] + deltas.get(t["id"], 0)} for t in tasks])
+    start = dict(zip(baseline.network.ids, baseline.start))
+    slack = {tid: baseline.makespan - s - tl for tid, s, tl in zip(baseline.network.ids, baseline.start, baseline.tail)}
+    return baseline.makespan, start, slack
+
+def test_incremental_matches_full_recompute():
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        n = 40
+        tasks = [{"id": i, "duration": int(rng.integers(0, 10)),
+                  "predecessors": [int(p) for p in rng.choice(i, size=min(i, int(rng.integers(0, 4))), replace=False)] if i else []}
+                 for i in range(n)]
+        rng.shuffle(tasks)
+        baseline = CPMBaseline(tasks)
+        base_makespan, base_start, base_slack = _full_cpm(tasks, {})
+        deltas = {int(t): int(rng.integers(-3, 8)) for t in rng.choice(n, size=3, replace=False)}
+        deltas = {t: max(d, -next(x["duration"] for x in tasks if x["id"] == t)) for t, d in deltas.items()}
+        result = baseline.what_if(deltas)
+        makespan, start, slack = _full_cpm(tasks, deltas)
+        assert result["new_makespan"] == makespan
+        listed = {d["task_id"]: d for d in result["task_deltas"]}
+        for tid in start:
+            if tid in listed:
+                assert listed[tid]["start_delta"] == start[tid] - base_start[tid]
+                assert listed[tid]["float_delta"] == slack[tid] - base_slack[tid]
+            else:
+                assert start[tid] == base_start[tid]
+                assert slack[tid] - base_slack[tid] == result["unlisted_float_delta"]
+        path = result["critical_path"]
+        assert path and all(slack[tid] == 0 for tid in path)
+
+def test_change_order_simulation_and_baseline_reuse():
+    plan = {"tasks": [
+        {"id": 3, "duration": 2, "predecessors": [2]},
+        {"id": 1, "duration": 3, "predecessors": []},
+        {"id": 2, "duration": 4, "predecessors": [1]},
+        {"id": 4, "duration": 1, "predecessors": [1]}
+    ]}
+    payload = {
+        "original_plan": plan,
+        "change_orders": [{"task_id": 4, "duration_delta": 2, "distribution": "triangular", "min": 0, "mode": 2, "max": 10}],
+        "num_simulations": 4000,
+        "seed": 1
+    }
+    response = client.post("/solve/change-order-impact", json=payload)
+    assert response.status_code == 200, response.text
+    sol = response.json()["solution"]
+    assert sol["baseline_makespan"] == 9 and sol["new_makespan"] == 9
+    assert sol["critical_path"] == [1, 2, 3]
+    sim = sol["simulation"]
+    # Task 4 has 5 units of float; P(delta > 5) = 25/80 for triangular(0, 2, 10)
+    assert abs(sim["prob_delay"] - 0.3125) < 0.03
+    reuse = client.post("/solve/change-order-impact", json={
+        "baseline_id": sol["baseline_id"],
+        "change_orders": [{"task_id": 2, "duration_delta": 1}],
+        "num_simulations": 0
+    })
+    assert reuse.status_code == 200, reuse.text
+    assert reuse.json()["solution"]["new_makespan"] == 10
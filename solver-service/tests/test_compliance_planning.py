@@ -0,0 +1,46 @@
+import time
+from fastapi.testclient import TestClient
+from src.api.routes import app
+from src.core.intervals import allowed_start_domain, merge_windows
+
+client = TestClient(app)
+
+def test_merge_windows_and_start_domain():
+    windows = merge_windows([[6, 8], [2, 4], [3, 5], [5, 6], [9, 9]])
+    assert windows == [(2, 8)]
+    # Duration 2 in horizon 12: may finish by 2 or start from 8
+    assert allowed_start_domain(windows, 2, 12).FlattenedIntervals() == [0, 0, 8, 10]
+    assert allowed_start_domain(windows, 9, 12).IsEmpty()
+
+def _overlaps(a, b):
+    return a["start"] < b["end"] and b["start"] < a["end"]
+
+def test_single_crew_serializes_tasks():
+    payload = {
+        "tasks": [{"id": i, "duration": 2} for i in range(3)],
+        "blackout_windows": [[2, 4]],
+        "constraints": {"time_horizon": 12, "crews": 1}
+    }
+    response = client.post("/solve/compliance-planning", json=payload)
+    assert response.status_code == 200, response.text
+    sol = response.json()["solution"]
+    assert sol["makespan"] == 8
+    schedule = sol["schedule"]
+    for i, a in enumerate(schedule):
+        assert not (a["start"] < 4 and a["end"] > 2)
+        assert not any(_overlaps(a, b) for b in schedule[i + 1:])
+
+def test_many_permit_windows_solve_quickly():
+    windows = [[10 * k + 7, 10 * k + 10] for k in range(200)]
+    payload = {
+        "tasks": [{"id": i, "duration": 1 + i % 5} for i in range(500)],
+        "blackout_windows": windows,
+        "constraints": {"time_horizon": 2000}
+    }
+    began = time.time()
+    response = client.post("/solve/compliance-planning", json=payload)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "success"
+    assert time.time() - began < 15
+    for ev in response.json()["solution"]["schedule"]:
+        assert all(not (ev["start"] < e and ev["end"] > s) for s, e in windows)
@@ -0,0 +1,92 @@
+import numpy as np
+from src.core.eligibility import SkillIndex, eligibility_components, eligibility_matrix, eligible_pairs
+from src.core.solver import SolverService
+
+def test_eligibility_matches_subset_check():
+    rng = np.random.default_rng(0)
+    skills = [f"s{i}" for i in range(150)]
+    workers = [list(rng.choice(skills, size=30, replace=False)) for _ in range(700)]
+    tasks = [list(rng.choice(skills, size=int(rng.integers(0, 3)), replace=False)) for _ in range(90)]
+    expected = np.array([[set(t) <= set(w) for t in tasks] for w in workers])
+    eligible = eligibility_matrix(workers, tasks)
+    assert np.array_equal(eligible, expected)
+    assert len(eligible_pairs(eligible)) == expected.sum()
+    index = SkillIndex(workers)
+    assert np.array_equal(index.has_skill(index.encode(workers), "s7"), [("s7" in w) for w in workers])
+    assert not index.has_skill(index.encode(workers), "unknown").any()
+
+def _employee(i, skills):
+    return {"id": i, "name": f"e{i}", "skills": skills, "max_hours": 8, "hourly_rate": 10 + i, "availability": []}
+
+def _task(i, skills):
+    location = {"id": 0, "latitude": 0.0, "longitude": 0.0}
+    return {"id": i, "location": location, "duration": 2, "required_skills": skills, "priority": 1, "time_window": [0, 8]}
+
+def test_task_assignment_only_uses_eligible_employees():
+    data = {
+        "employees": [_employee(0, ["crane"]), _employee(1, ["weld", "crane"]), _employee(2, [])],
+        "tasks": [_task(0, ["weld"]), _task(1, ["crane"]), _task(2, [])],
+        "time_horizon": 8,
+        "constraints": {"max_tasks_per_employee": 1}
+    }
+    result = SolverService()._solve_task_assignment(data)
+    assert result["status"] == "success"
+    pairs = {(a["employee_id"], a["task_id"]) for a in result["solution"]["assignments"]}
+    assert pairs == {(1, 0), (0, 1), (2, 2)}
+
+def test_labor_scheduling_respects_shift_skills():
+    data = {
+        "employees": [{"id": 0, "skills": ["medic"]}, {"id": 1, "skills": []}],
+        "shifts": [{"id": 1}, {"id": 2}],
+        "time_horizon": 2,
+        "constraints": {"coverage_requirements": {"1": 1, "2": 1}, "skill_requirements": {"1": ["medic"]},
+                        "max_consecutive_hours": 8},
+        "objective": "minimize_cost"
+    }
+    result = SolverService()._solve_labor_scheduling(data)
+    assert result["status"] in ("OPTIMAL", "FEASIBLE")
+    assert {(a["employee_id"], a["shift_id"]) for a in result["solution"]["schedule"]} == {(0, 1), (1, 2)}
+
+def test_components_match_union_find():
+    rng = np.random.default_rng(3)
+    for _ in range(100):
+        workers, tasks = rng.integers(1, 30, 2)
+        eligible = rng.random((workers, tasks)) < rng.uniform(0, 0.2)
+        parent = list(range(workers + tasks))
+
+        def root(i):
+            while parent[i] != i:
+                i = parent[i]
+            return i
+        for w, t in zip(*np.nonzero(eligible)):
+            parent[root(w)] = root(workers + t)
+        labels = np.concatenate(eligibility_components(eligible))
+        roots = np.array([root(i) for i in range(workers + tasks)])
+        assert np.array_equal(labels[:, None] == labels[None, :], roots[:, None] == roots[None, :])
+        assert labels[0] == 0 and set(labels) == set(range(labels.max() + 1))
+
+def test_crew_allocation_solves_sites_separately():
+    rng = np.random.default_rng(0)
+    crews, tasks = [], []
+    for site in range(6):
+        skills = [f"s{site}_{k}" for k in range(3)]
+        crews += [{"id": 4 * site + i, "skills": list(rng.choice(skills, 2, replace=False)),
+                   "availability": [[0, 12]]} for i in range(4)]
+        tasks += [{"id": 8 * site + j, "site_id": site, "required_skills": [str(rng.choice(skills))],
+                   "duration": int(rng.integers(1, 4))} for j in range(8)]
+    data = {"crews": crews, "tasks": tasks, "priorities": {}, "union_rules": []}
+    service = SolverService()
+    result = service._solve_crew_allocation(data)
+    assert result["status"] == "success" and service._pool is None  # small components stay in process
+    assert [(c["crews"], c["tasks"]) for c in result["solution"]["components"]] == [(4, 8)] * 6
+    crew_site = {c["id"]: c["skills"][0].split("_")[0] for c in crews}
+    assert sorted(a["task_id"] for a in result["solution"]["assignments"]) == list(range(48))
+    assert all(crew_site[a["crew_id"]] == f"s{tasks[a['task_id']]['site_id']}" for a in result["solution"]["assignments"])
+    tasks.append({"id": 48, "site_id": 0, "required_skills": ["s0_0"], "duration": 100})
+    failed = service._solve_crew_allocation({**data, "solver_config": {"workers": 2}})
+    assert failed["status"] == "infeasible" and "48" in failed["error"]
+    assert [c["status"] for c in failed["solution"]["components"]].count("infeasible") == 1
+    pool = service._pool
+    assert pool is not None
+    service._solve_crew_allocation({**data, "solver_config": {"workers": 2}})
+    assert service._pool is pool
@@ -0,0 +1,91 @@
+import time
+from fastapi.testclient import TestClient
+from src.api.routes import app
+
+client = TestClient(app)
+
+def _employee(i, skills, max_hours=40, rate=10):
+    return {"id": i, "name": f"e{i}", "skills": skills, "max_hours": max_hours, "hourly_rate": rate, "availability": []}
+
+def _task(i, skills, duration, window):
+    location = {"id": 0, "latitude": 0.0, "longitude": 0.0}
+    return {"id": i, "location": location, "duration": duration, "required_skills": skills,
+            "priority": 1, "time_window": window}
+
+def test_assignment_path_for_long_horizon():
+    employees = [_employee(e, ["a"] if e % 2 else ["b"], rate=10 + e) for e in range(40)]
+    tasks = [_task(t, ["a"] if t % 2 else ["b"], 2, [t, t + 10]) for t in range(60)]
+    began = time.time()
+    response = client.post("/solve/employee-schedule", json={
+        "employees": employees, "tasks": tasks, "time_horizon": 200, "constraints": {}})
+    assert response.status_code == 200, response.text
+    sol = response.json()["solution"]
+    assert time.time() - began < 10
+    stats = sol["model_stats"]
+    assert stats["formulation"] == "assignment"
+    assert stats["variables"] == 20 * 60
+    assert stats["time_indexed_variables"] == 40 * 60 * 200
+    assert len(sol["schedule"]) == 60
+    assert all(entry["hour"] == entry["task_id"] for entry in sol["schedule"])
+
+def test_interval_path_enforces_rest():
+    employees = [_employee(0, ["a"], rate=5), _employee(1, ["a"], rate=50)]
+    tasks = [_task(0, ["a"], 3, [0, 6]), _task(1, ["a"], 3, [0, 8])]
+    response = client.post("/solve/employee-schedule", json={
+        "employees": employees, "tasks": tasks, "time_horizon": 24,
+        "constraints": {"min_rest_hours": 2}})
+    assert response.status_code == 200, response.text
+    sol = response.json()["solution"]
+    assert sol["model_stats"]["formulation"] == "interval"
+    # The cheap employee can only take both with a 2-hour rest: 0-3, rest, 5-8
+    assert {e["employee_id"] for e in sol["schedule"]} == {0}
+    first, second = sorted(sol["schedule"], key=lambda e: e["hour"])
+    assert second["hour"] >= first["end"] + 2
+    assert sol["total_cost"] == 30
+
+    response = client.post("/solve/employee-schedule", json={
+        "employees": employees, "tasks": tasks, "time_horizon": 24,
+        "constraints": {"min_rest_hours": 3}})
+    assert {e["employee_id"] for e in response.json()["solution"]["schedule"]} == {0, 1}
+
+def test_rolling_horizon_keeps_rest_and_hours_across_windows():
+    employees = [_employee(e, ["a"], max_hours=30, rate=10 + e) for e in range(6)]
+    tasks = [_task(t, ["a"], 2 + t % 3, [4 * t, 4 * t + 10]) for t in range(40)]
+    payload = {"employees": employees, "tasks": tasks, "time_horizon": 170, "constraints": {"min_rest_hours": 3},
+               "solver_config": {"rolling_horizon": {"window": 24, "overlap": 6}}}
+    response = client.post("/solve/employee-schedule", json=payload)
+    assert response.status_code == 200, response.text
+    sol = response.json()["solution"]
+    assert len(sol["schedule"]) == 40 and all(w["start"] % 18 == 0 for w in sol["windows"])
+    for e in range(6):
+        blocks = sorted((entry["hour"], entry["end"]) for entry in sol["schedule"] if entry["employee_id"] == e)
+        assert all(end + 3 <= start for (_, end), (start, _) in zip(blocks, blocks[1:]))
+        assert sum(end - start for start, end in blocks) <= 30
+
+def test_interval_path_breaks_blocks_without_rest():
+    employees = [_employee(0, ["a"], rate=5), _employee(1, ["a"], rate=50)]
+    tasks = [_task(t, ["a"], 4, [4 * t, 4 * t + 4]) for t in range(3)]
+    response = client.post("/solve/employee-schedule", json={
+        "employees": employees, "tasks": tasks, "time_horizon": 24,
+        "constraints": {"min_rest_hours": 0, "max_consecutive_hours": 8}})
+    assert response.status_code == 200, response.text
+    schedule = sorted(response.json()["solution"]["schedule"], key=lambda e: e["hour"])
+    assert [e["hour"] for e in schedule] == [0, 4, 8]
+    # Back-to-back tasks on one employee would be a 12-hour block
+    assert [e["employee_id"] for e in schedule] in ([0, 1, 0], [1, 0, 1])
+
+def test_interval_path_allows_short_back_to_back_blocks():
+    response = client.post("/solve/employee-schedule", json={
+        "employees": [_employee(0, ["a"])], "tasks": [_task(t, ["a"], 2, [0, 4]) for t in range(2)],
+        "time_horizon": 24, "constraints": {"max_consecutive_hours": 8}})
+    assert response.status_code == 200, response.text
+    assert sorted(e["hour"] for e in response.json()["solution"]["schedule"]) == [0, 2]
+    # Three 4-hour tasks on one employee need a gap somewhere, also across windows
+    response = client.post("/solve/employee-schedule", json={
+        "employees": [_employee(0, ["a"])], "tasks": [_task(t, ["a"], 4, [0, 14]) for t in range(3)],
+        "time_horizon": 24, "constraints": {"max_consecutive_hours": 8},
+        "solver_config": {"rolling_horizon": {"window": 8, "overlap": 6}}})
+    assert response.status_code == 200, response.text
+    schedule = sorted((e["hour"], e["end"]) for e in response.json()["solution"]["schedule"])
+    assert len(schedule) == 3 and schedule[2][1] <= 14
+    assert any(a[1] < b[0] for a, b in zip(schedule, schedule[1:]))
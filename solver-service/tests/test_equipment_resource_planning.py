@@ -0,0 +1,63 @@
+import time
+from fastapi.testclient import TestClient
+from src.api.routes import app
+from src.core.intervals import sweep_pairs
+
+client = TestClient(app)
+
+def test_sweep_pairs_matches_brute_force():
+    earliest = [0, 5, 2, 20, 9, 9]
+    latest = [4, 8, 3, 25, 12, 10]
+    reach = [1, 0, 3, 2, 0, 1]
+    expected = {
+        (a, b) for a in range(6) for b in range(6)
+        if (earliest[a], a) < (earliest[b], b) and earliest[b] < latest[a] + reach[a]
+    }
+    assert set(sweep_pairs(earliest, latest, reach)) == expected
+
+def _payload(tasks, move_times, equipment=2, horizon=24):
+    return {
+        "equipment": [{"id": e, "capacity": 1} for e in range(equipment)],
+        "projects": [{"id": "north"}, {"id": "south"}],
+        "tasks": tasks,
+        "time_horizon": horizon,
+        "move_times": move_times,
+        "constraints": {}
+    }
+
+def test_move_times_force_second_unit():
+    tasks = [
+        {"id": 1, "site_id": "north", "time_window": [0, 4]},
+        {"id": 2, "site_id": "south", "time_window": [5, 8]},
+    ]
+    response = client.post("/solve/equipment-resource-planning", json=_payload(tasks, [[0, 0], [0, 0]]))
+    assert response.status_code == 200, response.text
+    assert len(response.json()["solution"]["equipment_used"]) == 1
+    # A 2-unit move from north to south no longer fits in the 1-unit gap
+    response = client.post("/solve/equipment-resource-planning", json=_payload(tasks, [[0, 2], [2, 0]]))
+    sol = response.json()["solution"]
+    assert len(sol["equipment_used"]) == 2
+    assert sol["equipment_used"] == [0, 1]
+
+def test_flexible_tasks_respect_transitions():
+    tasks = [
+        {"id": 1, "site_id": "north", "time_window": [0, 12], "duration": 3},
+        {"id": 2, "site_id": "south", "time_window": [0, 12], "duration": 3},
+    ]
+    response = client.post("/solve/equipment-resource-planning",
+                           json=_payload(tasks, [[0, 4], [4, 0]], equipment=1))
+    assert response.status_code == 200, response.text
+    first, second = sorted(response.json()["solution"]["assignments"], key=lambda a: a["start"])
+    assert second["start"] >= first["end"] + 4
+
+def test_large_identical_fleet():
+    tasks = [{"id": t, "site_id": "north" if t % 2 else "south", "time_window": [t % 50, t % 50 + 3]}
+             for t in range(400)]
+    began = time.time()
+    response = client.post("/solve/equipment-resource-planning",
+                           json=_payload(tasks, [[0, 1], [1, 0]], equipment=40, horizon=60))
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["status"] == "success"
+    assert len(data["solution"]["assignments"]) == 400
+    assert time.time() - began < 30
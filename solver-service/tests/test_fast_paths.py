@@ -0,0 +1,96 @@
+import numpy as np
+from fastapi.testclient import TestClient
+from src.api.routes import app
+from src.core.presolve import fleet_cover, portfolio_greedy, workforce_hiring
+from src.core.solver import SolverService
+
+client = TestClient(app)
+
+# Randomized instances checked against the MIP path, which stays available via solver_config.
+MIP = {"solver_config": {"engine": "mip"}}
+
+def _fleet_data(rng):
+    n = int(rng.integers(1, 5))
+    return {
+        "vehicle_types": [{"id": f"v{i}", "cost": float(rng.integers(1, 40)),
+                           "capacity": float(rng.choice([0, 0.5, 1, 3, 7, 12]) if i else rng.integers(1, 15))}
+                          for i in range(n)],
+        "demand_forecast": rng.integers(-5, 60, int(rng.integers(0, 6))).astype(float).tolist(),
+        "cost_parameters": {},
+        "constraints": {"budget": float(rng.integers(0, 400)), "min_vehicles": int(rng.integers(0, 6)),
+                        "max_vehicles": int(rng.integers(0, 15))},
+    }
+
+def test_fleet_mix_fast_path_matches_mip():
+    rng = np.random.default_rng(7)
+    for _ in range(150):
+        data = _fleet_data(rng)
+        fast = SolverService()._solve_fleet_mix(data)
+        mip = SolverService()._solve_fleet_mix({**data, **MIP})
+        assert fast["status"] == mip["status"], data
+        if fast["status"] != "success":
+            continue
+        assert fast["solution"]["engine"] == "dp"
+        assert abs(fast["solution"]["total_cost"] - mip["solution"]["total_cost"]) < 1e-6, data
+        counts = fast["solution"]["vehicle_counts"]
+        types = data["vehicle_types"]
+        assert sum(v["capacity"] * counts[v["id"]] for v in types) >= max(data["demand_forecast"], default=0)
+        assert data["constraints"]["min_vehicles"] <= sum(counts.values()) <= data["constraints"]["max_vehicles"]
+        assert fast["solution"]["total_cost"] <= data["constraints"]["budget"]
+
+def test_workforce_capacity_fast_path_matches_mip():
+    rng = np.random.default_rng(11)
+    for _ in range(150):
+        skills = [f"s{i}" for i in range(int(rng.integers(0, 4)))]
+        data = {
+            "employees": [],
+            "demand_forecast": rng.integers(0, 30, int(rng.integers(0, 5))).astype(float).tolist(),
+            "time_horizon": 4,
+            "constraints": {"skill_requirements": {s: [] for s in skills},
+                            "hiring_costs": {s: float(rng.integers(0, 20)) for s in skills},
+                            "max_hours_per_employee": float(rng.choice([0, 4, 7.5, 40]))},
+        }
+        fast = SolverService()._solve_workforce_capacity(data)
+        mip = SolverService()._solve_workforce_capacity({**data, **MIP})
+        assert fast["status"] == mip["status"], data
+        if fast["status"] == "success":
+            assert fast["solution"]["engine"] == "closed_form"
+            assert abs(fast["solution"]["total_cost"] - mip["solution"]["total_cost"]) < 1e-6, data
+
+def test_workforce_capacity_endpoint():
+    data = {"employees": [], "demand_forecast": [12.0, 30.0, 18.0], "time_horizon": 3,
+            "constraints": {"skill_requirements": {"weld": [], "lift": []},
+                            "hiring_costs": {"weld": 5.0, "lift": 3.0}, "max_hours_per_employee": 8.0}}
+    response = client.post("/solve/workforce-capacity", json=data)
+    assert response.status_code == 200, response.text
+    fast = response.json()
+    mip = client.post("/solve/workforce-capacity", json={**data, **MIP}).json()
+    assert fast["status"] == mip["status"] == "success"
+    assert fast["solution"]["engine"] == "closed_form"
+    assert abs(fast["solution"]["total_cost"] - mip["solution"]["total_cost"]) < 1e-6
+
+def test_portfolio_balancing_fast_path_matches_mip():
+    rng = np.random.default_rng(5)
+    for _ in range(150):
+        n = int(rng.integers(0, 6))
+        weights = {i: float(rng.integers(-3, 10)) for i in range(n)}
+        data = {
+            "sites": [{"id": i} for i in range(n)],
+            "resources": [{"count": int(rng.integers(0, 20))}],
+            "weights": weights,
+            "constraints": {"min_allocations": {i: int(rng.integers(0, 4)) for i in range(n)},
+                            "max_allocations": {i: int(rng.integers(2, 12)) for i in range(n) if rng.random() < 0.7}},
+        }
+        fast = SolverService()._solve_portfolio_balancing(data)
+        mip = SolverService()._solve_portfolio_balancing({**data, **MIP})
+        assert fast["status"] == mip["status"], data
+        if fast["status"] == "success":
+            value = lambda sol: sum(weights[i] * x for i, x in sol["allocations"].items())
+            assert abs(value(fast["solution"]) - value(mip["solution"])) < 1e-6, data
+
+def test_fast_paths_defer_unsupported_structures():
+    assert portfolio_greedy([1.0], [3], [2], 10) is None
+    assert workforce_hiring([-1.0, 2.0], [5.0], 8.0) == (False, None)
+    assert fleet_cover([1.0], [1 / 3], [5.0], 10.0, 0, 10) == (False, None)
+    solved, counts = fleet_cover([5.0, 9.0], [3, 5], [10.0], 100.0, 0, 10)
+    assert solved and counts.tolist() == [0, 2]
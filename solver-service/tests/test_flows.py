@@ -0,0 +1,71 @@
+import numpy as np
+from fastapi.testclient import TestClient
+from src.api.routes import app
+from src.core.flows import integer_costs, solve_transportation
+from src.core.solver import SolverService
+
+client = TestClient(app)
+
+def test_integer_costs_scales_decimals():
+    scaled, scale = integer_costs(np.array([[1.5, 2.25], [3.0, 0.0]]))
+    assert scale == 100 and scaled.tolist() == [[150, 225], [300, 0]]
+    assert integer_costs(np.array([np.nan])) is None
+    assert integer_costs(np.array([1 / 3])) is None
+
+def test_transportation_respects_bounds_and_arcs():
+    costs = np.array([[1, 1, 1, 1], [5, 5, 5, 5]])
+    allowed = np.ones((2, 4), dtype=bool)
+    allowed[0, 3] = False
+    engine, assignment = solve_transportation(costs, allowed, [3, 4], [0, 2])
+    assert engine == "min_cost_flow"
+    assert (assignment == 1).sum() == 2 and assignment[3] == 1
+    assert solve_transportation(costs, allowed, [1, 1])[1] is None
+    engine, assignment = solve_transportation(np.array([[4, 1], [2, 8]]), np.ones((2, 2), dtype=bool), [1, 1])
+    assert engine == "linear_sum_assignment" and assignment.tolist() == [1, 0]
+
+def _equipment_data(rng, n_eq, n_tasks, **constraints):
+    cost = np.round(rng.uniform(1, 50, (n_eq, n_tasks)), 2)
+    return {
+        "equipment": [{"id": i} for i in range(n_eq)],
+        "tasks": [{"id": j, "location": {"id": j % 4}} for j in range(n_tasks)],
+        "cost_matrix": cost.tolist(),
+        "constraints": {"max_equipment_per_location": n_tasks, **constraints},
+    }
+
+def test_equipment_allocation_flow_matches_mip():
+    rng = np.random.default_rng(3)
+    for n_eq, n_tasks in [(6, 6), (5, 14)]:
+        data = _equipment_data(rng, n_eq, n_tasks, min_tasks_per_equipment=1,
+                               assignment_restrictions=[{"equipment_id": 0, "task_id": 1}])
+        flow = SolverService()._solve_equipment_allocation(data)
+        mip = SolverService()._solve_equipment_allocation({**data, "solver_config": {"engine": "mip"}})
+        assert flow["solution"]["engine"] != "mip" and mip["solution"]["engine"] == "mip"
+        assert abs(flow["objective_value"] - mip["objective_value"]) < 1e-6
+        pairs = {(a["equipment_id"], a["task_id"]) for a in flow["solution"]["assignments"]}
+        assert (0, 1) not in pairs and len(pairs) == n_tasks
+
+def test_task_assignment_flow_respects_cap():
+    employees = [{"id": i, "name": f"e{i}", "skills": ["a"], "max_hours": 8, "hourly_rate": 10, "availability": []}
+                 for i in range(3)]
+    location = {"id": 0, "latitude": 0.0, "longitude": 0.0}
+    tasks = [{"id": j, "location": location, "duration": 1, "required_skills": ["a"], "priority": j,
+              "time_window": [0, 8]} for j in range(6)]
+    data = {"employees": employees, "tasks": tasks, "time_horizon": 8, "constraints": {"max_tasks_per_employee": 2}}
+    result = SolverService()._solve_task_assignment(data)
+    assert result["solution"]["engine"] == "min_cost_flow"
+    counts = np.bincount([a["employee_id"] for a in result["solution"]["assignments"]], minlength=3)
+    assert counts.tolist() == [2, 2, 2]
+    data["constraints"]["max_tasks_per_employee"] = 1
+    assert SolverService()._solve_task_assignment(data)["status"] == "failed"
+
+def test_task_assignment_endpoint():
+    employees = [{"id": i, "name": f"e{i}", "skills": ["a"], "max_hours": 8, "hourly_rate": 10, "availability": []}
+                 for i in range(2)]
+    location = {"id": 0, "latitude": 0.0, "longitude": 0.0}
+    tasks = [{"id": j, "location": location, "duration": 1, "required_skills": ["a"], "priority": j,
+              "time_window": [0, 8]} for j in range(4)]
+    response = client.post("/solve/task-assignment", json={
+        "employees": employees, "tasks": tasks, "time_horizon": 8, "constraints": {"max_tasks_per_employee": 2}})
+    assert response.status_code == 200, response.text
+    sol = response.json()["solution"]
+    assert sol["engine"] == "min_cost_flow" and sorted(a["task_id"] for a in sol["assignments"]) == [0, 1, 2, 3]
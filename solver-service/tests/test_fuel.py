@@ -0,0 +1,50 @@
+import numpy as np
+from fastapi.testclient import TestClient
+from src.api.routes import app
+from src.core.solver import SolverService
+
+client = TestClient(app)
+
+def _loc(i):
+    return {"id": i, "latitude": 0.0, "longitude": float(i)}
+
+def _payload(routes, stations, prices, **constraints):
+    # Locations on a line: the distance between i and j is |i - j|
+    n = 8
+    matrix = np.abs(np.subtract.outer(np.arange(n), np.arange(n))).astype(float)
+    return {
+        "vehicles": [{"id": 1, "type": "van", "capacity": 10, "operating_cost": 1,
+                      "maintenance_interval": 100, "fuel_efficiency": 1}],
+        "routes": [[_loc(i) for i in r] for r in routes],
+        "fuel_stations": [_loc(i) for i in stations],
+        "fuel_prices": prices,
+        "distance_matrix": matrix.tolist(),
+        "constraints": {"min_fuel_level": 0, "max_fuel_level": 4, **constraints},
+    }
+
+def test_fuel_keys_routes_sharing_a_start():
+    # Both routes start at location 0 but need different numbers of stops
+    data = _payload([[0, 1], [0, 7]], [0, 1, 2, 3], [4.0, 3.0, 2.0, 1.0])
+    response = client.post("/solve/fuel", json=data)
+    assert response.status_code == 200, response.text
+    solution = response.json()["solution"]
+    stops = {}
+    for stop in solution["refuel_stops"]:
+        stops.setdefault(stop["route_id"], []).append(stop["station_id"])
+    assert sorted(stops[0]) == [3] and sorted(stops[1]) == [2, 3]
+    assert solution["total_cost"] == 4.0
+
+def test_fuel_candidates_limited_by_detour():
+    service = SolverService()
+    lengths, candidates = service._fuel_routes(np.abs(np.subtract.outer(np.arange(8), np.arange(8))).astype(float),
+                                               [[type("L", (), {"id": i}) for i in r] for r in [[0, 1], [5, 6, 7], []]],
+                                               [0, 3, 7], max_detour=1)
+    assert lengths.tolist() == [1.0, 2.0, 0.0]
+    assert [c.tolist() for c in candidates] == [[0], [2], []]
+
+    data = _payload([[0, 1]], [0, 1, 2, 3], [4.0, 3.0, 2.0, 1.0], max_detour=1)
+    result = service._solve_fuel(data)
+    assert result["solution"]["model_stats"]["variables"] == 3
+    assert [s["station_id"] for s in result["solution"]["refuel_stops"]] == [2]
+    result = service._solve_fuel(_payload([[0, 7]], [5], [1.0] * 8, max_detour=0))
+    assert result["status"] == "failed" and "route 0" in result["error"]
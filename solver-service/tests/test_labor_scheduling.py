@@ -0,0 +1,57 @@
+from collections import Counter
+from src.core.solver import SolverService
+
+def _data(num_employees, shifts, coverage, days=10, **constraints):
+    return {
+        "employees": [{"id": i, "skills": [], "hourly_rate": 10 + i % 2} for i in range(num_employees)],
+        "shifts": shifts,
+        "time_horizon": days,
+        "constraints": {"coverage_requirements": coverage, "max_consecutive_hours": 3, "min_rest_hours": 8,
+                        **constraints},
+        "objective": "minimize_cost"
+    }
+
+def _check(result, data):
+    assert result["status"] in ("OPTIMAL", "FEASIBLE")
+    worked = {(a["employee_id"], a["day"]): a["shift_id"] for a in result["solution"]["schedule"]}
+    counts = Counter((a["shift_id"], a["day"]) for a in result["solution"]["schedule"])
+    for s in data["shifts"]:
+        for d in range(data["time_horizon"]):
+            assert counts[(s["id"], d)] >= data["constraints"]["coverage_requirements"][str(s["id"])]
+    for e in data["employees"]:
+        days = [d for d in range(data["time_horizon"]) if (e["id"], d) in worked]
+        # No more than three days in any four-day window
+        assert all(sum(dd in days for dd in range(d, d + 4)) <= 3 for d in range(data["time_horizon"] - 3))
+    return worked
+
+def test_shift_changes_need_a_day_off_without_shift_hours():
+    data = _data(12, [{"id": 1}, {"id": 2}], {"1": 3, "2": 3})
+    worked = _check(SolverService()._solve_labor_scheduling(data), data)
+    for (e, d), s in worked.items():
+        assert worked.get((e, d + 1), s) == s
+
+def test_rest_rule_uses_shift_hours():
+    shifts = [{"id": 1, "start": 6, "end": 14}, {"id": 2, "start": 14, "end": 22}, {"id": 3, "start": 22, "end": 6}]
+    data = _data(16, shifts, {"1": 2, "2": 2, "3": 2})
+    worked = _check(SolverService()._solve_labor_scheduling(data), data)
+    # Only a night shift followed by a morning shift leaves less than 8 hours of rest
+    assert not any(s == 3 and worked.get((e, d + 1)) == 1 for (e, d), s in worked.items())
+    assert SolverService()._rest_conflicts(shifts, 8) == {1: [], 2: [], 3: [1]}
+
+def test_interchangeable_employees_keep_optimal_cost():
+    data = _data(9, [{"id": 1}], {"1": 4}, days=8)
+    result = SolverService()._solve_labor_scheduling(data)
+    _check(result, data)
+    # 32 shifts: the five cheaper employees work at most 6 of 8 days each
+    assert result["status"] == "OPTIMAL" and result["objective_value"] == 30 * 10 + 2 * 11
+
+def test_rolling_horizon_carries_rules_across_windows():
+    shifts = [{"id": 1, "start": 6, "end": 14}, {"id": 2, "start": 14, "end": 22}, {"id": 3, "start": 22, "end": 6}]
+    data = _data(16, shifts, {"1": 2, "2": 2, "3": 2}, days=30)
+    result = SolverService()._solve_labor_scheduling(
+        {**data, "solver_config": {"rolling_horizon": {"window": 7, "overlap": 2}}})
+    worked = _check(result, data)
+    assert not any(s == 3 and worked.get((e, d + 1)) == 1 for (e, d), s in worked.items())
+    assert [(w["start"], w["end"]) for w in result["solution"]["windows"]] == [
+        (0, 7), (5, 12), (10, 17), (15, 22), (20, 27), (25, 30)]
+    assert result["objective_value"] == SolverService()._solve_labor_scheduling(data)["objective_value"]
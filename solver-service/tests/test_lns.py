@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from src.core.lns import CrewAllocationLNS, LNSProblem
+from src.core.solver import SolverService
+
+def _crews(seed, crews=30, tasks=70):
+    rng = np.random.default_rng(seed)
+    skills = ["a", "b", "c", "d"]
+    return {
+        "crews": [{"id": i, "skills": list(rng.choice(skills, 2, replace=False)),
+                   "availability": [[0, int(rng.integers(7, 10))]]} for i in range(crews)],
+        "tasks": [{"id": j, "site_id": int(rng.integers(0, 5)), "required_skills": [str(rng.choice(skills))],
+                   "duration": int(rng.integers(1, 6))} for j in range(tasks)],
+        "priorities": {s: s + 1 for s in range(5)},
+        "union_rules": [],
+    }
+
+def _check_crews(data, assignments):
+    hours = {t["id"]: t["duration"] for t in data["tasks"]}
+    load = {}
+    for a in assignments:
+        load[a["crew_id"]] = load.get(a["crew_id"], 0) + hours[a["task_id"]]
+    for crew in data["crews"]:
+        assert load.get(crew["id"], 0) <= crew["availability"][0][1]
+    assert sorted(a["task_id"] for a in assignments) == sorted(hours)
+
+def test_crew_lns_covers_what_greedy_misses():
+    data = _crews(7)
+    assert len(CrewAllocationLNS(data).greedy()) < len(data["tasks"])
+    for workers in (1, 2):
+        service = SolverService()
+        result = service._solve_crew_allocation(
+            {**data, "solver_config": {"engine": "lns", "time_limit": 20, "workers": workers, "seed": 1}})
+        assert result["status"] == "success"
+        # Parallel rounds run on the service's shared pool
+        assert (service._pool is not None) == (workers > 1)
+        _check_crews(data, result["solution"]["assignments"])
+        stats = result["solution"]["lns"]
+        objectives = [step["objective"] for step in stats["trace"]]
+        assert objectives == sorted(set(objectives)) and objectives[-1] == sum(
+            data["priorities"][t["site_id"]] for t in data["tasks"])
+        assert sum(kind["accepted"] for kind in stats["acceptance"].values()) == len(objectives) - 1
+        assert set(stats["acceptance"]) <= {"site", "skill"}
+
+def test_crew_lns_subproblem_budget():
+    with pytest.raises(TypeError):
+        LNSProblem()
+    data = _crews(7)
+    problem = CrewAllocationLNS(data)
+    plan = problem.greedy()
+    assert problem.subproblem(plan, [0], 25.0)["solver_config"] == {"time_limit": 10.0}
+    problem = CrewAllocationLNS({**data, "solver_config": {"sub_time_limit": 2}})
+    assert problem.subproblem(plan, [0], 25.0)["solver_config"] == {"time_limit": 2.0}
+    assert problem.subproblem(plan, [0], 0.5)["solver_config"] == {"time_limit": 0.5}
+
+def test_crew_lns_reports_uncovered_tasks():
+    data = _crews(0, crews=30, tasks=75)
+    data["crews"] = [dict(c, availability=[[0, 6]]) for c in data["crews"]]
+    result = SolverService()._solve_crew_allocation(
+        {**data, "solver_config": {"engine": "lns", "iterations": 10, "seed": 0}})
+    assert result["status"] == "infeasible" and result["solution"]["unassigned"]
+    assert result["solution"]["lns"]["iterations"] == 10
+
+def test_equipment_lns_improves_first_fit():
+    rng = np.random.default_rng(8)
+    tasks = [{"id": j, "site_id": int(rng.integers(0, 3)), "time_window": [int(a), int(a) + 12],
+              "duration": int(rng.integers(2, 8))} for j, a in enumerate(rng.integers(0, 60, 40))]
+    data = {"equipment": [{"id": i, "type": "crane"} for i in range(12)], "tasks": tasks,
+            "projects": [{"id": k} for k in range(3)], "time_horizon": 80,
+            "move_times": [[0, 3, 5], [3, 0, 2], [5, 2, 0]], "constraints": {}}
+    service = SolverService()
+    first_fit = service._solve_equipment_resource_planning({**data, "solver_config": {"time_limit": 0}})
+    result = service._solve_equipment_resource_planning({**data, "solver_config": {
+        "engine": "lns", "start_time_limit": 0, "time_limit": 20, "iterations": 10, "sub_time_limit": 1, "seed": 0}})
+    sol = result["solution"]
+    assert result["status"] == "success" and sol["engine"] == "lns"
+    assert len(sol["equipment_used"]) == -sol["lns"]["objective"] < len(first_fit["solution"]["equipment_used"])
+    assert set(sol["equipment_used"]) == {a["equipment_id"] for a in sol["assignments"]}
+    assert sorted(a["task_id"] for a in sol["assignments"]) == list(range(40))
+    site = {t["id"]: t["site_id"] for t in tasks}
+    for unit in sol["equipment_used"]:
+        runs = sorted((a["start"], a["end"], site[a["task_id"]]) for a in sol["assignments"]
+                      if a["equipment_id"] == unit)
+        for (_, end, a), (start, _, b) in zip(runs, runs[1:]):
+            assert end + data["move_times"][a][b] <= start
@@ -0,0 +1,57 @@
+import time
+from fastapi.testclient import TestClient
+from src.api.routes import app
+
+client = TestClient(app)
+
+def _vehicle(i, interval):
+    return {"id": i, "type": "truck", "capacity": 10, "operating_cost": 1,
+            "maintenance_interval": interval, "fuel_efficiency": 1}
+
+def _payload(vehicles, tasks, facilities, capacity, horizon):
+    return {
+        "vehicles": vehicles,
+        "maintenance_tasks": tasks,
+        "maintenance_facilities": [{"id": f, "latitude": 0.0, "longitude": 0.0} for f in range(facilities)],
+        "time_horizon": horizon,
+        "constraints": {"max_maintenance_delay": 4, "facility_capacity": capacity, "working_hours": []}
+    }
+
+def test_single_bay_delays_second_vehicle():
+    tasks = [{"id": 10 + v, "vehicle_id": v, "type": "oil", "duration": 2, "required_parts": [], "priority": 1}
+             for v in range(2)]
+    response = client.post("/solve/maintenance", json=_payload([_vehicle(0, 1), _vehicle(1, 1)], tasks, 1, [1], 12))
+    assert response.status_code == 200, response.text
+    sol = response.json()["solution"]
+    assert sol["total_delay"] == 1
+    first, second = sorted(sol["schedule"], key=lambda e: e["time"])
+    assert second["time"] >= first["end"]
+    assert all(e["facility_id"] == 0 for e in sol["schedule"])
+
+def test_large_fleet_without_time_indexing():
+    vehicles = [_vehicle(v, 5 + v % 150) for v in range(300)]
+    tasks = [{"id": k, "vehicle_id": k % 300, "type": "service", "duration": 1 + k % 3,
+              "required_parts": [], "priority": 1} for k in range(600)]
+    began = time.time()
+    response = client.post("/solve/maintenance", json=_payload(vehicles, tasks, 4, [12, 12, 12, 12], 200))
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "success"
+    assert time.time() - began < 20
+
+def test_rolling_horizon_respects_kept_maintenance():
+    vehicles = [_vehicle(v, 3 + 2 * v) for v in range(30)]
+    tasks = [{"id": k, "vehicle_id": k % 30, "type": "service", "duration": 2 + k % 3,
+              "required_parts": [], "priority": 1} for k in range(60)]
+    payload = {**_payload(vehicles, tasks, 2, [2, 2], 90),
+               "solver_config": {"rolling_horizon": {"window": 20, "overlap": 5}}}
+    response = client.post("/solve/maintenance", json=payload)
+    assert response.status_code == 200, response.text
+    sol = response.json()["solution"]
+    assert sorted(e["maintenance_id"] for e in sol["schedule"]) == list(range(60))
+    assert sol["total_delay"] == sum(max(0, e["time"] - (3 + 2 * e["vehicle_id"])) for e in sol["schedule"])
+    for v in range(30):
+        runs = sorted((e["time"], e["end"]) for e in sol["schedule"] if e["vehicle_id"] == v)
+        assert all(end <= start for (_, end), (start, _) in zip(runs, runs[1:]))
+    for t in range(90):
+        for f in range(2):
+            assert sum(e["time"] <= t < e["end"] and e["facility_id"] == f for e in sol["schedule"]) <= 2
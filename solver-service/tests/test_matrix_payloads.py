@@ -0,0 +1,62 @@
+import base64
+import io
+import json
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from src.api.routes import app
+from src.core.matrix import decode_matrix
+
+client = TestClient(app)
+
+def _equipment_payload(cost_matrix):
+    location = {"id": 0, "latitude": 0.0, "longitude": 0.0}
+    return {
+        "equipment": [{"id": 0}, {"id": 1}],
+        "tasks": [
+            {"id": t, "location": location, "duration": 1, "required_skills": [],
+             "priority": 1, "time_window": [0, 8]}
+            for t in range(2)
+        ],
+        "locations": [location],
+        "cost_matrix": cost_matrix,
+        "constraints": {}
+    }
+
+def test_decode_base64_matrix():
+    raw = np.arange(6, dtype="<f4").reshape(2, 3)
+    m = decode_matrix({"encoding": "base64", "dtype": "float32", "shape": [2, 3],
+                       "data": base64.b64encode(raw.tobytes()).decode()})
+    assert isinstance(m, np.ndarray)
+    assert m.dtype == np.float32
+    np.testing.assert_array_equal(m, raw)
+
+def test_decode_matrix_rejects_bad_shape():
+    raw = np.zeros(5, dtype="<i4")
+    with pytest.raises(ValueError):
+        decode_matrix({"dtype": "int32", "shape": [2, 3], "data": base64.b64encode(raw.tobytes()).decode()})
+    with pytest.raises(ValueError):
+        decode_matrix([[1, 2], [3]])
+
+def test_equipment_allocation_base64_cost_matrix():
+    costs = np.array([[1, 5], [4, 2]], dtype="<i4")
+    encoded = {"encoding": "base64", "dtype": "int32", "shape": [2, 2],
+               "data": base64.b64encode(costs.tobytes()).decode()}
+    response = client.post("/solve/equipment-allocation", json=_equipment_payload(encoded))
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["objective_value"] == 3
+    assert {(a["equipment_id"], a["task_id"]) for a in data["solution"]["assignments"]} == {(0, 0), (1, 1)}
+
+def test_equipment_allocation_multipart_npy():
+    buf = io.BytesIO()
+    np.save(buf, np.array([[1.0, 5.0], [4.0, 2.0]], dtype=np.float32))
+    payload = _equipment_payload(None)
+    del payload["cost_matrix"]
+    response = client.post(
+        "/solve/equipment-allocation/multipart",
+        data={"payload": json.dumps(payload)},
+        files={"cost_matrix": ("cost.npy", buf.getvalue(), "application/octet-stream")}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["objective_value"] == 3
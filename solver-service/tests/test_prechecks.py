@@ -0,0 +1,92 @@
+import numpy as np
+from fastapi.testclient import TestClient
+from src.api.routes import app
+from src.core.prechecks import precheck
+from src.core.solver import SolverService
+
+client = TestClient(app)
+
+def test_crew_allocation_diagnosis():
+    crews = [{"id": "c1", "skills": ["weld"], "availability": [[0, 8]]},
+             {"id": "c2", "skills": ["weld", "lift"], "availability": [[0, 4], [6, 10]]}]
+    tasks = [{"id": "t1", "required_skills": ["weld"], "duration": 6},
+             {"id": "t2", "required_skills": ["paint"], "duration": 1},
+             {"id": "t3", "required_skills": ["lift"], "duration": 9}]
+    response = client.post("/solve/crew-allocation", json={
+        "crews": crews, "sites": [], "tasks": tasks, "shifts": [], "priorities": {},
+        "union_rules": [{"max_work_hours_per_day": 7}]})
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["status"] == "infeasible" and "paint" in result["error"]
+    assert {i["check"]: i["entities"] for i in result["diagnosis"]} == {
+        "skill_coverage": ["t2"], "crew_hours": ["t3"], "total_hours": []}
+    assert precheck("crew_allocation", {"crews": crews, "tasks": tasks[:1], "union_rules": []}) is None
+
+def test_material_delivery_diagnosis():
+    data = {"type": "material_delivery_optimization",
+            "vehicles": [{"id": "v1", "capacity": 10}, {"id": "v2", "capacity": 6}],
+            "deliveries": [{"id": "d1", "quantity": 12}, {"id": "d2", "quantity": 5}]}
+    result = SolverService().solve(data)
+    assert result["status"] == "infeasible"
+    assert [(i["check"], i["entities"]) for i in result["diagnosis"]] == [
+        ("vehicle_capacity", ["d1"]), ("total_capacity", [])]
+    data["deliveries"][0]["quantity"] = 9
+    assert SolverService().solve(data)["status"] == "success"
+
+def test_compliance_diagnosis():
+    data = {"type": "compliance_planning", "blackout_windows": [[4, 6], [10, 12]],
+            "constraints": {"time_horizon": 16, "crews": 2},
+            "tasks": [{"id": "a", "duration": 5}, {"id": "b", "duration": 3, "crew_size": 3},
+                      {"id": "c", "duration": 4, "crew_size": 2}]}
+    result = SolverService().solve(data)
+    assert result["status"] == "infeasible"
+    assert [(i["check"], i["entities"]) for i in result["diagnosis"]] == [("blackout_fit", ["a"]), ("crew_size", ["b"])]
+    busy = {**data, "tasks": [{"id": k, "duration": 4, "crew_size": 2} for k in range(4)]}
+    assert [i["check"] for i in SolverService().solve(busy)["diagnosis"]] == ["horizon_capacity"]
+
+def test_prechecks_moved_from_handlers():
+    service = SolverService()
+    maintenance = service.solve({
+        "type": "maintenance", "time_horizon": 3, "constraints": {},
+        "vehicles": [{"id": 0, "type": "truck", "capacity": 1, "operating_cost": 1, "maintenance_interval": 1,
+                      "fuel_efficiency": 1}],
+        "maintenance_tasks": [{"id": k, "vehicle_id": 0, "type": "oil", "duration": d, "required_parts": [],
+                               "priority": 1} for k, d in enumerate([2, 4])],
+        "maintenance_facilities": [{"id": 0, "latitude": 0.0, "longitude": 0.0}]})
+    assert maintenance["status"] == "failed" and maintenance["diagnosis"][0]["entities"] == [1]
+    sub = service.solve({"type": "subcontractor_scheduling", "time_horizon": 20,
+                         "tasks": [{"id": 1, "duration": 4}, {"id": 2, "duration": 4, "predecessors": [1],
+                                                              "latest_end": 6, "subcontractor_id": "s"}],
+                         "subcontractors": [{"id": "s", "capacity": 1}]})
+    assert [(i["check"], i["entities"]) for i in sub["diagnosis"]] == [("cpm_window", [1, 2])]
+    labor = service.solve({"type": "labor_scheduling", "time_horizon": 3,
+                           "employees": [{"id": i, "skills": ["a"], "hourly_rate": 10} for i in range(2)],
+                           "shifts": [{"id": 0, "start": 6, "end": 14}, {"id": 1, "start": 14, "end": 22}],
+                           "constraints": {"coverage_requirements": {"0": 2, "1": 1},
+                                           "skill_requirements": {"1": ["b"]}}})
+    assert labor["status"] == "INFEASIBLE" and labor["diagnosis"][0]["entities"] == [1]
+    equipment = service.solve({"type": "equipment_resource_planning", "time_horizon": 10, "constraints": {},
+                               "equipment": [{"id": 0}], "projects": [],
+                               "tasks": [{"id": 1, "time_window": [0, 4], "duration": 3},
+                                         {"id": 2, "time_window": [8, 14], "duration": 3}]})
+    assert equipment["status"] == "infeasible" and equipment["diagnosis"][0]["entities"] == [2]
+
+def test_prechecks_never_reject_solvable_requests():
+    rng = np.random.default_rng(7)
+    service = SolverService()
+    rejected = 0
+    for _ in range(60):
+        # Fractional sizes: the check must truncate them as the bin packing does
+        capacities = np.round(rng.uniform(3, 12, size=int(rng.integers(1, 4))), 1)
+        quantities = np.round(rng.uniform(1, 14, size=int(rng.integers(1, 6))), 1)
+        data = {"type": "material_delivery_optimization",
+                "vehicles": [{"id": k, "capacity": float(c)} for k, c in enumerate(capacities)],
+                "deliveries": [{"id": k, "quantity": float(q)} for k, q in enumerate(quantities)]}
+        if precheck(data["type"], data) is None:
+            continue
+        rejected += 1
+        assert service._solve_material_delivery_optimization(data)["status"] != "success", data
+    assert rejected
+    edge = {"type": "material_delivery_optimization", "vehicles": [{"id": 0, "capacity": 10.5}],
+            "deliveries": [{"id": 0, "quantity": 10.7}]}
+    assert service.solve(edge)["status"] == "success"
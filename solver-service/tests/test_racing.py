@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from src.api import routes
+from src.api.routes import app
+from src.core.racing import RaceTally, read_races, record_race
+from src.core.solver import SolverService
+
+client = TestClient(app)
+
+@pytest.fixture
+def race_log(tmp_path, monkeypatch):
+    """Point the API's service at a race log of its own."""
+    path = str(tmp_path / "races.jsonl")
+    monkeypatch.setattr(routes, "solver_service", SolverService(race_log=path))
+    return path
+
+def _mip(rhs):
+    return {
+        "type": "mip",
+        "variables": [{"name": "x", "type": "integer", "upper_bound": 10},
+                      {"name": "y", "type": "continuous", "upper_bound": 5},
+                      {"name": "z", "type": "binary"}],
+        "constraints": [{"expression": "2*x + 3*y + 4*z", "operator": "<=", "rhs": rhs},
+                        {"expression": "x + z", "operator": ">=", "rhs": 3}],
+        "objective": {"type": "maximize", "expression": "3*x + 2*y + 5*z"},
+    }
+
+def test_race_matches_single_backend(tmp_path):
+    service = SolverService(race_log=str(tmp_path / "races.jsonl"))
+    raced = service.solve({**_mip(12.5), "solver_config": {"engine": "race", "time_limit": 5}})
+    alone = service.solve(_mip(12.5))
+    assert raced["status"] == alone["status"] == "OPTIMAL"
+    assert abs(raced["objective_value"] - alone["objective_value"]) < 1e-6
+    report = raced["race"]
+    assert report["winner"] in ("SCIP", "CP_SAT", "CBC")
+    assert report["runs"][report["winner"]]["status"] == "OPTIMAL"
+    assert all(run["status"] in ("OPTIMAL", "STOPPED") for run in report["runs"].values())
+    infeasible = service.solve({**_mip(1), "solver_config": {"engine": "race", "backends": ["SCIP", "CBC"]}})
+    assert infeasible["status"] == "INFEASIBLE"
+    assert set(service.race_summary()) == {"mip"} and sum(service.race_summary()["mip"].values()) == 2
+    # The log outlives the service: a new one (another worker, or after a restart) reads the same history
+    entries = read_races(service.race_log)
+    assert SolverService(race_log=service.race_log).race_summary() == service.race_summary()
+    assert [e["flow"] for e in entries] == ["mip", "mip"] and entries[0]["variables"] == 3
+    assert set(entries[1]["runs"]) == {"SCIP", "CBC"} and all("seconds" in r for r in entries[1]["runs"].values())
+    with pytest.raises(Exception, match="Cannot race"):
+        service.solve({**_mip(12.5), "solver_config": {"engine": "race", "backends": ["GUROBI"]}})
+
+def test_race_tally_follows_a_rolling_log(tmp_path):
+    path = str(tmp_path / "races.jsonl")
+    tally = RaceTally(path)
+    assert tally.summary() == {}
+    for k in range(30):
+        record_race(path, {"flow": "mip", "winner": "SCIP" if k % 3 else "CBC"}, max_bytes=600)
+        if k == 10:
+            assert tally.summary() == {"mip": {"SCIP": 7, "CBC": 4}}
+    assert tally.summary() == {"mip": {"SCIP": 20, "CBC": 10}}
+    assert len(read_races(path)) < 30 and len(read_races(path + ".1")) < 30
+    # Without a log each service counts its own races
+    memory = RaceTally()
+    memory.record({"flow": "lp", "winner": "CBC"})
+    memory.record({"flow": "lp", "winner": None})
+    assert memory.summary() == {"lp": {"CBC": 1}}
+
+def test_race_on_equipment_allocation_and_fleet_mix(race_log):
+    rng = np.random.default_rng(5)
+    cost = np.round(rng.uniform(1, 50, (5, 12)), 2)
+    data = {"equipment": [{"id": i} for i in range(5)],
+            "tasks": [{"id": j, "location": {"id": j % 3}} for j in range(12)],
+            "cost_matrix": cost.tolist(), "constraints": {"min_tasks_per_equipment": 2}}
+    flow = SolverService()._solve_equipment_allocation(data)
+    raced = SolverService()._solve_equipment_allocation({**data, "solver_config": {"engine": "race"}})
+    assert raced["solution"]["engine"] == "mip" and raced["solution"]["race"]["winner"]
+    assert abs(flow["objective_value"] - raced["objective_value"]) < 1e-6
+    fleet = {"vehicle_types": [{"id": "a", "cost": 10, "capacity": 3}, {"id": "b", "cost": 17, "capacity": 5}],
+             "demand_forecast": [20, 31], "cost_parameters": {},
+             "constraints": {"budget": 1000, "min_vehicles": 1, "max_vehicles": 20}}
+    response = client.post("/solve/fleet-mix", json={**fleet, "solver_config": {"engine": "race"}})
+    assert response.status_code == 200, response.text
+    assert response.json()["solution"]["total_cost"] == SolverService()._solve_fleet_mix(fleet)["solution"]["total_cost"]
+    assert sum(client.get("/races").json()["fleet_mix"].values()) == 1
+    assert [entry["flow"] for entry in read_races(race_log)] == ["fleet_mix"]
+
+def test_race_labor_cost_over_http(race_log):
+    location = {"id": 1, "latitude": 0, "longitude": 0}
+    employees = [{"id": i, "name": f"e{i}", "skills": ["weld"] if i % 2 else ["weld", "lift"], "max_hours": 8,
+                  "hourly_rate": 20 + i, "availability": []} for i in range(4)]
+    tasks = [{"id": j, "location": location, "duration": 3, "required_skills": ["lift"] if j % 3 == 0 else ["weld"],
+              "priority": 1, "time_window": [0, 24]} for j in range(8)]
+    data = {"employees": employees, "tasks": tasks, "time_horizon": 24, "cost_parameters": {},
+            "constraints": {"budget": 450, "min_coverage": {"lift": 2}, "max_overtime": 1}}
+    response = client.post("/solve/labor-cost", json={**data, "solver_config": {"engine": "race", "time_limit": 5}})
+    assert response.status_code == 200, response.text
+    raced = response.json()["solution"]
+    alone = client.post("/solve/labor-cost", json=data).json()["solution"]
+    assert raced["race"]["winner"] in ("SCIP", "CP_SAT", "CBC")
+    assert raced["total_tasks"] == alone["total_tasks"] and "race" not in alone
@@ -0,0 +1,99 @@
+import pytest
+from fastapi.testclient import TestClient
+from ortools.sat.python import cp_model
+from src.api.routes import app
+from src.core.replan import PlanStability
+from src.core.solver import SolverService
+
+client = TestClient(app)
+
+def test_penalties_hold_previous_values_in_both_senses():
+    for maximize in (False, True):
+        model = cp_model.CpModel()
+        x = [model.NewBoolVar(f"x{i}") for i in range(3)]
+        y = model.NewIntVar(0, 10, "y")
+        model.AddExactlyOne(x)
+        model.Add(y >= 3)
+        if maximize:
+            model.Maximize(3 * x[2] - y)
+        else:
+            model.Minimize(y + 2 * x[0])
+        model.AddHint(y, 5)
+        stability = PlanStability(model, {"mode": "penalize", "weight": 10})
+        stability.keep("a", x[1], 1)
+        stability.keep("b", y, 7)
+        stability.keep("c", y, 11)  # outside the domain: skipped
+        stability.apply()
+        solver = cp_model.CpSolver()
+        assert solver.Solve(model) == cp_model.OPTIMAL
+        assert [solver.Value(v) for v in x] == [0, 1, 0] and solver.Value(y) == 7
+        assert stability.report(solver.Value) == {"mode": "penalize", "hinted": 2, "kept": 2, "changed": []}
+    with pytest.raises(ValueError):
+        PlanStability(cp_model.CpModel(), {"mode": "freeze"})
+
+def _labor(employees, rate=10):
+    return {
+        "type": "labor_scheduling",
+        "employees": [{"id": i, "skills": [], "hourly_rate": rate} for i in employees],
+        "shifts": [{"id": 1, "start": 6, "end": 14}, {"id": 2, "start": 14, "end": 22}],
+        "time_horizon": 7,
+        "constraints": {"coverage_requirements": {"1": 2, "2": 2}, "max_consecutive_hours": 5, "min_rest_hours": 8},
+        "objective": "minimize_cost",
+    }
+
+# A fractional rate gives CP-SAT a floating point objective, which the penalties must join
+@pytest.mark.parametrize("rate", [10, 12.5])
+def test_sick_employee_replan_keeps_other_schedules(rate):
+    service = SolverService()
+    first = service.solve(_labor(range(8), rate))
+    assert first["job_id"]
+    before = {(a["employee_id"], a["day"]): a["shift_id"] for a in first["solution"]["schedule"]}
+    sick = next(iter(before))[0]
+    data = {**_labor([i for i in range(8) if i != sick], rate), "previous_job_id": first["job_id"],
+            "stability": {"mode": "penalize", "weight": 100}}
+    again = service.solve(data)
+    after = {(a["employee_id"], a["day"]): a["shift_id"] for a in again["solution"]["schedule"]}
+    replan = again["solution"]["replan"]
+    assert replan["mode"] == "penalize" and replan["kept"] == 7
+    # Only enough shifts to cover for the sick employee move
+    moved = {k for k in set(before) | set(after) if k[0] != sick and before.get(k) != after.get(k)}
+    assert len(moved) <= sum(1 for e, _ in before if e == sick)
+    assert {e for e, _ in moved} == set(replan["changed"])
+    with pytest.raises(Exception, match="Unknown previous_job_id"):
+        service.solve({**data, "previous_job_id": "missing"})
+
+def test_fixed_replan_pins_unaffected_tasks():
+    tasks = [{"id": i, "duration": 3, "subcontractor_id": "elec"} for i in range(4)]
+    data = {"tasks": tasks, "subcontractors": [{"id": "elec", "capacity": 2}], "time_horizon": 20}
+    first = SolverService()._solve_subcontractor_scheduling(data)
+    previous = {e["task_id"]: e["start"] for e in first["solution"]["schedule"]}
+    grown = [dict(t, duration=5) if t["id"] == 0 else t for t in tasks]
+    result = SolverService()._solve_subcontractor_scheduling(
+        {**data, "tasks": grown, "previous_solution": first, "stability": {"mode": "fix", "free": [0]}})
+    after = {e["task_id"]: e["start"] for e in result["solution"]["schedule"]}
+    assert all(after[t] == previous[t] for t in (1, 2, 3))
+    assert result["solution"]["replan"]["kept"] == 4
+
+def test_job_id_round_trip_through_api():
+    payload = {"tasks": [{"id": 1, "duration": 2}, {"id": 2, "duration": 3}], "blackout_windows": [[2, 4]],
+               "constraints": {"crews": 1, "time_horizon": 20}}
+    first = client.post("/solve/compliance-planning", json=payload).json()
+    again = client.post("/solve/compliance-planning", json={**payload, "previous_job_id": first["job_id"],
+                                                            "stability": {"mode": "fix"}}).json()
+    assert again["solution"]["schedule"] == first["solution"]["schedule"]
+    assert again["solution"]["replan"] == {"mode": "fix", "hinted": 4, "kept": 2, "changed": []}
+
+def test_job_cache_is_safe_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    service = SolverService()
+
+    def churn(worker):
+        for k in range(200):
+            job = service._remember_job("maintenance", {"schedule": [worker, k]})
+            assert service._previous_job(job) == {"schedule": [worker, k]}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(churn, range(8)))
+    assert len(service._jobs) == 64
+    with pytest.raises(ValueError, match="process that issued them"):
+        service._previous_job("unknown")
@@ -0,0 +1,96 @@
+import os
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from src.api.routes import app
+from src.core.montecarlo import MonteCarloEngine
+from src.core.solver import SolverService
+
+client = TestClient(app)
+
+# Diamond network given out of topological order: 1 -> {2, 3} -> 4
+NETWORK = [
+    {"id": 4, "predecessors": [2, 3]},
+    {"id": 2, "predecessors": [1]},
+    {"id": 1, "predecessors": []},
+    {"id": 3, "predecessors": [1]},
+]
+
+def test_constant_network_matches_cpm():
+    payload = {
+        "project_network": NETWORK,
+        "risk_factors": [
+            {"task_id": 1, "distribution": "constant", "value": 2},
+            {"task_id": 2, "distribution": "constant", "value": 5},
+            {"task_id": 3, "distribution": "constant", "value": 3},
+            {"task_id": 4, "distribution": "constant", "value": 1},
+        ],
+        "num_simulations": 500,
+        "chunk_size": 64
+    }
+    response = client.post("/solve/risk-simulation", json=payload)
+    assert response.status_code == 200, response.text
+    sol = response.json()["solution"]
+    assert sol["risk_profile"]["mean"] == 8
+    assert sol["risk_profile"]["stddev"] == 0
+    crit = sol["criticality_index"]
+    assert crit["1"] == crit["2"] == crit["4"] == 1.0
+    assert crit["3"] == 0.0
+
+def test_distributions_respect_bounds_and_seed():
+    factors = [
+        {"task_id": 1, "distribution": "triangular", "min": 1, "mode": 2, "max": 4},
+        {"task_id": 2, "distribution": "pert", "min": 2, "mode": 3, "max": 7},
+        {"task_id": 3, "distribution": "lognormal", "mean": 3, "stddev": 1},
+    ]
+    engine = MonteCarloEngine(NETWORK, factors)
+    durations = engine.sample(np.random.default_rng(0), 20000)
+    rows = {tid: engine.network.index[tid] for tid in (1, 2, 3, 4)}
+    assert durations[rows[1]].min() >= 1 and durations[rows[1]].max() <= 4
+    assert durations[rows[2]].min() >= 2 and durations[rows[2]].max() <= 7
+    assert abs(durations[rows[3]].mean() - 3) < 0.1
+    assert np.all(durations[rows[4]] == 1)
+
+    payload = {"project_network": NETWORK, "risk_factors": factors, "num_simulations": 2000, "seed": 7}
+    first = client.post("/solve/risk-simulation", json=payload).json()
+    second = client.post("/solve/risk-simulation", json=payload).json()
+    assert first["solution"] == second["solution"]
+
+def test_cycle_is_rejected():
+    payload = {
+        "project_network": [{"id": 1, "predecessors": [2]}, {"id": 2, "predecessors": [1]}],
+        "risk_factors": []
+    }
+    response = client.post("/solve/risk-simulation", json=payload)
+    assert response.status_code == 400
+    assert "cycle" in response.json()["detail"]
+
+def test_streaming_matches_exact_summary():
+    factors = [{"task_id": t, "distribution": "triangular", "min": 1, "mode": 2, "max": 6} for t in (1, 2, 3, 4)]
+    payload = {"project_network": NETWORK, "risk_factors": factors, "num_simulations": 60000, "seed": 3}
+    exact = client.post("/solve/risk-simulation", json=payload).json()["solution"]
+    streamed = client.post("/solve/risk-simulation",
+                           json={**payload, "streaming": True, "workers": 2, "chunk_size": 5000}).json()["solution"]
+    assert streamed["mode"] == "streaming"
+    for key in ("mean", "p50", "p90", "p95"):
+        assert abs(streamed["risk_profile"][key] - exact["risk_profile"][key]) < 0.1
+    profile = streamed["risk_profile"]
+    assert sum(profile["histogram"]) + profile["underflow"] + profile["overflow"] == 60000
+    for tid, index in exact["criticality_index"].items():
+        assert abs(streamed["criticality_index"][tid] - index) < 0.02
+
+def test_streaming_workers_share_the_capped_pool():
+    service = SolverService()
+    result = service.solve({"type": "risk_simulation", "project_network": NETWORK, "risk_factors": [],
+                            "num_simulations": 2000, "streaming": True, "workers": 16, "chunk_size": 100})
+    profile = result["solution"]["risk_profile"]
+    assert sum(profile["histogram"]) + profile["underflow"] + profile["overflow"] == 2000
+    assert service._pool._max_workers == (os.cpu_count() or 1)
+
+def test_rejects_non_positive_sizes():
+    payload = {"project_network": NETWORK, "risk_factors": [], "num_simulations": 100}
+    for option, value in (("chunk_size", -5), ("workers", 0), ("sketch_k", -1)):
+        response = client.post("/solve/risk-simulation", json={**payload, option: value})
+        assert response.status_code == 422 and option in response.text
+        with pytest.raises(Exception, match=f"{option} must be at least 1"):
+            SolverService().solve({"type": "risk_simulation", **payload, option: value})
@@ -0,0 +1,82 @@
+import itertools
+import numpy as np
+from src.core.roster import generate_rosters, price_daily_roster, price_gap_roster
+from src.core.solver import SolverService
+
+def _brute_daily(costs, allowed, max_run):
+    days, shifts = costs.shape
+    best = 0.0
+    for plan in itertools.product(range(-1, shifts), repeat=days):
+        run, cost = 0, 0.0
+        for d, s in enumerate(plan):
+            run = run + 1 if s >= 0 else 0
+            if s < 0:
+                continue
+            if run > max_run or (d and plan[d - 1] >= 0 and not allowed[plan[d - 1], s]):
+                break
+            cost += costs[d, s]
+        else:
+            best = min(best, cost)
+    return best
+
+def test_daily_pricing_matches_enumeration():
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        days, shifts, max_run = int(rng.integers(1, 6)), int(rng.integers(1, 4)), int(rng.integers(1, 4))
+        costs = rng.normal(0, 1, (days, shifts))
+        costs[rng.random(costs.shape) < 0.15] = np.inf
+        allowed = rng.random((shifts, shifts)) < 0.6
+        cost, slots = price_daily_roster(costs, allowed, max_run)
+        assert abs(cost - _brute_daily(costs, allowed, max_run)) < 1e-9
+        assert abs(cost - sum(costs[divmod(x, shifts)] for x in slots)) < 1e-9
+
+def test_gap_pricing_keeps_rest():
+    cost, slots = price_gap_roster([0, 1, 2, 5, 6], np.array([-1.0, -5.0, -1.0, -1.0, -2.0]), 3)
+    assert (cost, slots) == (-7.0, [1, 4])
+
+def test_generate_rosters_reports_infeasible_demand():
+    # One employee cannot cover two employees' worth of demand
+    result = generate_rosters([2], [1], lambda cls, duals: (1.0, [0]), penalty=100.0)
+    assert not result["feasible"]
+
+def _labor(num_employees, engine):
+    return {
+        "employees": [{"id": i, "skills": ["lead"] if i < 3 else [], "hourly_rate": 12 if i < 3 else 10}
+                      for i in range(num_employees)],
+        "shifts": [{"id": 1, "start": 6, "end": 14}, {"id": 2, "start": 14, "end": 22}, {"id": 3, "start": 22, "end": 6}],
+        "time_horizon": 7,
+        "constraints": {"coverage_requirements": {"1": 2, "2": 2, "3": 1}, "skill_requirements": {"3": ["lead"]},
+                        "max_consecutive_hours": 4, "min_rest_hours": 8},
+        "objective": "minimize_cost",
+        "solver_config": {"engine": engine}
+    }
+
+def test_labor_roster_matches_cp_sat():
+    # Enough cheap staff that double shifts (outside the roster patterns) never pay off
+    roster = SolverService()._solve_labor_scheduling(_labor(10, "roster"))
+    exact = SolverService()._solve_labor_scheduling(_labor(10, "cp_sat"))
+    assert exact["status"] == "OPTIMAL"
+    assert roster["objective_value"] == exact["objective_value"]
+    assert roster["solution"]["engine"] == "roster" and roster["solution"]["convergence"]["converged"]
+    worked = {(a["employee_id"], a["day"]): a["shift_id"] for a in roster["solution"]["schedule"]}
+    assert len(worked) == len(roster["solution"]["schedule"])
+    assert all(e < 3 for (e, _), s in worked.items() if s == 3)
+    assert not any(s == 3 and worked.get((e, d + 1)) == 1 for (e, d), s in worked.items())
+
+def test_shift_coverage_roster_matches_mip():
+    employees = [{"id": i, "name": f"e{i}", "skills": [], "max_hours": 8, "hourly_rate": 10, "availability": []}
+                 for i in range(8)]
+    data = {
+        "employees": employees,
+        "shifts": [{"id": k, "time": k, "type": "day" if k % 2 else "night"} for k in range(16)],
+        "time_horizon": 16,
+        "constraints": {"min_employees_per_shift": {"day": 2, "night": 1}, "max_consecutive_shifts": 3,
+                        "min_rest_between_shifts": 3}
+    }
+    mip = SolverService()._solve_shift_coverage(data)
+    roster = SolverService()._solve_shift_coverage({**data, "solver_config": {"engine": "roster"}})
+    assert round(mip["solution"]["total_coverage"]) == roster["solution"]["total_coverage"]
+    times = {}
+    for a in roster["solution"]["assignments"]:
+        times.setdefault(a["employee_id"], []).append(a["shift_id"])
+    assert all(b - a >= 3 for ts in times.values() for a, b in zip(sorted(ts), sorted(ts)[1:]))
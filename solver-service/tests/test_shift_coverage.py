@@ -0,0 +1,33 @@
+import numpy as np
+from src.core.intervals import window_ranges
+from src.core.solver import SolverService
+
+def test_window_ranges_keeps_maximal_binding_windows():
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        times = sorted(rng.integers(0, 15, int(rng.integers(0, 12))).tolist())
+        width, cap, horizon = int(rng.integers(0, 5)), int(rng.integers(1, 3)), int(rng.integers(0, 18))
+        windows = [frozenset(i for i, x in enumerate(times) if t <= x < t + width) for t in range(horizon)]
+        windows = [w for w in windows if len(w) > cap]
+        maximal = {w for w in windows if not any(w < other for other in windows)}
+        got = [frozenset(range(lo, hi)) for lo, hi in window_ranges(times, range(horizon), width, cap)]
+        assert len(got) == len(maximal) and set(got) == maximal
+
+def test_shift_coverage_respects_rest_windows():
+    employees = [{"id": i, "name": f"e{i}", "skills": [], "max_hours": 8, "hourly_rate": 10, "availability": []}
+                 for i in range(5)]
+    shifts = [{"id": k, "time": k // 2, "type": "day" if k % 2 else "night"} for k in range(20)]
+    data = {
+        "employees": employees, "shifts": shifts, "time_horizon": 10,
+        "constraints": {"min_employees_per_shift": {"day": 1, "night": 1}, "max_consecutive_shifts": 2,
+                        "min_rest_between_shifts": 2}
+    }
+    result = SolverService()._solve_shift_coverage(data)
+    assert result["status"] == "success"
+    # Two shifts per step and one worked per two steps: each employee works 5 of 20 shifts
+    assert result["solution"]["total_coverage"] == 25
+    time_of = {s["id"]: s["time"] for s in shifts}
+    worked = {}
+    for a in result["solution"]["assignments"]:
+        worked.setdefault(a["employee_id"], []).append(time_of[a["shift_id"]])
+    assert all(b - a >= 2 for ts in worked.values() for a, b in zip(sorted(ts), sorted(ts)[1:]))
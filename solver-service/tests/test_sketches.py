@@ -0,0 +1,39 @@
+import numpy as np
+from src.core.sketches import FixedHistogram, KLLSketch, RunningMoments
+
+def test_running_moments_merge_matches_numpy():
+    values = np.random.default_rng(0).normal(10, 3, 10000)
+    left, right = RunningMoments(), RunningMoments()
+    for chunk in np.array_split(values[:6000], 7):
+        left.update(chunk)
+    right.update(values[6000:])
+    left.merge(right)
+    assert left.count == len(values)
+    assert abs(left.mean - values.mean()) < 1e-9
+    assert abs(left.stddev - values.std()) < 1e-9
+    assert left.min == values.min() and left.max == values.max()
+
+def test_kll_quantiles_within_rank_error():
+    values = np.random.default_rng(1).lognormal(0, 1, 200000)
+    a, b = KLLSketch(k=256, seed=0), KLLSketch(k=256, seed=1)
+    for chunk in np.array_split(values[:100000], 10):
+        a.update(chunk)
+    for chunk in np.array_split(values[100000:], 3):
+        b.update(chunk)
+    a.merge(b)
+    assert a.count == len(values)
+    assert a.size < 4000
+    ordered = np.sort(values)
+    for q, estimate in zip([0.1, 0.5, 0.9, 0.95], a.quantiles([0.1, 0.5, 0.9, 0.95])):
+        rank = np.searchsorted(ordered, estimate) / len(values)
+        assert abs(rank - q) < 0.02
+
+def test_fixed_histogram_merge():
+    values = np.linspace(-1, 11, 1201)
+    h1, h2 = FixedHistogram(0, 10, 20), FixedHistogram(0, 10, 20)
+    h1.update(values[:600])
+    h2.update(values[600:])
+    h1.merge(h2)
+    assert h1.underflow == 100 and h1.overflow == 100
+    assert h1.counts.sum() == 1001
+    np.testing.assert_array_equal(h1.counts, np.histogram(values, bins=h1.edges)[0])
@@ -0,0 +1,52 @@
+import numpy as np
+from src.core.cpm import ProjectNetwork, time_windows
+from src.core.solver import SolverService
+
+def test_time_windows_follow_precedences():
+    network = ProjectNetwork([
+        {"id": 1, "duration": 2}, {"id": 2, "duration": 3, "predecessors": [1]}, {"id": 3, "duration": 1, "predecessors": [1]}
+    ])
+    es, ls = time_windows(network, np.array([2, 3, 1]), np.array([1, 0, 0]), np.array([10, 8, 10]))
+    assert es.tolist() == [1, 3, 3] and ls.tolist() == [3, 5, 9]
+
+def test_unreachable_deadline_is_reported_before_solving():
+    data = {"tasks": [{"id": 1, "duration": 4}, {"id": 2, "duration": 4, "predecessors": [1], "latest_end": 6}],
+            "time_horizon": 20}
+    result = SolverService()._solve_subcontractor_scheduling(data)
+    assert result["status"] == "infeasible" and "Task" in result["error"]
+
+def _check(data, result):
+    assert result["status"] == "success"
+    schedule = {e["task_id"]: e for e in result["solution"]["schedule"]}
+    for t in data["tasks"]:
+        for p in t.get("predecessors", []):
+            assert schedule[t["id"]]["start"] >= schedule[p]["end"]
+    return schedule
+
+def test_contract_capacity_limits_parallel_work():
+    tasks = [{"id": i, "duration": 3, "subcontractor_id": "elec"} for i in range(4)]
+    tasks.append({"id": 9, "duration": 2, "predecessors": [0, 1, 2, 3]})
+    data = {"tasks": tasks, "subcontractors": [{"id": "elec", "capacity": 3}],
+            "contracts": [{"subcontractor_id": "elec", "capacity": 2, "start": 1}], "time_horizon": 20}
+    result = SolverService()._solve_subcontractor_scheduling(data)
+    schedule = _check(data, result)
+    # Two crews from t=1: two waves of three days, then the follow-up task
+    assert result["solution"]["makespan"] == 9 and result["solution"]["optimal"]
+    for t in range(20):
+        assert sum(1 for i in range(4) if schedule[i]["start"] <= t < schedule[i]["end"]) <= 2
+    assert min(schedule[i]["start"] for i in range(4)) >= 1
+
+def test_large_network_respects_crews():
+    rng = np.random.default_rng(0)
+    tasks = [{"id": i, "duration": int(rng.integers(1, 6)), "subcontractor_id": int(rng.integers(0, 10)),
+              "predecessors": sorted(set(rng.integers(max(0, i - 20), i, size=min(i, 2)).tolist()))}
+             for i in range(400)]
+    subs = [{"id": k, "capacity": 2} for k in range(10)]
+    data = {"tasks": tasks, "subcontractors": subs, "time_horizon": 2000}
+    result = SolverService()._solve_subcontractor_scheduling(data)
+    schedule = _check(data, result)
+    assert result["solution"]["makespan"] >= result["solution"]["lower_bound"]
+    for k in range(10):
+        events = sorted((e["start"], e["end"]) for e in schedule.values() if e["subcontractor_id"] == k)
+        for t in {s for s, _ in events}:
+            assert sum(1 for s, e in events if s <= t < e) <= 2